@@ -38,7 +38,7 @@ from esphome.const import (
     SECRETS_FILES,
 )
 from esphome.core import CORE, EsphomeError, coroutine
-from esphome.helpers import indent, is_ip_address, get_bool_env
+from esphome.helpers import get_bool_env, indent, is_ha_addon, is_ip_address
 from esphome.log import Fore, color, setup_log
 from esphome.util import (
     get_serial_ports,
@@ -554,45 +554,184 @@ def command_dashboard(args):
     return dashboard.start_dashboard(args)
 
 
-def command_update_all(args):
+def _update_all_print_bar(middle_text, twidth=60):
     import click
 
-    success = {}
-    files = list_yaml_files(args.configuration)
-    twidth = 60
-
-    def print_bar(middle_text):
-        middle_text = f" {middle_text} "
-        width = len(click.unstyle(middle_text))
-        half_line = "=" * ((twidth - width) // 2)
-        click.echo(f"{half_line}{middle_text}{half_line}")
-
-    for f in files:
-        print(f"Updating {color(Fore.CYAN, f)}")
-        print("-" * twidth)
-        print()
-        rc = run_external_process(
-            "esphome", "--dashboard", "run", f, "--no-logs", "--device", "OTA"
+    middle_text = f" {middle_text} "
+    width = len(click.unstyle(middle_text))
+    half_line = "=" * ((twidth - width) // 2)
+    click.echo(f"{half_line}{middle_text}{half_line}")
+
+
+def _format_duration(seconds):
+    if seconds is None:
+        return "-"
+    return f"{seconds:.1f}s"
+
+
+class _UpdateAllJob:
+    def __init__(self, file):
+        self.file = file
+        self.compile_time = None
+        self.upload_time = None
+        self.phase = "compile"
+        self.output = ""
+        self.success = False
+
+    @property
+    def total_time(self):
+        if self.compile_time is None:
+            return None
+        return self.compile_time + (self.upload_time or 0.0)
+
+
+def _run_update_all_step(job, env, *cmd):
+    import subprocess
+
+    _LOGGER.debug("Running:  %s", " ".join(cmd))
+    start = time.monotonic()
+    try:
+        proc = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env,
+            encoding="utf-8",
+            errors="replace",
+            check=False,
+        )
+        rc, output = proc.returncode, proc.stdout
+    except Exception as err:  # pylint: disable=broad-except
+        rc, output = 1, f"Running command failed: {err}\n"
+    job.output += output
+    return rc, time.monotonic() - start
+
+
+def _update_all_parallel(files, jobs, upload_jobs, build_cache_dir):
+    """Compile on `jobs` workers and upload via OTA on `upload_jobs` workers.
+
+    Uploads are network bound, so they run on their own pool and overlap with
+    the CPU bound compiles of the remaining devices.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    env = os.environ.copy()
+    if build_cache_dir is not None:
+        # Let PlatformIO share compiled framework objects between all devices
+        env.setdefault("PLATFORMIO_BUILD_CACHE_DIR", build_cache_dir)
+
+    update_jobs = [_UpdateAllJob(f) for f in files]
+
+    def upload(job):
+        job.phase = "upload"
+        rc, job.upload_time = _run_update_all_step(
+            job, env, "esphome", "--dashboard", "upload", job.file, "--device", "OTA"
         )
-        if rc == 0:
-            print_bar(f"[{color(Fore.BOLD_GREEN, 'SUCCESS')}] {f}")
-            success[f] = True
+        job.success = rc == 0
+        if job.success:
+            _update_all_print_bar(f"[{color(Fore.BOLD_GREEN, 'SUCCESS')}] {job.file}")
         else:
-            print_bar(f"[{color(Fore.BOLD_RED, 'ERROR')}] {f}")
-            success[f] = False
+            _update_all_print_bar(f"[{color(Fore.BOLD_RED, 'ERROR')}] {job.file}")
+            print(job.output)
+
+    with ThreadPoolExecutor(
+        max_workers=upload_jobs, thread_name_prefix="upload"
+    ) as upload_pool:
+
+        def compile_(job):
+            rc, job.compile_time = _run_update_all_step(
+                job, env, "esphome", "--dashboard", "compile", job.file
+            )
+            if rc != 0:
+                _update_all_print_bar(f"[{color(Fore.BOLD_RED, 'ERROR')}] {job.file}")
+                print(job.output)
+                return
+            print(
+                f"Compiled {color(Fore.CYAN, job.file)} in "
+                f"{_format_duration(job.compile_time)}, queued for upload"
+            )
+            upload_pool.submit(upload, job)
+
+        if update_jobs:
+            # The first compile installs the platform and toolchain packages
+            # into the PlatformIO core dir, parallel compiles would race on that
+            compile_(update_jobs[0])
+        with ThreadPoolExecutor(
+            max_workers=jobs, thread_name_prefix="compile"
+        ) as compile_pool:
+            for job in update_jobs[1:]:
+                compile_pool.submit(compile_, job)
+
+    return update_jobs
+
 
-        print()
-        print()
-        print()
+def _update_all_build_cache_dir(folders):
+    if is_ha_addon():
+        return os.path.join("/data", "build_cache")
+    if "ESPHOME_DATA_DIR" in os.environ:
+        return os.path.join(os.environ["ESPHOME_DATA_DIR"], "build_cache")
+    return os.path.abspath(os.path.join(folders[0], ".esphome", "build_cache"))
 
-    print_bar(f"[{color(Fore.BOLD_WHITE, 'SUMMARY')}]")
+
+def command_update_all(args):
+    files = list_yaml_files(args.configuration)
+    start = time.monotonic()
+
+    if args.jobs > 1:
+        update_jobs = _update_all_parallel(
+            files,
+            args.jobs,
+            args.upload_jobs or args.jobs,
+            _update_all_build_cache_dir(args.configuration),
+        )
+    else:
+        update_jobs = []
+        for f in files:
+            print(f"Updating {color(Fore.CYAN, f)}")
+            print("-" * 60)
+            print()
+            job = _UpdateAllJob(f)
+            job_start = time.monotonic()
+            rc = run_external_process(
+                "esphome", "--dashboard", "run", f, "--no-logs", "--device", "OTA"
+            )
+            # compile and upload run in one process here, so only the total is known
+            job.compile_time = time.monotonic() - job_start
+            job.success = rc == 0
+            update_jobs.append(job)
+            if job.success:
+                _update_all_print_bar(f"[{color(Fore.BOLD_GREEN, 'SUCCESS')}] {f}")
+            else:
+                _update_all_print_bar(f"[{color(Fore.BOLD_RED, 'ERROR')}] {f}")
+
+            print()
+            print()
+            print()
+
+    _update_all_print_bar(f"[{color(Fore.BOLD_WHITE, 'SUMMARY')}]")
     failed = 0
-    for f in files:
-        if success[f]:
-            print(f"  - {f}: {color(Fore.GREEN, 'SUCCESS')}")
+    name_width = max((len(job.file) for job in update_jobs), default=0)
+    if args.jobs > 1:
+        print(
+            f"  {'Device':<{name_width}}  {'Compile':>9}  {'Upload':>9}  {'Total':>9}"
+        )
+    for job in update_jobs:
+        if job.success:
+            status = color(Fore.GREEN, "SUCCESS")
         else:
-            print(f"  - {f}: {color(Fore.BOLD_RED, 'FAILED')}")
+            # Compile and upload are one step when updating sequentially
+            phase = f" ({job.phase})" if args.jobs > 1 else ""
+            status = color(Fore.BOLD_RED, f"FAILED{phase}")
             failed += 1
+        if args.jobs > 1:
+            print(
+                f"  {job.file:<{name_width}}  {_format_duration(job.compile_time):>9}"
+                f"  {_format_duration(job.upload_time):>9}"
+                f"  {_format_duration(job.total_time):>9}  {status}"
+            )
+        else:
+            print(f"  - {job.file}: {status} ({_format_duration(job.total_time)})")
+    print(f"Updated {len(update_jobs)} devices in {time.monotonic() - start:.1f}s")
     return failed
 
 
@@ -713,6 +852,20 @@ PRE_CONFIG_ACTIONS = {
     "update-all": command_update_all,
 }
 
+# Commands that don't generate code and can use a cached validated config
+CACHED_CONFIG_ACTIONS = {
+    "upload",
+    "logs",
+    "clean-mqtt",
+    "mqtt-fingerprint",
+    "clean",
+    "idedata",
+    "discover",
+}
+
+# Commands that always validate, but refresh the cache for the commands above
+UPDATE_CONFIG_CACHE_ACTIONS = {"compile", "run"}
+
 POST_CONFIG_ACTIONS = {
     "config": command_config,
     "compile": command_compile,
@@ -751,6 +904,12 @@ def parse_args(argv):
         help="Add a substitution",
         metavar=("key", "value"),
     )
+    options_parser.add_argument(
+        "--no-config-cache",
+        help="Always validate the configuration, do not use or update the config cache.",
+        action="store_true",
+        default=get_bool_env("ESPHOME_NO_CONFIG_CACHE"),
+    )
 
     parser = argparse.ArgumentParser(
         description=f"ESPHome {const.__version__}", parents=[options_parser]
@@ -931,6 +1090,19 @@ def parse_args(argv):
     parser_update.add_argument(
         "configuration", help="Your YAML configuration file directories.", nargs="+"
     )
+    parser_update.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of devices to compile in parallel.",
+        type=int,
+        default=1,
+    )
+    parser_update.add_argument(
+        "--upload-jobs",
+        help="Number of parallel OTA uploads when compiling in parallel "
+        "(defaults to the number of jobs).",
+        type=int,
+    )
 
     parser_idedata = subparsers.add_parser("idedata")
     parser_idedata.add_argument(
@@ -993,7 +1165,16 @@ def run_esphome(argv):
         CORE.config_path = conf_path
         CORE.dashboard = args.dashboard
 
-        config = read_config(dict(args.substitution) if args.substitution else {})
+        use_cache = not args.no_config_cache
+        config = read_config(
+            dict(args.substitution) if args.substitution else {},
+            load_cache=use_cache and args.command in CACHED_CONFIG_ACTIONS,
+            save_cache=use_cache
+            and (
+                args.command in CACHED_CONFIG_ACTIONS
+                or args.command in UPDATE_CONFIG_CACHE_ACTIONS
+            ),
+        )
         if config is None:
             return 2
         CORE.config = config
@@ -0,0 +1,104 @@
+"""Content-addressed cache for converted display assets.
+
+Converting images, animations and fonts into the byte arrays that end up in
+the firmware is done on every code generation run, which is slow for large
+assets. The results are stored under ``.esphome/asset_cache/<domain>``,
+keyed by a hash of the source file contents and all the parameters that
+influence the conversion, so the cached data is reused only when the output
+would be identical.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import pickle
+from typing import Any
+
+from esphome import const
+from esphome.core import CORE
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+# Number of entries kept per domain, the least recently used ones are removed
+MAX_ENTRIES = 256
+
+
+def digest(data: bytes) -> str:
+    """Return the hash of ``data`` for use in `asset_key`."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path: os.PathLike | str) -> str:
+    """Return the hash of the contents of the file at ``path``."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f_handle:
+        for chunk in iter(lambda: f_handle.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def asset_key(domain: str, sources: Iterable[str], params: dict[str, Any]) -> str:
+    """Compute the cache key of a converted asset.
+
+    :param domain: The component doing the conversion.
+    :param sources: Digests of the source files, see `digest` and `file_digest`.
+    :param params: Everything else the converted data depends on.
+    """
+    key = json.dumps(
+        [CACHE_VERSION, const.__version__, domain, list(sources), params],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _domain_dir(domain: str) -> Path:
+    return Path(CORE.data_dir) / "asset_cache" / domain
+
+
+def load(domain: str, key: str) -> Any | None:
+    """Return the data stored for ``key``, or None if it isn't cached."""
+    path = _domain_dir(domain) / f"{key}.pickle"
+    try:
+        with open(path, "rb") as f_handle:
+            value = pickle.load(f_handle)
+        # Mark as recently used
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Could not read asset cache %s: %s", path, err)
+        return None
+    _LOGGER.debug("Using cached %s data %s", domain, key)
+    return value
+
+
+def _prune(directory: Path) -> None:
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".pickle"):
+            entries.append((entry.stat().st_mtime_ns, entry.path))
+    if len(entries) <= MAX_ENTRIES:
+        return
+    entries.sort()
+    for _, path in entries[: len(entries) - MAX_ENTRIES]:
+        os.remove(path)
+
+
+def save(domain: str, key: str, value: Any) -> None:
+    """Store the converted data ``value`` under ``key``."""
+    from esphome.helpers import write_file
+
+    directory = _domain_dir(domain)
+    path = directory / f"{key}.pickle"
+    try:
+        write_file(path, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        _prune(directory)
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Could not write asset cache %s: %s", path, err)
@@ -1,6 +1,12 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import io
 import logging
+import os
 
-from esphome import automation, core
+from esphome import asset_cache, automation, core
 import esphome.codegen as cg
 from esphome.components import font
 import esphome.components.image as espImage
@@ -27,6 +33,7 @@ from esphome.core import CORE, HexInt
 
 _LOGGER = logging.getLogger(__name__)
 
+DOMAIN = "animation"
 AUTO_LOAD = ["image"]
 CODEOWNERS = ["@syndlex"]
 DEPENDENCIES = ["display"]
@@ -36,6 +43,11 @@ CONF_LOOP = "loop"
 CONF_START_FRAME = "start_frame"
 CONF_END_FRAME = "end_frame"
 CONF_FRAME = "frame"
+CONF_DEDUPLICATE_FRAMES = "deduplicate_frames"
+CONF_FRAME_MAP_ID = "frame_map_id"
+
+# Number of threads used to convert the frames of an animation
+FRAME_WORKERS = min(8, os.cpu_count() or 1)
 
 animation_ns = cg.esphome_ns.namespace("animation")
 
@@ -70,6 +82,11 @@ def _file_schema(value):
 FILE_SCHEMA = cv.Schema(_file_schema)
 
 
+def prefetch_files(config):
+    """Return the downloads of the remote files of the animations."""
+    return espImage.prefetch_files(config, FILE_SCHEMA)
+
+
 def validate_file_shorthand(value):
     value = cv.string_strict(value)
     if value.startswith("http://") or value.startswith("https://"):
@@ -125,7 +142,9 @@ ANIMATION_SCHEMA = cv.Schema(
                     cv.Optional(CONF_REPEAT): cv.positive_int,
                 }
             ),
+            cv.Optional(CONF_DEDUPLICATE_FRAMES, default=False): cv.boolean,
             cv.GenerateID(CONF_RAW_DATA_ID): cv.declare_id(cg.uint8),
+            cv.Optional(CONF_FRAME_MAP_ID): cv.declare_id(cg.uint16),
         },
         validate_cross_dependencies,
     )
@@ -164,9 +183,103 @@ async def animation_action_to_code(config, action_id, template_arg, args):
     return var
 
 
-async def to_code(config):
+def _map_frames(image, convert):
+    """Yield ``convert(frame)`` for every frame of ``image``, in order.
+
+    Frames have to be decoded one after the other, but converting and packing
+    them is done in a thread pool; Pillow releases the GIL while doing so.
+    Only a limited number of decoded frames are kept in memory at a time.
+    """
+    with ThreadPoolExecutor(FRAME_WORKERS) as executor:
+        pending = deque()
+        for index in range(image.n_frames):
+            image.seek(index)
+            pending.append(executor.submit(convert, image.copy()))
+            if len(pending) >= 2 * FRAME_WORKERS:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def convert_animation(config, path: str, file_contents: bytes):
+    """Convert all frames of the animation in ``file_contents`` as configured.
+
+    Returns the packed pixel data, width, height and number of frames.
+    """
     from PIL import Image
 
+    try:
+        image = Image.open(io.BytesIO(file_contents))
+    except Exception as e:
+        raise core.EsphomeError(f"Could not load image file {path}: {e}")
+
+    width, height = image.size
+    if CONF_RESIZE in config:
+        new_width_max, new_height_max = config[CONF_RESIZE]
+        ratio = min(new_width_max / width, new_height_max / height)
+        width, height = int(width * ratio), int(height * ratio)
+
+    transparent = config[CONF_USE_TRANSPARENCY]
+    image_type = config[CONF_TYPE]
+
+    def resize(frame):
+        if CONF_RESIZE in config:
+            frame = frame.resize([width, height])
+        if frame.size != (width, height):
+            raise core.EsphomeError(
+                f"Unexpected size of {path} frame: {frame.size} != {(width, height)}"
+            )
+        return frame
+
+    def convert(frame):
+        if image_type == "GRAYSCALE":
+            return espImage.pack_grayscale(
+                resize(frame.convert("LA", dither=Image.Dither.NONE)), transparent
+            )
+        if image_type == "RGBA":
+            return espImage.pack_rgba(resize(frame.convert("RGBA")))
+        if image_type == "RGB24":
+            return espImage.pack_rgb24(resize(frame.convert("RGBA")), transparent)
+        if image_type in ["RGB565", "TRANSPARENT_IMAGE"]:
+            return espImage.pack_rgb565(resize(frame.convert("RGBA")), transparent)
+        # BINARY and TRANSPARENT_BINARY
+        alpha = None
+        if transparent:
+            alpha = frame.split()[-1]
+            if alpha.getextrema()[0] < 0xFF:
+                alpha = resize(alpha)
+            else:
+                alpha = None
+        return espImage.pack_binary(
+            resize(frame.convert("1", dither=Image.Dither.NONE)), alpha
+        )
+
+    if image_type not in espImage.IMAGE_TYPE and image_type != "TRANSPARENT_IMAGE":
+        raise core.EsphomeError(
+            f"Animation f{config[CONF_ID]} has not supported type {config[CONF_TYPE]}."
+        )
+    data = b"".join(_map_frames(image, convert))
+    return data, width, height, image.n_frames
+
+
+def deduplicate_frames(data: bytes, frames: int) -> tuple[bytes, list[int] | None]:
+    """Store identical frames only once.
+
+    Returns the data of the distinct frames and for each frame the index of
+    its data, or None if all frames are distinct.
+    """
+    frame_size = len(data) // frames
+    offsets: dict[bytes, int] = {}
+    frame_map = []
+    for index in range(frames):
+        frame = data[index * frame_size : (index + 1) * frame_size]
+        frame_map.append(offsets.setdefault(frame, len(offsets)))
+    if len(offsets) == frames:
+        return data, None
+    return b"".join(offsets), frame_map
+
+
+async def to_code(config):
     conf_file = config[CONF_FILE]
     if conf_file[CONF_SOURCE] == SOURCE_LOCAL:
         path = CORE.relative_config_path(conf_file[CONF_PATH])
@@ -176,159 +289,36 @@ async def to_code(config):
         raise core.EsphomeError(f"Unknown animation source: {conf_file[CONF_SOURCE]}")
 
     try:
-        image = Image.open(path)
+        with open(path, "rb") as f:
+            file_contents = f.read()
     except Exception as e:
         raise core.EsphomeError(f"Could not load image file {path}: {e}")
 
-    width, height = image.size
-    frames = image.n_frames
-    if CONF_RESIZE in config:
-        new_width_max, new_height_max = config[CONF_RESIZE]
-        ratio = min(new_width_max / width, new_height_max / height)
-        width, height = int(width * ratio), int(height * ratio)
-    elif width > 500 or height > 500:
+    transparent = config[CONF_USE_TRANSPARENCY]
+    key = asset_cache.asset_key(
+        DOMAIN,
+        [asset_cache.digest(file_contents)],
+        {
+            CONF_TYPE: config[CONF_TYPE],
+            CONF_RESIZE: config.get(CONF_RESIZE),
+            CONF_USE_TRANSPARENCY: transparent,
+        },
+    )
+    if (cached := asset_cache.load(DOMAIN, key)) is None:
+        cached = convert_animation(config, path, file_contents)
+        asset_cache.save(DOMAIN, key, cached)
+    data, width, height, frames = cached
+    frame_map = None
+    if config[CONF_DEDUPLICATE_FRAMES]:
+        data, frame_map = deduplicate_frames(data, frames)
+
+    if CONF_RESIZE not in config and (width > 500 or height > 500):
         _LOGGER.warning(
             'The image "%s" you requested is very big. Please consider'
             " using the resize parameter.",
             path,
         )
 
-    transparent = config[CONF_USE_TRANSPARENCY]
-
-    if config[CONF_TYPE] == "GRAYSCALE":
-        data = [0 for _ in range(height * width * frames)]
-        pos = 0
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            frame = image.convert("LA", dither=Image.Dither.NONE)
-            if CONF_RESIZE in config:
-                frame = frame.resize([width, height])
-            pixels = list(frame.getdata())
-            if len(pixels) != height * width:
-                raise core.EsphomeError(
-                    f"Unexpected number of pixels in {path} frame {frameIndex}: ({len(pixels)} != {height * width})"
-                )
-            for pix, a in pixels:
-                if transparent:
-                    if pix == 1:
-                        pix = 0
-                    if a < 0x80:
-                        pix = 1
-
-                data[pos] = pix
-                pos += 1
-
-    elif config[CONF_TYPE] == "RGBA":
-        data = [0 for _ in range(height * width * 4 * frames)]
-        pos = 0
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            frame = image.convert("RGBA")
-            if CONF_RESIZE in config:
-                frame = frame.resize([width, height])
-            pixels = list(frame.getdata())
-            if len(pixels) != height * width:
-                raise core.EsphomeError(
-                    f"Unexpected number of pixels in {path} frame {frameIndex}: ({len(pixels)} != {height * width})"
-                )
-            for pix in pixels:
-                data[pos] = pix[0]
-                pos += 1
-                data[pos] = pix[1]
-                pos += 1
-                data[pos] = pix[2]
-                pos += 1
-                data[pos] = pix[3]
-                pos += 1
-
-    elif config[CONF_TYPE] == "RGB24":
-        data = [0 for _ in range(height * width * 3 * frames)]
-        pos = 0
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            frame = image.convert("RGBA")
-            if CONF_RESIZE in config:
-                frame = frame.resize([width, height])
-            pixels = list(frame.getdata())
-            if len(pixels) != height * width:
-                raise core.EsphomeError(
-                    f"Unexpected number of pixels in {path} frame {frameIndex}: ({len(pixels)} != {height * width})"
-                )
-            for r, g, b, a in pixels:
-                if transparent:
-                    if r == 0 and g == 0 and b == 1:
-                        b = 0
-                    if a < 0x80:
-                        r = 0
-                        g = 0
-                        b = 1
-
-                data[pos] = r
-                pos += 1
-                data[pos] = g
-                pos += 1
-                data[pos] = b
-                pos += 1
-
-    elif config[CONF_TYPE] in ["RGB565", "TRANSPARENT_IMAGE"]:
-        data = [0 for _ in range(height * width * 2 * frames)]
-        pos = 0
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            frame = image.convert("RGBA")
-            if CONF_RESIZE in config:
-                frame = frame.resize([width, height])
-            pixels = list(frame.getdata())
-            if len(pixels) != height * width:
-                raise core.EsphomeError(
-                    f"Unexpected number of pixels in {path} frame {frameIndex}: ({len(pixels)} != {height * width})"
-                )
-            for r, g, b, a in pixels:
-                R = r >> 3
-                G = g >> 2
-                B = b >> 3
-                rgb = (R << 11) | (G << 5) | B
-
-                if transparent:
-                    if rgb == 0x0020:
-                        rgb = 0
-                    if a < 0x80:
-                        rgb = 0x0020
-
-                data[pos] = rgb >> 8
-                pos += 1
-                data[pos] = rgb & 0xFF
-                pos += 1
-
-    elif config[CONF_TYPE] in ["BINARY", "TRANSPARENT_BINARY"]:
-        width8 = ((width + 7) // 8) * 8
-        data = [0 for _ in range((height * width8 // 8) * frames)]
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            if transparent:
-                alpha = image.split()[-1]
-                has_alpha = alpha.getextrema()[0] < 0xFF
-            else:
-                has_alpha = False
-            frame = image.convert("1", dither=Image.Dither.NONE)
-            if CONF_RESIZE in config:
-                frame = frame.resize([width, height])
-                if transparent:
-                    alpha = alpha.resize([width, height])
-            for x, y in [(i, j) for i in range(width) for j in range(height)]:
-                if transparent and has_alpha:
-                    if not alpha.getpixel((x, y)):
-                        continue
-                elif frame.getpixel((x, y)):
-                    continue
-
-                pos = x + y * width8 + (height * width8 * frameIndex)
-                data[pos // 8] |= 0x80 >> (pos % 8)
-    else:
-        raise core.EsphomeError(
-            f"Animation f{config[CONF_ID]} has not supported type {config[CONF_TYPE]}."
-        )
-
     rhs = [HexInt(x) for x in data]
     prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], rhs)
     var = cg.new_Pvariable(
@@ -340,6 +330,18 @@ async def to_code(config):
         espImage.IMAGE_TYPE[config[CONF_TYPE]],
     )
     cg.add(var.set_transparency(transparent))
+    if frame_map is not None:
+        _LOGGER.debug(
+            "Animation %s: storing %d distinct of %d frames",
+            config[CONF_ID],
+            max(frame_map) + 1,
+            frames,
+        )
+        map_id = config.get(CONF_FRAME_MAP_ID) or core.ID(
+            f"{config[CONF_ID]}_frame_map", is_declaration=True, type=cg.uint16
+        )
+        map_arr = cg.progmem_array(map_id, frame_map)
+        cg.add(var.set_frame_map(map_arr))
     if loop_config := config.get(CONF_LOOP):
         start = loop_config[CONF_START_FRAME]
         end = loop_config.get(CONF_END_FRAME, frames)
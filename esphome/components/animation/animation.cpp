@@ -22,6 +22,11 @@ void Animation::set_loop(uint32_t start_frame, uint32_t end_frame, int count) {
   loop_current_iteration_ = 1;
 }
 
+void Animation::set_frame_map(const uint16_t *frame_map) {
+  this->frame_map_ = frame_map;
+  this->update_data_start_();
+}
+
 uint32_t Animation::get_animation_frame_count() const { return this->animation_frame_count_; }
 int Animation::get_current_frame() const { return this->current_frame_; }
 void Animation::next_frame() {
@@ -63,7 +68,10 @@ void Animation::set_frame(int frame) {
 
 void Animation::update_data_start_() {
   const uint32_t image_size = image_type_to_width_stride(this->width_, this->type_) * this->height_;
-  this->data_start_ = this->animation_data_start_ + image_size * this->current_frame_;
+  uint32_t frame = this->current_frame_;
+  if (this->frame_map_ != nullptr)
+    frame = progmem_read_uint16(this->frame_map_ + frame);
+  this->data_start_ = this->animation_data_start_ + image_size * frame;
 }
 
 }  // namespace animation
@@ -23,10 +23,17 @@ class Animation : public image::Image {
 
   void set_loop(uint32_t start_frame, uint32_t end_frame, int count);
 
+  /** Sets the index of the image data of each frame, used when identical frames are stored only once.
+   *
+   * @param frame_map One entry for each frame, stored in PROGMEM.
+   */
+  void set_frame_map(const uint16_t *frame_map);
+
  protected:
   void update_data_start_();
 
   const uint8_t *animation_data_start_;
+  const uint16_t *frame_map_{nullptr};
   int current_frame_;
   uint32_t animation_frame_count_;
   uint32_t loop_start_frame_;
@@ -30,6 +30,9 @@ void IRAM_ATTR HOT arch_feed_wdt() {
 uint8_t progmem_read_byte(const uint8_t *addr) {
   return pgm_read_byte(addr);  // NOLINT
 }
+uint16_t progmem_read_uint16(const uint16_t *addr) {
+  return pgm_read_word(addr);  // NOLINT
+}
 uint32_t IRAM_ATTR HOT arch_get_cpu_cycle_count() {
   return ESP.getCycleCount();  // NOLINT(readability-static-accessed-through-instance)
 }
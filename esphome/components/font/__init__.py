@@ -1,3 +1,4 @@
+from concurrent.futures import ProcessPoolExecutor
 import functools
 import hashlib
 import logging
@@ -10,7 +11,7 @@ import glyphsets
 from packaging import version
 import requests
 
-from esphome import core, external_files
+from esphome import asset_cache, core, external_files
 import esphome.codegen as cg
 import esphome.config_validation as cv
 from esphome.const import (
@@ -47,6 +48,13 @@ CONF_EXTRAS = "extras"
 CONF_FONTS = "fonts"
 CONF_GLYPHSETS = "glyphsets"
 
+GLYPH_CACHE_DOMAIN = "font_glyphs"
+# Number of glyphs kept in the cache per font file, size and bpp
+MAX_CACHED_GLYPHS = 4096
+# Render glyphs in worker processes when there are at least this many to render
+PARALLEL_RENDER_GLYPHS = 1024
+RENDER_WORKERS = min(8, os.cpu_count() or 1)
+
 
 # Cache loaded freetype fonts
 class FontCache(dict):
@@ -250,6 +258,9 @@ def download_gfont(value):
     url = f"https://fonts.googleapis.com/css2?family={name}"
     path = get_font_path(value, TYPE_GFONTS)
     _LOGGER.debug("download_gfont: path=%s", path)
+    if external_files.is_checked(path):
+        # Downloaded by prefetch_files()
+        return FULLPATH_SCHEMA(path)
 
     try:
         req = requests.get(url, timeout=external_files.NETWORK_TIMEOUT)
@@ -368,6 +379,21 @@ def font_file_schema(value):
     return TYPED_FILE_SCHEMA(value)
 
 
+def _is_remote_file(value) -> bool:
+    if isinstance(value, str):
+        return value.startswith(("gfonts://", "http://", "https://"))
+    return isinstance(value, dict) and value.get(CONF_TYPE) in (TYPE_GFONTS, TYPE_WEB)
+
+
+def prefetch_files(config):
+    """Return the downloads of the remote font files."""
+    return [
+        functools.partial(font_file_schema, conf[CONF_FILE])
+        for conf in (config if isinstance(config, list) else [config])
+        if isinstance(conf, dict) and _is_remote_file(conf.get(CONF_FILE))
+    ]
+
+
 # Default if no glyphs or glyphsets are provided
 DEFAULT_GLYPHSET = "GF_Latin_Kernel"
 # default for bitmap fonts
@@ -512,6 +538,154 @@ class GlyphInfo:
         self.height = height
 
 
+def _font_file_digest(file) -> str:
+    paths = [file[CONF_PATH]]
+    if file[CONF_TYPE] == TYPE_LOCAL_BITMAP:
+        # Pillow bitmap fonts keep the glyph bitmaps in a .pbm file next to the .pil
+        paths.append(Path(file[CONF_PATH]).with_suffix(".pbm"))
+    return ":".join(asset_cache.file_digest(path) for path in paths)
+
+
+@functools.cache
+def _bit_planes(bpp: int) -> list[bytes]:
+    """
+    Translation tables mapping a pixel of a mode "L" glyph mask to each of its
+    bpp bits, most significant first, as 0x00 or 0xFF.
+    """
+    scale = 1 if bpp == 1 else 256 // (1 << bpp)
+    return [
+        bytes(
+            0xFF if (v // scale) & (1 << (bpp - bit_num - 1)) else 0 for v in range(256)
+        )
+        for bit_num in range(bpp)
+    ]
+
+
+def pack_glyph(mask, bpp: int) -> bytes:
+    """
+    Pack the pixels of a glyph mask returned by getmask() into a continuous
+    bitstream of bpp bits per pixel, most significant bit first.
+    """
+    from PIL import Image
+
+    # Masks store one byte per pixel, also those rendered in mode "1"
+    pixels = Image.frombytes("L", mask.size, bytes(mask)).tobytes()
+    if not pixels:
+        return b""
+    bits = bytearray(len(pixels) * bpp)
+    for bit_num, plane in enumerate(_bit_planes(bpp)):
+        bits[bit_num::bpp] = pixels.translate(plane)
+    # A single row image in mode "1" packs the bits with padding only at the end
+    return (
+        Image.frombytes("L", (len(bits), 1), bytes(bits))
+        .convert("1", dither=Image.Dither.NONE)
+        .tobytes()
+    )
+
+
+def _render_chunk(font_files, size, bpp, glyphs):
+    """
+    Render the (codepoint, font file index) pairs in glyphs.
+    This runs in worker processes, so font_files only contains plain dicts.
+    """
+    mode = "1" if bpp == 1 else "L"
+    fonts = {}
+    result = []
+    for codepoint, file_index in glyphs:
+        if (font := fonts.get(file_index)) is None:
+            font = fonts[file_index] = EFont(font_files[file_index], size, ())
+        mask = font.font.getmask(codepoint, mode=mode)
+        offset_x, offset_y = font.font.getoffset(codepoint)
+        width, height = mask.size
+        result.append(
+            (
+                codepoint,
+                file_index,
+                (pack_glyph(mask, bpp), offset_x, offset_y, width, height),
+            )
+        )
+    return result
+
+
+def _render_missing(font_files, size, bpp, glyphs):
+    if len(glyphs) < PARALLEL_RENDER_GLYPHS or RENDER_WORKERS < 2:
+        return _render_chunk(font_files, size, bpp, glyphs)
+    chunks = [glyphs[i::RENDER_WORKERS] for i in range(RENDER_WORKERS)]
+    with ProcessPoolExecutor(RENDER_WORKERS) as executor:
+        results = executor.map(
+            _render_chunk,
+            [font_files] * len(chunks),
+            [size] * len(chunks),
+            [bpp] * len(chunks),
+            chunks,
+        )
+        return flatten(results)
+
+
+def _prune_glyphs(table, used):
+    """
+    Return the glyph table to store in the cache, ordered from least to most
+    recently used. The oldest glyphs are dropped once there are more than
+    MAX_CACHED_GLYPHS, but never the used ones.
+    """
+    keep = max(MAX_CACHED_GLYPHS - len(used), 0)
+    used_set = set(used)
+    unused = [c for c in table if c not in used_set]
+    return {c: table[c] for c in unused[len(unused) - keep :] + used}
+
+
+def render_glyphs(font_files, digests, size, bpp, codepoints):
+    """
+    Render the codepoints, each one with the last font file that lists it.
+    Rendered glyphs are kept in a cache per font file, size and bpp, so only
+    glyphs that were not rendered before need to be rendered, in parallel if
+    there are many of them.
+    Returns the packed glyph data, a map from codepoint to its GlyphInfo and the
+    ascent and descent of the base font.
+    """
+    point_file_map: dict[str, int] = {}
+    for file_index, (_, points) in enumerate(font_files):
+        point_file_map.update({c: file_index for c in points})
+    tables = []
+    for digest in digests:
+        key = asset_cache.asset_key(
+            GLYPH_CACHE_DOMAIN, [digest], {CONF_SIZE: size, CONF_BPP: bpp}
+        )
+        tables.append((key, asset_cache.load(GLYPH_CACHE_DOMAIN, key) or {}))
+
+    missing = [
+        (c, point_file_map[c])
+        for c in codepoints
+        if c not in tables[point_file_map[c]][1]
+    ]
+    if missing:
+        _LOGGER.debug("Rendering %d of %d glyphs", len(missing), len(codepoints))
+        plain_files = [
+            {CONF_PATH: str(file[CONF_PATH]), CONF_TYPE: str(file[CONF_TYPE])}
+            for file, _ in font_files
+        ]
+        for codepoint, file_index, glyph in _render_missing(
+            plain_files, size, bpp, missing
+        ):
+            tables[file_index][1][codepoint] = glyph
+        for file_index in {file_index for _, file_index in missing}:
+            key, table = tables[file_index]
+            used = [c for c in codepoints if point_file_map[c] == file_index]
+            asset_cache.save(GLYPH_CACHE_DOMAIN, key, _prune_glyphs(table, used))
+
+    glyph_args = {}
+    data = bytearray()
+    for codepoint in codepoints:
+        glyph_data, offset_x, offset_y, width, height = tables[
+            point_file_map[codepoint]
+        ][1][codepoint]
+        glyph_args[codepoint] = GlyphInfo(len(data), offset_x, offset_y, width, height)
+        data += glyph_data
+    base_file, base_points = font_files[0]
+    base_font = EFont(base_file, size, base_points)
+    return bytes(data), glyph_args, base_font.ascent, base_font.descent
+
+
 async def to_code(config):
     """
     Collect all glyph codepoints, construct a map from a codepoint to a font file.
@@ -530,44 +704,31 @@ async def to_code(config):
     # get the codepoints from the glyphs key, flatten to a list of chrs and combine with the points from glyphsets
     point_set.update(flatten(config[CONF_GLYPHS]))
     size = config[CONF_SIZE]
-    # Create the codepoint to font file map
-    base_font = EFont(config[CONF_FILE], size, point_set)
-    point_font_map: dict[str, EFont] = {c: base_font for c in point_set}
-    # process extras, updating the map and extending the codepoint list
+    bpp = config[CONF_BPP]
+    # The font files with the codepoints taken from each, the extras override the
+    # codepoints from the files before them
+    font_files = [(config[CONF_FILE], set(point_set))]
     for extra in config[CONF_EXTRAS]:
         extra_points = flatten(extra[CONF_GLYPHS])
         point_set.update(extra_points)
-        extra_font = EFont(extra[CONF_FILE], size, extra_points)
-        point_font_map.update({c: extra_font for c in extra_points})
+        font_files.append((extra[CONF_FILE], extra_points))
 
     codepoints = list(point_set)
     codepoints.sort(key=functools.cmp_to_key(glyph_comparator))
-    glyph_args = {}
-    data = []
-    bpp = config[CONF_BPP]
-    if bpp == 1:
-        mode = "1"
-        scale = 1
-    else:
-        mode = "L"
-        scale = 256 // (1 << bpp)
-    # create the data array for all glyphs
-    for codepoint in codepoints:
-        font = point_font_map[codepoint]
-        mask = font.font.getmask(codepoint, mode=mode)
-        offset_x, offset_y = font.font.getoffset(codepoint)
-        width, height = mask.size
-        glyph_data = [0] * ((height * width * bpp + 7) // 8)
-        pos = 0
-        for y in range(height):
-            for x in range(width):
-                pixel = mask.getpixel((x, y)) // scale
-                for bit_num in range(bpp):
-                    if pixel & (1 << (bpp - bit_num - 1)):
-                        glyph_data[pos // 8] |= 0x80 >> (pos % 8)
-                    pos += 1
-        glyph_args[codepoint] = GlyphInfo(len(data), offset_x, offset_y, width, height)
-        data += glyph_data
+    digests = [_font_file_digest(file) for file, _ in font_files]
+    key = asset_cache.asset_key(
+        DOMAIN,
+        digests,
+        {
+            CONF_SIZE: size,
+            CONF_BPP: bpp,
+            CONF_GLYPHS: [sorted(points) for _, points in font_files],
+        },
+    )
+    if (cached := asset_cache.load(DOMAIN, key)) is None:
+        cached = render_glyphs(font_files, digests, size, bpp, codepoints)
+        asset_cache.save(DOMAIN, key, cached)
+    data, glyph_args, ascent, descent = cached
 
     rhs = [HexInt(x) for x in data]
     prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], rhs)
@@ -603,7 +764,7 @@ async def to_code(config):
         config[CONF_ID],
         glyphs,
         len(glyph_initializer),
-        base_font.ascent,
-        base_font.ascent + base_font.descent,
+        ascent,
+        ascent + descent,
         bpp,
     )
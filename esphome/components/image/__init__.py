@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import io
 import logging
@@ -8,7 +9,7 @@ import re
 
 import puremagic
 
-from esphome import core, external_files
+from esphome import asset_cache, core, external_files
 import esphome.codegen as cg
 from esphome.components import font
 import esphome.config_validation as cv
@@ -212,6 +213,25 @@ def _file_schema(value):
 
 FILE_SCHEMA = cv.Schema(_file_schema)
 
+
+def _is_remote_file(value) -> bool:
+    if isinstance(value, str):
+        return value.startswith(("mdi:", "http://", "https://"))
+    return isinstance(value, dict) and value.get(CONF_SOURCE) in (
+        SOURCE_MDI,
+        SOURCE_WEB,
+    )
+
+
+def prefetch_files(config, file_schema=FILE_SCHEMA):
+    """Return the downloads of the remote files of the images."""
+    return [
+        functools.partial(file_schema, conf[CONF_FILE])
+        for conf in (config if isinstance(config, list) else [config])
+        if isinstance(conf, dict) and _is_remote_file(conf.get(CONF_FILE))
+    ]
+
+
 IMAGE_SCHEMA = cv.Schema(
     cv.All(
         {
@@ -257,29 +277,123 @@ def load_svg_image(file: bytes, resize: tuple[int, int]):
     return Image.open(io.BytesIO(svg_image))
 
 
-async def to_code(config):
-    # Local import only to allow "validate_pillow_installed" to run *before* importing it
+def _threshold(band, test):
+    """Return a mode "1" mask of the pixels of an "L" band for which test is true."""
+    return band.point([0xFF if test(v) else 0 for v in range(256)], "1")
+
+
+def _nonzero_mask(band):
+    """Return a mode "1" mask of the non-zero pixels of a single band image."""
     from PIL import Image
 
-    conf_file = config[CONF_FILE]
+    if band.mode == "1":
+        return band
+    if band.mode in ("L", "P"):
+        # Use the raw values, a palette must not change which pixels are zero
+        return _threshold(Image.frombytes("L", band.size, band.tobytes()), bool)
+    mask = Image.new("1", band.size)
+    mask.putdata([0xFF if v else 0 for v in band.getdata()])
+    return mask
 
-    if conf_file[CONF_SOURCE] == SOURCE_LOCAL:
-        path = CORE.relative_config_path(conf_file[CONF_PATH])
 
-    elif conf_file[CONF_SOURCE] == SOURCE_MDI:
-        path = _compute_local_icon_path(conf_file).as_posix()
+def pack_grayscale(image, transparent: bool) -> bytes:
+    """Pack an "LA" image into one byte per pixel.
 
-    elif conf_file[CONF_SOURCE] == SOURCE_WEB:
-        path = compute_local_image_path(conf_file).as_posix()
+    With transparency, gray level 1 marks transparent pixels.
+    """
+    gray, alpha = image.split()
+    if transparent:
+        gray = gray.point([0 if v == 1 else v for v in range(256)])
+        gray.paste(1, mask=_threshold(alpha, lambda v: v < 0x80))
+    return gray.tobytes()
 
-    else:
-        raise core.EsphomeError(f"Unknown image source: {conf_file[CONF_SOURCE]}")
 
-    try:
-        with open(path, "rb") as f:
-            file_contents = f.read()
-    except Exception as e:
-        raise core.EsphomeError(f"Could not load image file {path}: {e}")
+def pack_rgba(image) -> bytes:
+    """Pack an "RGBA" image into four bytes per pixel."""
+    return image.tobytes()
+
+
+def pack_rgb24(image, transparent: bool) -> bytes:
+    """Pack an "RGBA" image into three bytes per pixel.
+
+    With transparency, the color (0, 0, 1) marks transparent pixels.
+    """
+    from PIL import Image, ImageChops
+
+    red, green, blue, alpha = image.split()
+    if transparent:
+        # (0, 0, 1) is reserved for transparency, replace it with black
+        key = ImageChops.logical_and(
+            _threshold(ImageChops.lighter(red, green), lambda v: v == 0),
+            _threshold(blue, lambda v: v == 1),
+        )
+        blue.paste(0, mask=key)
+        transparent_mask = _threshold(alpha, lambda v: v < 0x80)
+        red.paste(0, mask=transparent_mask)
+        green.paste(0, mask=transparent_mask)
+        blue.paste(1, mask=transparent_mask)
+    return Image.merge("RGB", (red, green, blue)).tobytes()
+
+
+def pack_rgb565(image, transparent: bool) -> bytes:
+    """Pack an "RGBA" image into two big-endian RGB565 bytes per pixel.
+
+    With transparency, the color 0x0020 marks transparent pixels.
+    """
+    from PIL import Image, ImageChops
+
+    red, green, blue, alpha = image.split()
+    # The bit fields don't overlap, so adding them is the same as or-ing them
+    high = ImageChops.add(
+        red.point([v & 0xF8 for v in range(256)]),
+        green.point([v >> 5 for v in range(256)]),
+    )
+    low = ImageChops.add(
+        green.point([(v << 3) & 0xE0 for v in range(256)]),
+        blue.point([v >> 3 for v in range(256)]),
+    )
+    if transparent:
+        # 0x0020 is reserved for transparency, replace it with black
+        key = ImageChops.logical_and(
+            _threshold(high, lambda v: v == 0),
+            _threshold(low, lambda v: v == 0x20),
+        )
+        low.paste(0, mask=key)
+        transparent_mask = _threshold(alpha, lambda v: v < 0x80)
+        high.paste(0, mask=transparent_mask)
+        low.paste(0x20, mask=transparent_mask)
+    return Image.merge("LA", (high, low)).tobytes()
+
+
+def pack_binary(image, alpha=None) -> bytes:
+    """Pack a "1" image into one bit per pixel, rows padded to whole bytes.
+
+    Without alpha a bit is set for every black pixel, with alpha for every pixel with
+    a non-zero alpha value.
+    """
+    if alpha is not None:
+        return _nonzero_mask(alpha).tobytes()
+    # Pillow sets the bits of white pixels, invert that
+    data = bytearray(image.tobytes().translate(_INVERT_BITS))
+    width, _ = image.size
+    if padding := -width % 8:
+        # Clear the padding bits at the end of each row again
+        stride = (width + 7) // 8
+        mask = (0xFF << padding) & 0xFF
+        data[stride - 1 :: stride] = bytes(b & mask for b in data[stride - 1 :: stride])
+    return bytes(data)
+
+
+_INVERT_BITS = bytes(0xFF - v for v in range(256))
+
+
+def convert_image(config, file_contents: bytes) -> tuple[bytes, int, int]:
+    """Convert the image in ``file_contents`` as configured.
+
+    Returns the packed pixel data, width and height.
+    """
+    # Local import only to allow "validate_pillow_installed" to run *before* importing it
+    from PIL import Image
 
     file_type = puremagic.from_string(file_contents, mime=True)
 
@@ -291,15 +405,6 @@ async def to_code(config):
         if resize:
             image.thumbnail(resize)
 
-    width, height = image.size
-
-    if CONF_RESIZE not in config and (width > 500 or height > 500):
-        _LOGGER.warning(
-            'The image "%s" you requested is very big. Please consider'
-            " using the resize parameter.",
-            path,
-        )
-
     transparent = config[CONF_USE_TRANSPARENCY]
 
     dither = (
@@ -308,100 +413,76 @@ async def to_code(config):
         else Image.Dither.FLOYDSTEINBERG
     )
     if config[CONF_TYPE] == "GRAYSCALE":
-        image = image.convert("LA", dither=dither)
-        pixels = list(image.getdata())
-        data = [0 for _ in range(height * width)]
-        pos = 0
-        for g, a in pixels:
-            if transparent:
-                if g == 1:
-                    g = 0
-                if a < 0x80:
-                    g = 1
-
-            data[pos] = g
-            pos += 1
+        data = pack_grayscale(image.convert("LA", dither=dither), transparent)
 
     elif config[CONF_TYPE] == "RGBA":
-        image = image.convert("RGBA")
-        pixels = list(image.getdata())
-        data = [0 for _ in range(height * width * 4)]
-        pos = 0
-        for r, g, b, a in pixels:
-            data[pos] = r
-            pos += 1
-            data[pos] = g
-            pos += 1
-            data[pos] = b
-            pos += 1
-            data[pos] = a
-            pos += 1
+        data = pack_rgba(image.convert("RGBA"))
 
     elif config[CONF_TYPE] == "RGB24":
-        image = image.convert("RGBA")
-        pixels = list(image.getdata())
-        data = [0 for _ in range(height * width * 3)]
-        pos = 0
-        for r, g, b, a in pixels:
-            if transparent:
-                if r == 0 and g == 0 and b == 1:
-                    b = 0
-                if a < 0x80:
-                    r = 0
-                    g = 0
-                    b = 1
-
-            data[pos] = r
-            pos += 1
-            data[pos] = g
-            pos += 1
-            data[pos] = b
-            pos += 1
+        data = pack_rgb24(image.convert("RGBA"), transparent)
 
     elif config[CONF_TYPE] in ["RGB565"]:
-        image = image.convert("RGBA")
-        pixels = list(image.getdata())
-        data = [0 for _ in range(height * width * 2)]
-        pos = 0
-        for r, g, b, a in pixels:
-            R = r >> 3
-            G = g >> 2
-            B = b >> 3
-            rgb = (R << 11) | (G << 5) | B
-
-            if transparent:
-                if rgb == 0x0020:
-                    rgb = 0
-                if a < 0x80:
-                    rgb = 0x0020
-
-            data[pos] = rgb >> 8
-            pos += 1
-            data[pos] = rgb & 0xFF
-            pos += 1
+        data = pack_rgb565(image.convert("RGBA"), transparent)
 
     elif config[CONF_TYPE] in ["BINARY", "TRANSPARENT_BINARY"]:
+        alpha = None
         if transparent:
             alpha = image.split()[-1]
             has_alpha = alpha.getextrema()[0] < 0xFF
             _LOGGER.debug("%s Has alpha: %s", config[CONF_ID], has_alpha)
-        image = image.convert("1", dither=dither)
-        width8 = ((width + 7) // 8) * 8
-        data = [0 for _ in range(height * width8 // 8)]
-        for y in range(height):
-            for x in range(width):
-                if transparent and has_alpha:
-                    a = alpha.getpixel((x, y))
-                    if not a:
-                        continue
-                elif image.getpixel((x, y)):
-                    continue
-                pos = x + y * width8
-                data[pos // 8] |= 0x80 >> (pos % 8)
+            if not has_alpha:
+                alpha = None
+        data = pack_binary(image.convert("1", dither=dither), alpha)
     else:
         raise core.EsphomeError(
             f"Image f{config[CONF_ID]} has an unsupported type: {config[CONF_TYPE]}."
         )
+    return data, *image.size
+
+
+async def to_code(config):
+    conf_file = config[CONF_FILE]
+
+    if conf_file[CONF_SOURCE] == SOURCE_LOCAL:
+        path = CORE.relative_config_path(conf_file[CONF_PATH])
+
+    elif conf_file[CONF_SOURCE] == SOURCE_MDI:
+        path = _compute_local_icon_path(conf_file).as_posix()
+
+    elif conf_file[CONF_SOURCE] == SOURCE_WEB:
+        path = compute_local_image_path(conf_file).as_posix()
+
+    else:
+        raise core.EsphomeError(f"Unknown image source: {conf_file[CONF_SOURCE]}")
+
+    try:
+        with open(path, "rb") as f:
+            file_contents = f.read()
+    except Exception as e:
+        raise core.EsphomeError(f"Could not load image file {path}: {e}")
+
+    transparent = config[CONF_USE_TRANSPARENCY]
+    key = asset_cache.asset_key(
+        DOMAIN,
+        [asset_cache.digest(file_contents)],
+        {
+            CONF_TYPE: config[CONF_TYPE],
+            CONF_RESIZE: config.get(CONF_RESIZE),
+            CONF_DITHER: config[CONF_DITHER],
+            CONF_USE_TRANSPARENCY: transparent,
+        },
+    )
+    if (cached := asset_cache.load(DOMAIN, key)) is None:
+        cached = convert_image(config, file_contents)
+        asset_cache.save(DOMAIN, key, cached)
+    data, width, height = cached
+
+    if CONF_RESIZE not in config and (width > 500 or height > 500):
+        _LOGGER.warning(
+            'The image "%s" you requested is very big. Please consider'
+            " using the resize parameter.",
+            path,
+        )
 
     rhs = [HexInt(x) for x in data]
     prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], rhs)
@@ -1,3 +1,4 @@
+import functools
 import hashlib
 import json
 import logging
@@ -351,6 +352,25 @@ CONFIG_SCHEMA = cv.All(
 )
 
 
+def prefetch_files(config):
+    """Return the downloads of the models."""
+    if not isinstance(config, dict):
+        return []
+    models = config.get(CONF_MODELS)
+    sources = [
+        model.get(CONF_MODEL) if isinstance(model, dict) else model
+        for model in (models if isinstance(models, list) else [models])
+    ]
+    if CONF_VAD in config:
+        vad = config[CONF_VAD]
+        sources.append(vad.get(CONF_MODEL, "vad") if isinstance(vad, dict) else "vad")
+    return [
+        functools.partial(MODEL_SOURCE_SCHEMA, source)
+        for source in sources
+        if source is not None
+    ]
+
+
 def _load_model_data(manifest_path: Path):
     with open(manifest_path, encoding="utf-8") as f:
         manifest = json.load(f)
@@ -2,7 +2,7 @@ from pathlib import Path
 
 import esphome.config_validation as cv
 from esphome import git, yaml_util
-from esphome.config_helpers import merge_config
+from esphome.config_helpers import merge_configs
 from esphome.const import (
     CONF_ESPHOME,
     CONF_FILE,
@@ -170,6 +170,7 @@ def do_packages_pass(config: dict):
                 f"Packages must be a key to value mapping, got {type(packages)} instead"
             )
 
+        configs = [config]
         for package_name, package_config in reversed(packages.items()):
             with cv.prepend_path(package_name):
                 recursive_package = package_config
@@ -177,7 +178,9 @@ def do_packages_pass(config: dict):
                     package_config = _process_base_package(package_config)
                 if isinstance(package_config, dict):
                     recursive_package = do_packages_pass(package_config)
-                config = merge_config(recursive_package, config)
+                configs.append(recursive_package)
+        # Merge all packages at once, the config itself takes precedence
+        config = merge_configs(configs[::-1])
 
         del config[CONF_PACKAGES]
     return config
@@ -1,3 +1,4 @@
+import functools
 import logging
 
 import esphome.config_validation as cv
@@ -37,77 +38,140 @@ async def to_code(config):
     pass
 
 
+@functools.lru_cache(maxsize=4096)
+def _compile_template(value):
+    """Split a string at the substitutions in it.
+
+    Returns the literal text before each substitution with the name and the
+    original text of the substitution, and the literal text after the last one.
+    """
+    parts = []
+    start = 0
+    for m in cv.VARIABLE_PROG.finditer(value):
+        name = m.group(1)
+        if name.startswith("{") and name.endswith("}"):
+            name = name[1:-1]
+        parts.append((value[start : m.start()], name, m.group(0)))
+        start = m.end()
+    return tuple(parts), value[start:]
+
+
 def _expand_substitutions(substitutions, value, path, ignore_missing):
     if "$" not in value:
         return value
 
-    orig_value = value
-
-    i = 0
-    while True:
-        m = cv.VARIABLE_PROG.search(value, i)
-        if not m:
-            # Nothing more to match. Done
-            break
+    parts, tail = _compile_template(value)
+    if not parts:
+        return value
 
-        i, j = m.span(0)
-        name = m.group(1)
-        if name.startswith("{") and name.endswith("}"):
-            name = name[1:-1]
-        if name not in substitutions:
-            if not ignore_missing and "password" not in path:
-                _LOGGER.warning(
-                    "Found '%s' (see %s) which looks like a substitution, but '%s' was "
-                    "not declared",
-                    orig_value,
-                    "->".join(str(x) for x in path),
-                    name,
-                )
-            i = j
+    expanded = []
+    for text, name, orig in parts:
+        expanded.append(text)
+        if name in substitutions:
+            expanded.append(substitutions[name])
             continue
+        if not ignore_missing and "password" not in path:
+            _LOGGER.warning(
+                "Found '%s' (see %s) which looks like a substitution, but '%s' was "
+                "not declared",
+                value,
+                "->".join(str(x) for x in path),
+                name,
+            )
+        expanded.append(orig)
+    expanded.append(tail)
+    expanded = "".join(expanded)
 
-        sub = substitutions[name]
-        tail = value[j:]
-        value = value[:i] + sub
-        i = len(value)
-        value += tail
-
-    # orig_value can also already be a lambda with esp_range info, and only
-    # a plain string is sent in orig_value
-    if isinstance(orig_value, ESPHomeDataBase):
+    # value can also already be a lambda with esp_range info, and only
+    # a plain string is sent in value
+    if isinstance(value, ESPHomeDataBase):
         # even though string can get larger or smaller, the range should point
         # to original document marks
-        return make_data_base(value, orig_value)
-
-    return value
+        return make_data_base(expanded, value)
+
+    return expanded
+
+
+def _resolve_substitutions(substitutions, ignore_missing):
+    """Expand the substitutions used in the values of other substitutions.
+
+    Every value is expanded after the substitutions it uses, so the values
+    don't contain substitutions anymore afterwards.
+    """
+    resolved = {}
+    # The substitutions being resolved, to detect circular references
+    resolving = []
+
+    def resolve(key):
+        if key in resolved:
+            return resolved[key]
+        value = substitutions[key]
+        used = {}
+        if "$" in value:
+            resolving.append(key)
+            for _, name, orig in _compile_template(value)[0]:
+                if name not in substitutions:
+                    continue
+                if name in resolving:
+                    if ignore_missing:
+                        # Refers to a substitution of the including file
+                        used[name] = orig
+                        continue
+                    cycle = " -> ".join(resolving[resolving.index(name) :] + [name])
+                    raise cv.Invalid(
+                        f"Substitution '{name}' refers to itself: {cycle}", [name]
+                    )
+                used[name] = resolve(name)
+            resolving.pop()
+        resolved[key] = _expand_substitutions(
+            used, value, [CONF_SUBSTITUTIONS, key], ignore_missing
+        )
+        return resolved[key]
+
+    for key in substitutions:
+        substitutions[key] = resolve(key)
 
 
 def _substitute_item(substitutions, item, path, ignore_missing):
-    if isinstance(item, list):
-        for i, it in enumerate(item):
-            sub = _substitute_item(substitutions, it, path + [i], ignore_missing)
-            if sub is not None:
-                item[i] = sub
+    """Substitute the values in item, returns the replacement of item if any.
+
+    path is the path of item, it is extended while descending and restored
+    before returning.
+    """
+    if isinstance(item, str):
+        sub = _expand_substitutions(substitutions, item, path, ignore_missing)
+        if sub != item:
+            return sub
     elif isinstance(item, dict):
         replace_keys = []
+        top_level = not path
         for k, v in item.items():
-            if path or k != CONF_SUBSTITUTIONS:
-                sub = _substitute_item(substitutions, k, path + [k], ignore_missing)
-                if sub is not None:
+            if top_level and k == CONF_SUBSTITUTIONS:
+                # Already resolved
+                continue
+            path.append(k)
+            if isinstance(k, str):
+                sub = _expand_substitutions(substitutions, k, path, ignore_missing)
+                if sub != k:
                     replace_keys.append((k, sub))
-            sub = _substitute_item(substitutions, v, path + [k], ignore_missing)
+            sub = _substitute_item(substitutions, v, path, ignore_missing)
             if sub is not None:
                 item[k] = sub
+            path.pop()
         for old, new in replace_keys:
             item[new] = merge_config(item.get(old), item.get(new))
             del item[old]
-    elif isinstance(item, str):
-        sub = _expand_substitutions(substitutions, item, path, ignore_missing)
-        if sub != item:
-            return sub
+    elif isinstance(item, list):
+        path.append(0)
+        for i, it in enumerate(item):
+            path[-1] = i
+            sub = _substitute_item(substitutions, it, path, ignore_missing)
+            if sub is not None:
+                item[i] = sub
+        path.pop()
     elif isinstance(item, (core.Lambda, Extend, Remove)):
         sub = _expand_substitutions(substitutions, item.value, path, ignore_missing)
-        if sub != item:
+        if sub != item.value:
             item.value = sub
     return None
 
@@ -138,7 +202,9 @@ def do_substitution_pass(config, command_line_substitutions, ignore_missing=Fals
             substitutions[new] = substitutions[old]
             del substitutions[old]
 
+        _resolve_substitutions(substitutions, ignore_missing)
+
     config[CONF_SUBSTITUTIONS] = substitutions
-    # Move substitutions to the first place to replace substitutions in them correctly
+    # Move substitutions to the first place
     config.move_to_end(CONF_SUBSTITUTIONS, False)
     _substitute_item(substitutions, config, [], ignore_missing)
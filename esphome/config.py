@@ -3,6 +3,7 @@ from __future__ import annotations
 import abc
 from contextlib import contextmanager
 import contextvars
+import copy
 import functools
 import heapq
 import logging
@@ -11,7 +12,7 @@ from typing import Any, Union
 
 import voluptuous as vol
 
-from esphome import core, loader, pins, yaml_util
+from esphome import config_cache, core, loader, pins, prefetch, yaml_util
 from esphome.config_helpers import Extend, Remove
 import esphome.config_validation as cv
 from esphome.const import (
@@ -73,6 +74,77 @@ def _path_begins_with(path: ConfigPath, other: ConfigPath) -> bool:
     return path[: len(other)] == other
 
 
+def _fingerprint(value: Any) -> Any:
+    """Return a hashable key of a raw config fragment and its document ranges."""
+    range_ = value.esp_range if isinstance(value, ESPHomeDataBase) else None
+    if isinstance(value, dict):
+        content = tuple((_fingerprint(k), _fingerprint(v)) for k, v in value.items())
+    elif isinstance(value, list):
+        content = tuple(_fingerprint(v) for v in value)
+    else:
+        content = repr(value)
+    return type(value).__name__, content, str(range_) if range_ else None
+
+
+def _copy_validated(value: Any, memo: dict[int, Any]) -> Any:
+    """Copy the parts of a validated config that later validation steps change."""
+    if (copied := memo.get(id(value))) is not None:
+        return copied
+    if isinstance(value, core.ID):
+        copied = value.copy()
+    elif isinstance(value, dict):
+        copied = copy.copy(value)
+        copied.clear()
+        memo[id(value)] = copied
+        for key, item in value.items():
+            copied[_copy_validated(key, memo)] = _copy_validated(item, memo)
+        return copied
+    elif isinstance(value, list):
+        copied = copy.copy(value)
+        memo[id(value)] = copied
+        copied[:] = [_copy_validated(item, memo) for item in value]
+        return copied
+    elif type(value) is tuple:  # pylint: disable=unidiomatic-typecheck
+        copied = tuple(_copy_validated(item, memo) for item in value)
+    else:
+        return value
+    memo[id(value)] = copied
+    return copied
+
+
+class SchemaCache:
+    """Validated domain configs, kept between validations of the same file.
+
+    A domain whose raw config and validation context didn't change since the
+    previous validation gets a copy of its previous result instead of being
+    validated again. Entries not used by a validation are dropped by the next.
+    """
+
+    def __init__(self) -> None:
+        self._previous: dict[Any, tuple[Any, list[tuple[Any, Any]]]] = {}
+        self._current: dict[Any, tuple[Any, list[tuple[Any, Any]]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def start(self) -> None:
+        """Start a validation, forgetting entries the last one didn't use."""
+        self._previous, self._current = self._current, {}
+
+    def get(self, key: Any) -> tuple[Any, list[tuple[Any, Any]]] | None:
+        """Return a copy of the validated config and the pins it uses."""
+        entry = self._current.get(key) or self._previous.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._current[key] = entry
+        return _copy_validated(entry, {})
+
+    def put(self, key: Any, validated: Any, pins_used: list[tuple[Any, Any]]) -> None:
+        """Store a copy of the validated config and the pins it uses."""
+        self._current[key] = _copy_validated((validated, pins_used), {})
+
+
 @functools.total_ordering
 class _ValidationStepTask:
     def __init__(self, priority: float, id_number: int, step: ConfigValidationStep):
@@ -105,11 +177,17 @@ class Config(OrderedDict, fv.FinalValidateConfig):
         self.output_paths: list[tuple[ConfigPath, str]] = []
         # A list of components ids with the config path
         self.declare_ids: list[tuple[core.ID, ConfigPath]] = []
+        # The paths of the declared IDs by name, filled by the ID pass
+        self.declare_id_paths: dict[str, ConfigPath] = {}
         self._data = {}
         # Store pending validation tasks (in heap order)
         self._validation_tasks: list[_ValidationStepTask] = []
         # ID to ensure stable order for keys with equal priority
         self._validation_tasks_id = 0
+        # Validated domain configs of earlier validations to reuse
+        self.schema_cache: SchemaCache | None = None
+        # Fingerprint of the config every domain's validation depends on
+        self.schema_cache_context: Any = None
 
     def add_error(self, error: vol.Invalid) -> None:
         if isinstance(error, vol.MultipleInvalid):
@@ -237,10 +315,9 @@ class Config(OrderedDict, fv.FinalValidateConfig):
 
     def get_path_for_id(self, id: core.ID):
         """Return the config fragment where the given ID is declared."""
-        for declared_id, path in self.declare_ids:
-            if declared_id.id == str(id):
-                return path
-        raise KeyError(f"ID {id} not found in configuration")
+        if (path := self.declare_id_paths.get(str(id))) is None:
+            raise KeyError(f"ID {id} not found in configuration")
+        return path
 
     def get_config_for_path(self, path: ConfigPath) -> ConfigFragmentType:
         return self.get_nested_item(path, raise_error=True)
@@ -543,6 +620,45 @@ class SchemaValidationStep(ConfigValidationStep):
         self.comp = comp
 
     def run(self, result: Config) -> None:
+        if (cache := result.schema_cache) is None:
+            self._run(result)
+            return
+        registry = pins.PIN_SCHEMA_REGISTRY
+        data = repr(CORE.data)
+        key = (
+            tuple(self.path),
+            result.schema_cache_context,
+            frozenset(CORE.loaded_integrations),
+            data,
+            _fingerprint(self.conf),
+        )
+        if (cached := cache.get(key)) is not None:
+            validated, pins_used = cached
+            result.set_by_path(self.path, validated)
+            for pin_key, pin_use in pins_used:
+                registry.pins_used.setdefault(pin_key, []).append(pin_use)
+            result.add_validation_step(
+                FinalValidateValidationStep(self.path, self.comp)
+            )
+            return
+
+        errors = len(result.errors)
+        pins_before = {k: len(v) for k, v in registry.pins_used.items()}
+        self._run(result)
+        # Results that failed or left state behind in CORE.data are not reused
+        if len(result.errors) != errors or repr(CORE.data) != data:
+            return
+        pins_used = [
+            (pin_key, pin_use)
+            for pin_key, uses in registry.pins_used.items()
+            for pin_use in uses[pins_before.get(pin_key, 0) :]
+        ]
+        try:
+            cache.put(key, result.get_nested_item(self.path), pins_used)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Could not cache validated config of %s: %s", self.path, err)
+
+    def _run(self, result: Config) -> None:
         token = path_context.set(self.path)
         with result.catch_error(self.path):
             if self.comp.is_platform:
@@ -592,36 +708,52 @@ class IDPassValidationStep(ConfigValidationStep):
             return
 
         searching_ids: list[tuple[core.ID, ConfigPath]] = []
+        declared: dict[str, tuple[core.ID, ConfigPath]] = {}
         for id, path in iter_ids(result):
             if id.is_declaration:
                 if id.id is not None:
                     # Look for duplicate definitions
-                    match = next(
-                        (v for v in result.declare_ids if v[0].id == id.id), None
-                    )
+                    match = declared.get(id.id)
                     if match is not None:
                         opath = "->".join(str(v) for v in match[1])
                         result.add_str_error(
                             f"ID {id.id} redefined! Check {opath}", path
                         )
                         continue
+                    declared[id.id] = (id, path)
                 result.declare_ids.append((id, path))
             else:
                 searching_ids.append((id, path))
 
         # Resolve default ids after manual IDs
-        for id, _ in result.declare_ids:
-            id.resolve([v[0].id for v in result.declare_ids])
-            if isinstance(id.type, MockObjClass) and id.type.inherits_from(Component):
-                CORE.component_ids.add(id.id)
+        used = set(declared) | set(cv.RESERVED_IDS) | CORE.loaded_integrations
+        # The last suffix given to each default name
+        suffixes: dict[str, int] = {}
+        # Declared IDs by the name of their class and of every class it inherits from
+        by_class: dict[str, list[core.ID]] = {}
+        for id, path in result.declare_ids:
+            if id.id is None:
+                name = id.default_name
+                suffix = suffixes.get(name, 1)
+                id.id = name if suffix == 1 else f"{name}_{suffix}"
+                while id.id in used:
+                    suffix += 1
+                    id.id = f"{name}_{suffix}"
+                suffixes[name] = suffix
+                used.add(id.id)
+                declared[id.id] = (id, path)
+            if isinstance(id.type, MockObjClass):
+                for class_name in id.type.class_names():
+                    by_class.setdefault(class_name, []).append(id)
+        for id in by_class.get(str(Component), ()):
+            CORE.component_ids.add(id.id)
+        result.declare_id_paths = {name: path for name, (_, path) in declared.items()}
 
         # Check searched IDs
         for id, path in searching_ids:
             if id.id is not None:
                 # manually declared
-                match = next(
-                    (v[0] for v in result.declare_ids if v[0].id == id.id), None
-                )
+                match, _ = declared.get(id.id, (None, None))
                 if match is None or not match.is_manual:
                     # No declared ID with this name
                     import difflib
@@ -651,13 +783,7 @@ class IDPassValidationStep(ConfigValidationStep):
                     )
 
             if id.id is None and id.type is not None:
-                matches = []
-                for v in result.declare_ids:
-                    if v[0] is None or not isinstance(v[0].type, MockObjClass):
-                        continue
-                    inherits = v[0].type.inherits_from(id.type)
-                    if inherits:
-                        matches.append(v[0])
+                matches = by_class.get(str(id.type), [])
 
                 if len(matches) == 0:
                     result.add_str_error(
@@ -756,14 +882,21 @@ class PinUseValidationCheck(ConfigValidationStep):
 
 
 def validate_config(
-    config: dict[str, Any], command_line_substitutions: dict[str, Any]
+    config: dict[str, Any],
+    command_line_substitutions: dict[str, Any],
+    schema_cache: SchemaCache | None = None,
 ) -> Config:
     result = Config()
+    if schema_cache is not None:
+        schema_cache.start()
 
     loader.clear_component_meta_finders()
     loader.install_custom_components_meta_finder()
 
-    # 0. Load packages
+    # 0. Fetch remote packages and external components concurrently
+    prefetch.prefetch_sources(config)
+
+    # 0.1. Load packages
     if CONF_PACKAGES in config:
         from esphome.components.packages import do_packages_pass
 
@@ -788,7 +921,6 @@ def validate_config(
         result.add_output_path([CONF_SUBSTITUTIONS], CONF_SUBSTITUTIONS)
         try:
             substitutions.do_substitution_pass(config, command_line_substitutions)
-            substitutions.do_substitution_pass(config, command_line_substitutions)
         except vol.Invalid as err:
             result.add_error(err)
             return result
@@ -839,6 +971,19 @@ def validate_config(
     # Remove temporary esphome config path again, it will be reloaded later
     result.remove_output_path([CONF_ESPHOME], CONF_ESPHOME)
 
+    if schema_cache is not None:
+        result.schema_cache = schema_cache
+        result.schema_cache_context = (
+            tuple(config),
+            _fingerprint(
+                {
+                    key: config[key]
+                    for key in (CONF_ESPHOME, *TARGET_PLATFORMS)
+                    if key in config
+                }
+            ),
+        )
+
     # First run platform validation steps
     for key in TARGET_PLATFORMS:
         if key in config:
@@ -849,6 +994,9 @@ def validate_config(
         # do not try to validate further as we don't know what the target is
         return result
 
+    # Download the remote files of all components concurrently
+    prefetch.prefetch_files(config)
+
     for domain, conf in config.items():
         result.add_validation_step(LoadValidationStep(domain, conf))
     result.add_validation_step(IDPassValidationStep())
@@ -1085,10 +1233,23 @@ def strip_default_ids(config):
     return config
 
 
-def read_config(command_line_substitutions):
+def read_config(
+    command_line_substitutions, load_cache: bool = False, save_cache: bool = False
+):
+    """Read and validate the configuration at CORE.config_path.
+
+    :param load_cache: Return the cached validated config if none of its inputs changed.
+    :param save_cache: Store a successfully validated config in the cache.
+    """
     _LOGGER.info("Reading configuration %s...", CORE.config_path)
+    if load_cache:
+        res = config_cache.load(command_line_substitutions)
+        if res is not None:
+            _LOGGER.info("Using cached validated configuration")
+            return res
     try:
-        res = load_config(command_line_substitutions)
+        with config_cache.record() as manifest:
+            res = load_config(command_line_substitutions)
     except EsphomeError as err:
         _LOGGER.error("Error while reading config: %s", err)
         return None
@@ -1121,4 +1282,6 @@ def read_config(command_line_substitutions):
             safe_print("")
 
         return None
+    if save_cache:
+        config_cache.save(command_line_substitutions, manifest, res)
     return res
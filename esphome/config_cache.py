@@ -0,0 +1,322 @@
+"""On-disk cache of validated configurations.
+
+Commands that don't generate code (``logs``, ``upload``, ...) only need the
+validated configuration and the bits of ``CORE`` state that validation fills
+in. Those are stored under ``.esphome/config_cache`` together with a manifest
+of everything the validation read: every YAML file (including ``!include``\\ s
+and ``secrets.yaml``), ``!include_dir_*`` listings, ``!env_var`` values, the
+checked-out SHA of remote packages and external components, the sources of
+external components, the command line substitutions and the ESPHome version.
+
+On the next run the manifest is re-hashed; if nothing changed the stored
+result is returned and validation is skipped entirely.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import contextlib
+import copy
+from dataclasses import dataclass, field
+from datetime import datetime
+import hashlib
+import io
+import json
+import logging
+import os
+from pathlib import Path
+import pickle
+import sys
+import threading
+from typing import Any
+
+from esphome import const
+from esphome.core import CORE
+from esphome.helpers import _CLASS_LOOKUP, _TYPE_OVERLOADS, add_class_to_obj
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+# The CORE attributes that are populated during validation
+_CORE_ATTRIBUTES = (
+    "name",
+    "friendly_name",
+    "area",
+    "build_path",
+    "data",
+    "loaded_integrations",
+    "component_ids",
+)
+
+
+@dataclass
+class _Manifest:
+    files: set[str] = field(default_factory=set)
+    directories: set[tuple[str, str]] = field(default_factory=set)
+    env_vars: set[str] = field(default_factory=set)
+    git_repos: set[str] = field(default_factory=set)
+    # Earliest point in time at which a remote source will be refreshed again
+    expires: float | None = None
+    cacheable: bool = True
+
+
+class _Recorder:
+    """The manifest being recorded.
+
+    Shared by all threads, as the inputs are also read by the prefetch workers.
+    """
+
+    def __init__(self) -> None:
+        self.manifest: _Manifest | None = None
+        self.lock = threading.Lock()
+
+
+_RECORDER = _Recorder()
+
+
+def note_file(path: str) -> None:
+    """Record that the configuration depends on the file at ``path``."""
+    if (manifest := _RECORDER.manifest) is not None:
+        manifest.files.add(os.path.abspath(path))
+
+
+def note_directory(path: str, pattern: str) -> None:
+    """Record that the configuration depends on the listing of ``path``."""
+    if (manifest := _RECORDER.manifest) is not None:
+        manifest.directories.add((os.path.abspath(path), pattern))
+
+
+def note_env_var(name: str) -> None:
+    """Record that the configuration depends on an environment variable."""
+    if (manifest := _RECORDER.manifest) is not None:
+        manifest.env_vars.add(name)
+
+
+def note_git_repo(repo_dir: Path, refresh_at: float | None) -> None:
+    """Record that the configuration depends on a git checkout.
+
+    :param refresh_at: Timestamp after which the checkout will be updated again,
+        None if it is updated on every run.
+    """
+    if (manifest := _RECORDER.manifest) is None:
+        return
+    with _RECORDER.lock:
+        if refresh_at is None:
+            manifest.cacheable = False
+            return
+        manifest.git_repos.add(str(repo_dir))
+        if manifest.expires is None or refresh_at < manifest.expires:
+            manifest.expires = refresh_at
+
+
+@contextlib.contextmanager
+def record() -> Iterator[_Manifest]:
+    """Record the inputs read while the config is loaded and validated."""
+    _RECORDER.manifest = manifest = _Manifest()
+    try:
+        yield manifest
+    finally:
+        _RECORDER.manifest = None
+
+
+def _hash_file(path: str) -> str | None:
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f_handle:
+            for chunk in iter(lambda: f_handle.read(65536), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _list_directory(path: str, pattern: str) -> list[str]:
+    # pylint: disable=protected-access
+    from esphome import yaml_util
+
+    return sorted(yaml_util._find_files(path, pattern))
+
+
+def _git_head(repo_dir: str) -> str | None:
+    from esphome import git
+
+    try:
+        return git.run_git_command(["git", "rev-parse", "HEAD"], repo_dir)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def _source_tree(path: str) -> list[tuple[str, int, int]]:
+    tree = []
+    for root, dirs, files in os.walk(path):
+        # Bytecode is written when the components are imported, it is not a change
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        for name in files:
+            file = os.path.join(root, name)
+            try:
+                st = os.stat(file)
+            except OSError:
+                continue
+            tree.append((file, st.st_size, st.st_mtime_ns))
+    return sorted(tree)
+
+
+def _meta_finder_paths() -> list[tuple[str, list[str] | None]]:
+    from esphome import loader
+
+    return [
+        (str(finder.components_path), finder.allowed_components)
+        for finder in reversed(sys.meta_path)
+        if isinstance(finder, loader.ComponentMetaFinder)
+    ]
+
+
+def _fingerprint(
+    manifest: dict[str, Any], command_line_substitutions: dict[str, Any]
+) -> str:
+    """Compute the hash of the current state of everything in ``manifest``."""
+    state = {
+        "version": const.__version__,
+        "substitutions": command_line_substitutions,
+        "files": {f: _hash_file(f) for f in manifest["files"]},
+        "directories": [
+            (d, p, _list_directory(d, p)) for d, p in manifest["directories"]
+        ],
+        "env_vars": {v: os.environ.get(v) for v in manifest["env_vars"]},
+        "git_repos": {r: _git_head(r) for r in manifest["git_repos"]},
+        "sources": [_source_tree(p) for p, _ in manifest["meta_finders"]],
+    }
+    return hashlib.sha256(
+        json.dumps(state, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def cache_path(command_line_substitutions: dict[str, Any]) -> Path:
+    key = json.dumps(
+        [os.path.abspath(CORE.config_path), command_line_substitutions],
+        sort_keys=True,
+        default=str,
+    )
+    name = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return Path(CORE.data_dir) / "config_cache" / f"{name}.pickle"
+
+
+def _rebuild(value: Any, added: list[type], state: dict[str, Any]) -> Any:
+    for cls in added:
+        value = add_class_to_obj(value, cls)
+    if state:
+        value.__dict__.update(state)
+    return value
+
+
+class _ConfigPickler(pickle.Pickler):
+    """Pickler that can handle the classes created by `add_class_to_obj`.
+
+    Those classes are created at runtime and can't be looked up by name, so
+    they are stored as their base value plus the list of classes to add back.
+    """
+
+    def __init__(self, file) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._added = {v: k for k, v in _CLASS_LOOKUP.items()}
+        self._overloads = {v: k for k, v in _TYPE_OVERLOADS.items()}
+
+    def _decompose(self, type_: type) -> tuple[type, list[type]]:
+        if type_ in self._overloads:
+            return self._overloads[type_], []
+        if type_ in self._added:
+            orig_cls, cls = self._added[type_]
+            base, added = self._decompose(orig_cls)
+            return base, added + [cls]
+        return type_, []
+
+    def reducer_override(self, obj):
+        type_ = type(obj)
+        if type_ not in self._added and type_ not in self._overloads:
+            return NotImplemented
+        base, added = self._decompose(type_)
+        if base in _TYPE_OVERLOADS:
+            return _rebuild, (base(obj), added, getattr(obj, "__dict__", {}))
+        plain = copy.copy(obj)
+        plain.__class__ = base
+        return _rebuild, (plain, added, {})
+
+
+def dumps(obj: Any) -> bytes:
+    """Pickle a config, including the classes added by `add_class_to_obj`."""
+    buf = io.BytesIO()
+    _ConfigPickler(buf).dump(obj)
+    return buf.getvalue()
+
+
+def load(command_line_substitutions: dict[str, Any]):
+    """Return the cached validated config for the current file, or None."""
+    path = cache_path(command_line_substitutions)
+    try:
+        with open(path, "rb") as f_handle:
+            header = pickle.load(f_handle)
+            if header.get("cache_version") != CACHE_VERSION:
+                return None
+            if (
+                header["expires"] is not None
+                and header["expires"] < datetime.now().timestamp()
+            ):
+                _LOGGER.debug("Config cache expired, remote sources need refreshing")
+                return None
+            manifest = header["manifest"]
+            if header["fingerprint"] != _fingerprint(
+                manifest, command_line_substitutions
+            ):
+                _LOGGER.debug("Config cache is out of date")
+                return None
+
+            from esphome import loader
+
+            # Classes from external components must be importable to unpickle
+            loader.clear_component_meta_finders()
+            for components_path, allowed in manifest["meta_finders"]:
+                loader.install_meta_finder(Path(components_path), allowed)
+            payload = pickle.load(f_handle)
+    except FileNotFoundError:
+        return None
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Could not read config cache %s: %s", path, err)
+        return None
+
+    for attr, value in payload["core"].items():
+        setattr(CORE, attr, value)
+    return payload["config"]
+
+
+def save(command_line_substitutions: dict[str, Any], manifest: _Manifest, result):
+    """Store a successfully validated config in the cache."""
+    from esphome.helpers import write_file
+
+    if not manifest.cacheable:
+        _LOGGER.debug("Config uses sources that refresh on every run, not caching")
+        return
+    path = cache_path(command_line_substitutions)
+    manifest_dict = {
+        "files": sorted(manifest.files),
+        "directories": sorted(manifest.directories),
+        "env_vars": sorted(manifest.env_vars),
+        "git_repos": sorted(manifest.git_repos),
+        "meta_finders": _meta_finder_paths(),
+    }
+    header = {
+        "cache_version": CACHE_VERSION,
+        "expires": manifest.expires,
+        "manifest": manifest_dict,
+        "fingerprint": _fingerprint(manifest_dict, command_line_substitutions),
+    }
+    try:
+        payload = dumps(
+            {
+                "config": result,
+                "core": {attr: getattr(CORE, attr) for attr in _CORE_ATTRIBUTES},
+            }
+        )
+        write_file(path, pickle.dumps(header) + payload)
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Could not write config cache %s: %s", path, err)
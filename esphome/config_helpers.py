@@ -40,66 +40,184 @@ class Remove:
 
 
 def merge_config(full_old, full_new):
-    def merge(old, new):
-        if isinstance(new, dict):
-            if not isinstance(old, dict):
-                return new
-            res = old.copy()
-            for k, v in new.items():
-                if isinstance(v, Remove) and k in old:
-                    del res[k]
+    """Merge full_new into full_old, values of full_new take precedence."""
+    return merge_configs([full_old, full_new])
+
+
+def merge_configs(configs):
+    """Merge configs in one pass, later configs take precedence.
+
+    The result is the same as merging each config into the merge of the
+    configs after it, from the last to the first, but every dict and list
+    is copied at most once, and only if more than one config sets it.
+    """
+    return _merge_values(list(configs))
+
+
+# Kinds of merged values, see _last_run
+_ABSENT = object()
+_REMOVE = object()
+_VALUE = object()
+
+
+def _kind(value):
+    if value is None:
+        return None
+    if isinstance(value, Remove):
+        return _REMOVE
+    return _VALUE
+
+
+def _merge_values(values):
+    result = values[-1]
+    for i in range(len(values) - 2, -1, -1):
+        if result is None:
+            result = values[i]
+            continue
+        # Only containers of the same type are merged, otherwise the newer
+        # value replaces the older ones
+        if isinstance(result, dict):
+            layers = [v for v in values[: i + 1] if isinstance(v, dict)]
+            return _merge_dicts(layers + [result]) if layers else result
+        if isinstance(result, list):
+            layers = [v for v in values[: i + 1] if isinstance(v, list)]
+            return _merge_lists(layers + [result]) if layers else result
+        return result
+    return result
+
+
+def _last_run(values):
+    """Return the values of a key that end up in the merge.
+
+    A Remove deletes the key from the next older config that sets it, so
+    only the values older than the oldest such deletion are merged. Returns
+    None if the key is deleted.
+    """
+    end = len(values)
+    state = _kind(values[-1])
+    for i in range(len(values) - 2, -1, -1):
+        if state is _REMOVE:
+            state = _ABSENT
+            end = i
+        elif state is _ABSENT or state is None:
+            state = _kind(values[i])
+    if state is _ABSENT:
+        return None
+    return values[:end]
+
+
+def _merge_dicts(layers):
+    values_by_key = {}
+    for layer in layers:
+        for key, value in layer.items():
+            values_by_key.setdefault(key, []).append(value)
+    res = layers[0].copy()
+    for key, values in values_by_key.items():
+        values = _last_run(values)
+        if values is None:
+            res.pop(key, None)
+        else:
+            res[key] = _merge_values(values)
+    return res
+
+
+def _merge_lists(layers):
+    """Merge lists, items with an ID can extend or remove items of older lists.
+
+    Each list is merged into the merge of the newer lists in turn, like a
+    pair of lists is merged: the items with a !extend or !remove ID look
+    for the item with that ID in the older list, or before them in the
+    newer lists. Instead of copying the newer lists for each list, the
+    items of all lists are kept in one list and only the items with
+    !extend and !remove IDs, and the items that an older list extends,
+    are looked at again.
+    """
+    items = [v for layer in layers for v in layer]
+    starts = [0]
+    for layer in layers:
+        starts.append(starts[-1] + len(layer))
+    # Only items with these IDs can be extended or removed
+    referenced = {
+        v_id.value
+        for v in items
+        if isinstance(v, dict) and isinstance(v_id := v.get(CONF_ID), (Extend, Remove))
+    }
+    if not referenced:
+        return items
+    # Positions of the items that were merged into others or removed
+    dropped = set()
+    # Positions of the items of the newer lists with an ID, newest first
+    positions_by_id = {}
+    # Positions of the items of the newer lists with an !extend or !remove ID
+    pending = []
+
+    for j in range(len(layers) - 1, 0, -1):
+        # The list at j becomes part of the newer lists
+        added = []
+        for pos in range(starts[j + 1] - 1, starts[j] - 1, -1):
+            v = items[pos]
+            if pos in dropped or not isinstance(v, dict):
+                continue
+            if not (v_id := v.get(CONF_ID)):
+                continue
+            if isinstance(v_id, (Extend, Remove)):
+                added.append(pos)
+            elif v_id in referenced:
+                positions_by_id.setdefault(v_id, []).append(pos)
+        pending = added[::-1] + pending
+
+        # Merge the newer lists into the list at j - 1
+        ids = {}
+        extend_ids = {}
+        for pos in range(starts[j - 1], starts[j]):
+            v = items[pos]
+            if isinstance(v, dict) and (v_id := v.get(CONF_ID)):
+                if isinstance(v_id, str):
+                    if v_id in referenced:
+                        ids[v_id] = pos
+                elif isinstance(v_id, Extend):
+                    extend_ids[v_id.value] = pos
+        events = list(pending)
+        for v_id in extend_ids:
+            events.extend(positions_by_id.get(v_id, ()))
+        events.sort()
+
+        to_delete = []
+        for pos in events:
+            v = items[pos]
+            new_id = v[CONF_ID]
+            if isinstance(new_id, (Extend, Remove)):
+                target = _find_id(positions_by_id, ids, new_id.value, pos)
+                if target is None:
+                    continue
+                if isinstance(new_id, Extend):
+                    v[CONF_ID] = new_id.value
+                    items[target] = _merge_values([items[target], v])
                 else:
-                    res[k] = merge(old[k], v) if k in old else v
-            return res
-        if isinstance(new, list):
-            if not isinstance(old, list):
-                return new
-            res = old.copy()
-            ids = {
-                v_id: i
-                for i, v in enumerate(res)
-                if isinstance(v, dict)
-                and (v_id := v.get(CONF_ID))
-                and isinstance(v_id, str)
-            }
-            extend_ids = {
-                v_id.value: i
-                for i, v in enumerate(res)
-                if isinstance(v, dict)
-                and (v_id := v.get(CONF_ID))
-                and isinstance(v_id, Extend)
-            }
-
-            ids_to_delete = []
-            for v in new:
-                if isinstance(v, dict) and (new_id := v.get(CONF_ID)):
-                    if isinstance(new_id, Extend):
-                        new_id = new_id.value
-                        if new_id in ids:
-                            v[CONF_ID] = new_id
-                            res[ids[new_id]] = merge(res[ids[new_id]], v)
-                            continue
-                    elif isinstance(new_id, Remove):
-                        new_id = new_id.value
-                        if new_id in ids:
-                            ids_to_delete.append(ids[new_id])
-                            continue
-                    elif (
-                        new_id in extend_ids
-                    ):  # When a package is extending a non-packaged item
-                        extend_res = res[extend_ids[new_id]]
-                        extend_res[CONF_ID] = new_id
-                        new_v = merge(v, extend_res)
-                        res[extend_ids[new_id]] = new_v
-                        continue
-                    else:
-                        ids[new_id] = len(res)
-                res.append(v)
-            res = [v for i, v in enumerate(res) if i not in ids_to_delete]
-            return res
-        if new is None:
-            return old
-
-        return new
-
-    return merge(full_old, full_new)
+                    to_delete.append(target)
+                pending.remove(pos)
+            else:
+                # When a newer list is extending an item of this list
+                extend_pos = extend_ids[new_id]
+                extend_res = items[extend_pos]
+                extend_res[CONF_ID] = new_id
+                items[extend_pos] = _merge_values([v, extend_res])
+                positions_by_id[new_id].remove(pos)
+            dropped.add(pos)
+        for pos in to_delete:
+            dropped.add(pos)
+            v_id = items[pos][CONF_ID]
+            if pos in positions_by_id.get(v_id, ()):
+                positions_by_id[v_id].remove(pos)
+
+    if dropped:
+        return [v for pos, v in enumerate(items) if pos not in dropped]
+    return items
+
+
+def _find_id(positions_by_id, ids, v_id, before):
+    """Find the item with an ID that the item at before refers to."""
+    for pos in positions_by_id.get(v_id, ()):
+        if pos < before:
+            return pos
+    return ids.get(v_id)
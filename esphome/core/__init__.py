@@ -27,6 +27,7 @@ from esphome.const import (
 from esphome.coroutine import (  # noqa: F401
     FakeAwaitable as _FakeAwaitable,
     FakeEventLoop as _FakeEventLoop,
+    WaitFor as _WaitFor,
     coroutine,
     coroutine_with_priority,
 )
@@ -342,14 +343,18 @@ class ID:
         from esphome.config_validation import RESERVED_IDS
 
         if self.id is None:
-            base = str(self.type).replace("::", "_").lower()
-            if base == self.type:
-                base = base + "_id"
-            name = "".join(c for c in base if c.isalnum() or c == "_")
             used = set(registered_ids) | set(RESERVED_IDS) | CORE.loaded_integrations
-            self.id = ensure_unique_string(name, used)
+            self.id = ensure_unique_string(self.default_name, used)
         return self.id
 
+    @property
+    def default_name(self) -> str:
+        """The name an automatic ID is derived from, before it is made unique."""
+        base = str(self.type).replace("::", "_").lower()
+        if base == self.type:
+            base = base + "_id"
+        return "".join(c for c in base if c.isalnum() or c == "_")
+
     def __str__(self):
         if self.id is None:
             return ""
@@ -793,7 +798,7 @@ class EsphomeCore:
                 return self.variables[id]
             except KeyError:
                 _LOGGER.debug("Waiting for variable %s (%r)", id, id)
-                yield
+                yield _WaitFor(id)
 
     async def get_variable(self, id) -> "MockObj":
         if not isinstance(id, ID):
@@ -810,7 +815,7 @@ class EsphomeCore:
                     if k == id:
                         return (k, v)
             _LOGGER.debug("Waiting for variable %s", id)
-            yield
+            yield _WaitFor(id)
 
     async def get_variable_with_full_id(self, id: ID) -> tuple[ID, "MockObj"]:
         if not isinstance(id, ID):
@@ -822,6 +827,7 @@ class EsphomeCore:
             raise EsphomeError(f"ID {id} is already registered")
         _LOGGER.debug("Registered variable %s of type %s", id.id, id.type)
         self.variables[id] = obj
+        self.event_loop.publish(id)
 
     def has_id(self, id):
         return id in self.variables
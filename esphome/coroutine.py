@@ -43,7 +43,7 @@ the last `yield` expression defines what is returned.
 """
 
 import collections
-from collections.abc import Awaitable, Generator, Iterator
+from collections.abc import Awaitable, Generator, Hashable, Iterator
 import functools
 import heapq
 import inspect
@@ -191,12 +191,32 @@ class _Task:
         return self._cmp_tuple < other._cmp_tuple
 
 
+class WaitFor:
+    """Marker yielded by a task that can't continue until ``key`` has been published.
+
+    The event loop parks the yielding task and only resumes it once
+    `FakeEventLoop.publish` is called with the same key (for example from
+    `EsphomeCore.register_variable`). Any other yielded value just re-schedules the
+    task like before.
+    """
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Hashable) -> None:
+        self.key = key
+
+    def __repr__(self) -> str:
+        return f"WaitFor({self.key!r})"
+
+
 class FakeEventLoop:
     """Emulate an asyncio EventLoop to run some registered coroutine jobs in sequence."""
 
     def __init__(self):
         self._pending_tasks: list[_Task] = []
         self._task_counter = 0
+        # Tasks parked until a key gets published, in the order they were parked
+        self._waiting_tasks: dict[Hashable, list[_Task]] = {}
 
     def add_job(self, func, *args, **kwargs):
         """Add a job to the task queue,
@@ -216,6 +236,30 @@ class FakeEventLoop:
         self._task_counter += 1
         heapq.heappush(self._pending_tasks, task)
 
+    def publish(self, key: Hashable) -> None:
+        """Wake up all tasks that are waiting for ``key``."""
+        for task in self._waiting_tasks.pop(key, ()):
+            _LOGGER.debug(
+                "Waking %s in %s (num %s) for %s",
+                task.original_function.__qualname__,
+                task.original_function.__module__,
+                task.id_number,
+                key,
+            )
+            heapq.heappush(self._pending_tasks, task)
+
+    def _raise_unresolved(self):
+        blocked = [
+            f"  {task.original_function.__qualname__} in "
+            f"{task.original_function.__module__} is waiting for {key}"
+            for key, tasks in self._waiting_tasks.items()
+            for task in tasks
+        ]
+        raise RuntimeError(
+            "Circular dependency detected! The following tasks are waiting "
+            "for variables that will never be registered:\n" + "\n".join(blocked)
+        )
+
     def flush_tasks(self):
         """Run until all tasks have been completed.
 
@@ -226,8 +270,8 @@ class FakeEventLoop:
             i += 1
             if i > 1000000:
                 # Detect deadlock/circular dependency by measuring how many times tasks have been
-                # executed. On the big tests/test1.yaml we only get to a fraction of this, so
-                # this shouldn't be a problem.
+                # executed. Tasks waiting for a variable are parked and don't count towards this,
+                # only tasks that busy-wait with a bare `yield` do.
                 raise RuntimeError(
                     "Circular dependency detected! "
                     "Please run with -v option to see what functions failed to "
@@ -243,11 +287,19 @@ class FakeEventLoop:
             )
 
             try:
-                next(task.iterator)
-                # Decrease priority over time, so that if this task is blocked
-                # due to a dependency others will clear the dependency
-                # This could be improved with a less naive approach
-                new_task = task.with_priority(task.priority - 1)
-                heapq.heappush(self._pending_tasks, new_task)
+                res = next(task.iterator)
             except StopIteration:
                 _LOGGER.debug(" -> finished")
+                continue
+
+            # Decrease priority over time, so that if this task is blocked
+            # due to a dependency others will clear the dependency
+            new_task = task.with_priority(task.priority - 1)
+            if isinstance(res, WaitFor):
+                # Park the task until the dependency has been published
+                self._waiting_tasks.setdefault(res.key, []).append(new_task)
+            else:
+                heapq.heappush(self._pending_tasks, new_task)
+
+        if self._waiting_tasks:
+            self._raise_unresolved()
@@ -1021,6 +1021,10 @@ class MockObjClass(MockObj):
                 return True
         return False
 
+    def class_names(self) -> set[str]:
+        """Return the names of this class and every class it inherits from."""
+        return {str(self), *(str(parent) for parent in self._parents)}
+
     def template(self, *args: SafeExpType) -> "MockObjClass":
         if len(args) != 1 or not isinstance(args[0], TemplateArguments):
             args = TemplateArguments(*args)
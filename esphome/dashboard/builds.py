@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from enum import IntEnum
+from functools import partial
+import heapq
+import itertools
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from .logs import LogSession, LogViewer
+
+if TYPE_CHECKING:
+    from .workers import WorkerPool
+
+_LOGGER = logging.getLogger(__name__)
+
+# Estimated duration of a build before any build has finished
+DEFAULT_BUILD_DURATION = 120.0
+
+# Weight of the latest duration in the estimate for a command
+DURATION_SMOOTHING = 0.5
+
+
+class BuildPriority(IntEnum):
+    """Priority of a build, lower values run first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class Build(LogSession):
+    """A build waiting in or running from the BuildQueue."""
+
+    __slots__ = ("priority", "order", "background", "started_at", "_queue_status")
+
+    def __init__(
+        self,
+        command: list[str],
+        worker_pool: WorkerPool,
+        on_done: Callable[[LogSession], None],
+        priority: BuildPriority,
+        order: int,
+    ) -> None:
+        """Initialize the Build."""
+        super().__init__(command, worker_pool, on_done)
+        self.priority = priority
+        self.order = order
+        # Background builds keep running when they have no viewers
+        self.background = priority == BuildPriority.BACKGROUND
+        self.started_at: float | None = None
+        self._queue_status: list[dict[str, Any]] = []
+
+    @property
+    def sort_key(self) -> tuple[int, int]:
+        """Return the key ordering the build in the queue."""
+        return self.priority, self.order
+
+    def async_start(self) -> asyncio.Task:
+        """Start the build."""
+        self.started_at = time.monotonic()
+        self._queue_status = []
+        return super().async_start()
+
+    def async_add_viewer(self, viewer: LogViewer) -> None:
+        """Add a viewer, sending it the output so far or the queue position."""
+        super().async_add_viewer(viewer)
+        for message in self._queue_status:
+            viewer(message)
+
+    def async_remove_viewer(self, viewer: LogViewer) -> None:
+        """Remove a viewer, stopping the build if it was the last one."""
+        if not self.background:
+            super().async_remove_viewer(viewer)
+            return
+        with contextlib.suppress(ValueError):
+            self._viewers.remove(viewer)
+
+    def async_set_queue_position(self, position: int, eta: float) -> None:
+        """Tell the viewers where the build is in the queue."""
+        minutes, seconds = divmod(round(eta), 60)
+        self._queue_status = [
+            {"event": "queued", "position": position, "eta": round(eta)},
+            {
+                "event": "line",
+                "data": f"Waiting for other builds to finish, number {position} "
+                f"in the queue, starting in about {minutes}m{seconds:02}s\n",
+            },
+        ]
+        for viewer in list(self._viewers):
+            for message in self._queue_status:
+                viewer(message)
+
+
+class BuildQueue:
+    """Runs builds, at most max_parallel of them at the same time.
+
+    Waiting builds start in priority order, interactive ones before
+    background ones. Requesting a build of a command that is already
+    queued or running joins that build instead of starting another one.
+    """
+
+    __slots__ = (
+        "max_parallel",
+        "_worker_pool",
+        "_builds",
+        "_queue",
+        "_running",
+        "_tasks",
+        "_durations",
+        "_order",
+    )
+
+    def __init__(self, worker_pool: WorkerPool) -> None:
+        """Initialize the BuildQueue."""
+        self.max_parallel = 1
+        self._worker_pool = worker_pool
+        self._builds: dict[tuple[str, ...], Build] = {}
+        self._queue: list[Build] = []
+        self._running: set[Build] = set()
+        self._tasks: set[asyncio.Task] = set()
+        # Estimated build duration of each command
+        self._durations: dict[tuple[str, ...], float] = {}
+        self._order = itertools.count()
+
+    def async_subscribe(
+        self,
+        command: list[str],
+        viewer: LogViewer,
+        priority: BuildPriority = BuildPriority.INTERACTIVE,
+    ) -> Callable[[], None]:
+        """Queue a build of command, sending its output to viewer.
+
+        Returns a callable that unsubscribes the viewer, the build is
+        stopped once it has no viewers left unless it is a background build.
+        """
+        build = self._async_get_build(command, priority)
+        build.async_add_viewer(viewer)
+        self._async_process_queue()
+        return partial(build.async_remove_viewer, viewer)
+
+    def async_schedule(
+        self, command: list[str], priority: BuildPriority = BuildPriority.BACKGROUND
+    ) -> None:
+        """Queue a build of command nobody watches."""
+        self._async_get_build(command, priority)
+        self._async_process_queue()
+
+    def _async_get_build(self, command: list[str], priority: BuildPriority) -> Build:
+        key = tuple(command)
+        if (build := self._builds.get(key)) is not None:
+            _LOGGER.debug("Joining queued or running build of %s", command)
+            if priority < build.priority:
+                build.priority = priority
+                self._queue.sort(key=lambda build: build.sort_key)
+            return build
+        build = self._builds[key] = Build(
+            command,
+            self._worker_pool,
+            self._async_build_done,
+            priority,
+            next(self._order),
+        )
+        self._queue.append(build)
+        self._queue.sort(key=lambda build: build.sort_key)
+        return build
+
+    def _async_process_queue(self) -> None:
+        while self._queue and len(self._running) < self.max_parallel:
+            build = self._queue.pop(0)
+            self._running.add(build)
+            task = build.async_start()
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        self._async_publish_queue_positions()
+
+    def _async_build_done(self, build: Build) -> None:
+        key = tuple(build.command)
+        if self._builds.get(key) is build:
+            del self._builds[key]
+        if build in self._queue:
+            self._queue.remove(build)
+        elif build in self._running:
+            self._running.remove(build)
+            if not build.stopped:
+                duration = time.monotonic() - build.started_at
+                if (estimate := self._durations.get(key)) is not None:
+                    duration = estimate + DURATION_SMOOTHING * (duration - estimate)
+                self._durations[key] = duration
+        self._async_process_queue()
+
+    def _async_estimate_duration(self, build: Build) -> float:
+        if (duration := self._durations.get(tuple(build.command))) is not None:
+            return duration
+        if self._durations:
+            return sum(self._durations.values()) / len(self._durations)
+        return DEFAULT_BUILD_DURATION
+
+    def _async_publish_queue_positions(self) -> None:
+        if not self._queue:
+            return
+        now = time.monotonic()
+        # Seconds until each build slot is expected to be free
+        slots = [
+            max(0.0, self._async_estimate_duration(build) - (now - build.started_at))
+            for build in self._running
+        ]
+        slots += [0.0] * (self.max_parallel - len(slots))
+        heapq.heapify(slots)
+        for position, build in enumerate(self._queue, 1):
+            start = heapq.heappop(slots)
+            build.async_set_queue_position(position, start)
+            heapq.heappush(slots, start + self._async_estimate_duration(build))
+
+    async def async_stop(self) -> None:
+        """Stop all builds and wait for their processes to exit."""
+        for build in [*self._queue, *self._running]:
+            build.async_stop()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
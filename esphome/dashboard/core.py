@@ -10,9 +10,13 @@ import threading
 from typing import TYPE_CHECKING, Any, Callable
 
 from ..zeroconf import DiscoveredImport
+from .builds import BuildQueue
+from .device_events import DeviceEventStream
 from .dns import DNSCache
 from .entries import DashboardEntries
+from .logs import LogBroker
 from .settings import DashboardSettings
+from .workers import WorkerPool
 
 if TYPE_CHECKING:
     from .status.mdns import MDNSStatus
@@ -73,6 +77,10 @@ class ESPHomeDashboard:
         "mdns_status",
         "settings",
         "dns_cache",
+        "worker_pool",
+        "log_broker",
+        "build_queue",
+        "device_events",
         "_background_tasks",
     )
 
@@ -84,16 +92,21 @@ class ESPHomeDashboard:
         self.import_result: dict[str, DiscoveredImport] = {}
         self.stop_event = threading.Event()
         self.ping_request: asyncio.Event | None = None
-        self.mqtt_ping_request = threading.Event()
+        self.mqtt_ping_request: asyncio.Event | None = None
         self.mdns_status: MDNSStatus | None = None
         self.settings = DashboardSettings()
         self.dns_cache = DNSCache()
+        self.worker_pool = WorkerPool()
+        self.log_broker = LogBroker(self.worker_pool)
+        self.build_queue = BuildQueue(self.worker_pool)
+        self.device_events = DeviceEventStream(self)
         self._background_tasks: set[asyncio.Task] = set()
 
     async def async_setup(self) -> None:
         """Setup the dashboard."""
         self.loop = asyncio.get_running_loop()
         self.ping_request = asyncio.Event()
+        self.mqtt_ping_request = asyncio.Event()
         self.entries = DashboardEntries(self)
 
     async def async_run(self) -> None:
@@ -101,6 +114,13 @@ class ESPHomeDashboard:
         settings = self.settings
         mdns_task: asyncio.Task | None = None
         ping_status_task: asyncio.Task | None = None
+        mqtt_task: asyncio.Task | None = None
+        self.build_queue.max_parallel = settings.max_parallel_builds
+        if settings.use_worker_pool:
+            await self.worker_pool.async_start()
+        if settings.watch_config_dir:
+            # Start watching first so no change made during the scan is missed
+            self.entries.async_start_watching()
         await self.entries.async_update_entries()
 
         if settings.status_use_ping:
@@ -117,10 +137,10 @@ class ESPHomeDashboard:
             mdns_task = asyncio.create_task(mdns_status.async_run())
 
         if settings.status_use_mqtt:
-            from .status.mqtt import MqttStatusThread
+            from .status.mqtt import MqttStatus
 
-            status_thread_mqtt = MqttStatusThread()
-            status_thread_mqtt.start()
+            mqtt_status = MqttStatus()
+            mqtt_task = asyncio.create_task(mqtt_status.async_run())
 
         shutdown_event = asyncio.Event()
         try:
@@ -128,20 +148,32 @@ class ESPHomeDashboard:
         finally:
             _LOGGER.info("Shutting down...")
             self.stop_event.set()
+            self.entries.async_stop_watching()
+            await self.log_broker.async_stop()
+            await self.build_queue.async_stop()
+            await self.worker_pool.async_stop()
+            await self.dns_cache.async_stop()
             self.ping_request.set()
             if ping_status_task:
                 ping_status_task.cancel()
             if mdns_task:
                 mdns_task.cancel()
-            if settings.status_use_mqtt:
-                status_thread_mqtt.join()
-                self.mqtt_ping_request.set()
+            if mqtt_task:
+                mqtt_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await mqtt_task
             for task in self._background_tasks:
                 task.cancel()
                 with contextlib.suppress(asyncio.CancelledError):
                     await task
             await asyncio.sleep(0)
 
+    def async_request_ping(self) -> None:
+        """Request a refresh of the device states."""
+        self.ping_request.set()
+        if self.settings.status_use_mqtt:
+            self.mqtt_ping_request.set()
+
     def async_create_background_task(
         self, coro: Coroutine[Any, Any, Any]
     ) -> asyncio.Task:
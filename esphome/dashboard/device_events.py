@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any, Callable
+
+from .const import (
+    EVENT_ENTRY_ADDED,
+    EVENT_ENTRY_REMOVED,
+    EVENT_ENTRY_STATE_CHANGED,
+    EVENT_ENTRY_UPDATED,
+)
+from .entries import DashboardEntry, entry_state_to_bool
+
+if TYPE_CHECKING:
+    from .core import ESPHomeDashboard, Event
+
+# Changes made within this many seconds are sent as one message
+COALESCE_DELAY = 0.25
+
+# How often the device states are refreshed while somebody is subscribed
+PING_REQUEST_INTERVAL = 5.0
+
+DeviceEventSubscriber = Callable[[str], None]
+
+_ENTRY_EVENTS = {
+    EVENT_ENTRY_ADDED: "added",
+    EVENT_ENTRY_UPDATED: "updated",
+    EVENT_ENTRY_REMOVED: "removed",
+}
+
+
+def device_list(dashboard: ESPHomeDashboard) -> dict[str, Any]:
+    """Return the configured and importable devices."""
+    entries = dashboard.entries.async_all()
+    configured = {entry.name for entry in entries}
+    return {
+        "configured": [entry.to_dict() for entry in entries],
+        "importable": [
+            {
+                "name": res.device_name,
+                "friendly_name": res.friendly_name,
+                "package_import_url": res.package_import_url,
+                "project_name": res.project_name,
+                "project_version": res.project_version,
+                "network": res.network,
+            }
+            for res in dashboard.import_result.values()
+            if res.device_name not in configured
+        ],
+    }
+
+
+def device_states(entries: list[DashboardEntry]) -> dict[str, bool | None]:
+    """Return the online state of entries by filename."""
+    return {entry.filename: entry_state_to_bool(entry.state) for entry in entries}
+
+
+class DeviceEventStream:
+    """Streams the changes to the devices and their states.
+
+    Subscribers get the device list and all states once, followed by the
+    changes from the event bus. Changes are collected for COALESCE_DELAY
+    and sent as a single message, in which an entry that changed several
+    times appears once with its latest data.
+    """
+
+    __slots__ = (
+        "_dashboard",
+        "_subscribers",
+        "_remove_listeners",
+        "_changes",
+        "_state_changes",
+        "_flush_handle",
+        "_ping_handle",
+    )
+
+    def __init__(self, dashboard: ESPHomeDashboard) -> None:
+        """Initialize the DeviceEventStream."""
+        self._dashboard = dashboard
+        self._subscribers: list[DeviceEventSubscriber] = []
+        self._remove_listeners: list[Callable[[], None]] = []
+        # Latest change of each entry path, and the entry
+        self._changes: dict[str, tuple[str, DashboardEntry]] = {}
+        self._state_changes: dict[str, DashboardEntry] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._ping_handle: asyncio.TimerHandle | None = None
+
+    def async_subscribe(self, subscriber: DeviceEventSubscriber) -> Callable[[], None]:
+        """Send the devices and then their changes to subscriber as JSON.
+
+        Returns a callable that unsubscribes.
+        """
+        if not self._subscribers:
+            self._async_start()
+        entries = self._dashboard.entries.async_all()
+        subscriber(
+            json.dumps(
+                {
+                    "event": "initial_state",
+                    "data": {
+                        "devices": device_list(self._dashboard),
+                        "states": device_states(entries),
+                    },
+                }
+            )
+        )
+        self._subscribers.append(subscriber)
+        return lambda: self._async_unsubscribe(subscriber)
+
+    def _async_unsubscribe(self, subscriber: DeviceEventSubscriber) -> None:
+        if subscriber not in self._subscribers:
+            return
+        self._subscribers.remove(subscriber)
+        if not self._subscribers:
+            self._async_stop()
+
+    def _async_start(self) -> None:
+        bus = self._dashboard.bus
+        self._remove_listeners = [
+            bus.async_add_listener(event_type, self._async_on_entry_event)
+            for event_type in _ENTRY_EVENTS
+        ]
+        self._remove_listeners.append(
+            bus.async_add_listener(
+                EVENT_ENTRY_STATE_CHANGED, self._async_on_state_changed
+            )
+        )
+        self._async_request_ping()
+
+    def _async_stop(self) -> None:
+        for remove_listener in self._remove_listeners:
+            remove_listener()
+        self._remove_listeners = []
+        for handle in (self._flush_handle, self._ping_handle):
+            if handle is not None:
+                handle.cancel()
+        self._flush_handle = self._ping_handle = None
+        self._changes.clear()
+        self._state_changes.clear()
+
+    def _async_request_ping(self) -> None:
+        self._dashboard.async_request_ping()
+        self._ping_handle = self._dashboard.loop.call_later(
+            PING_REQUEST_INTERVAL, self._async_request_ping
+        )
+
+    def _async_on_entry_event(self, event: Event) -> None:
+        entry: DashboardEntry = event.data["entry"]
+        change = _ENTRY_EVENTS[event.event_type]
+        previous = self._changes.get(entry.path)
+        if change == "updated" and previous is not None and previous[0] == "added":
+            # Subscribers haven't seen the entry yet
+            change = "added"
+        elif change == "removed":
+            self._state_changes.pop(entry.path, None)
+        self._changes[entry.path] = (change, entry)
+        self._async_schedule_flush()
+
+    def _async_on_state_changed(self, event: Event) -> None:
+        entry: DashboardEntry = event.data["entry"]
+        self._state_changes[entry.path] = entry
+        self._async_schedule_flush()
+
+    def _async_schedule_flush(self) -> None:
+        if self._flush_handle is None:
+            self._flush_handle = self._dashboard.loop.call_later(
+                COALESCE_DELAY, self._async_flush
+            )
+
+    def _async_flush(self) -> None:
+        self._flush_handle = None
+        data: dict[str, Any] = {"added": [], "updated": [], "removed": []}
+        for change, entry in self._changes.values():
+            data[change].append(
+                entry.filename if change == "removed" else entry.to_dict()
+            )
+        data["states"] = device_states(
+            [
+                *self._state_changes.values(),
+                *(
+                    entry
+                    for change, entry in self._changes.values()
+                    if change == "added"
+                ),
+            ]
+        )
+        self._changes.clear()
+        self._state_changes.clear()
+        message = json.dumps({"event": "devices_changed", "data": data})
+        for subscriber in list(self._subscribers):
+            subscriber(message)
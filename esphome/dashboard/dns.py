@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict
+import logging
 import sys
+import time
 
 from icmplib import NameLookupError, async_resolve
 
@@ -10,6 +13,20 @@ if sys.version_info >= (3, 11):
 else:
     from async_timeout import timeout as async_timeout
 
+# Seconds a failed lookup is cached before it is tried again
+NEGATIVE_TTL = 10
+
+# Part of the TTL at the end of which a used entry is refreshed in the background
+REFRESH_WINDOW = 0.2
+
+# Number of hostnames kept before the least recently used are evicted
+MAX_SIZE = 512
+
+# Seconds between logging the counters of the cache at debug level
+STATS_LOG_INTERVAL = 600
+
+_LOGGER = logging.getLogger(__name__)
+
 
 async def _async_resolve_wrapper(hostname: str) -> list[str] | Exception:
     """Wrap the icmplib async_resolve function."""
@@ -20,24 +37,132 @@ async def _async_resolve_wrapper(hostname: str) -> list[str] | Exception:
         return ex
 
 
+def _log_refresh_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and (err := task.exception()) is not None:
+        _LOGGER.error("Refreshing a DNS cache entry failed", exc_info=err)
+
+
 class DNSCache:
-    """DNS cache for the dashboard."""
+    """DNS cache for the dashboard.
 
-    def __init__(self, ttl: int | None = 120) -> None:
+    Concurrent lookups of a hostname share one query. Failures are cached
+    for NEGATIVE_TTL only, and addresses that are used near the end of their
+    TTL are refreshed in the background so callers keep getting a hit.
+    """
+
+    __slots__ = (
+        "_cache",
+        "_inflight",
+        "_ttl",
+        "_negative_ttl",
+        "_max_size",
+        "hits",
+        "misses",
+        "coalesced",
+        "refreshes",
+        "evictions",
+        "_next_stats_log",
+    )
+
+    def __init__(
+        self,
+        ttl: int = 120,
+        negative_ttl: int = NEGATIVE_TTL,
+        max_size: int = MAX_SIZE,
+    ) -> None:
         """Initialize the DNSCache."""
-        self._cache: dict[str, tuple[float, list[str] | Exception]] = {}
+        # Expire time, refresh time and result of each hostname
+        self._cache: OrderedDict[str, tuple[float, float, list[str] | Exception]] = (
+            OrderedDict()
+        )
+        self._inflight: dict[str, asyncio.Task[list[str] | Exception]] = {}
         self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.evictions = 0
+        self._next_stats_log = time.monotonic() + STATS_LOG_INTERVAL
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the counters of the cache."""
+        return {
+            "size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "evictions": self.evictions,
+        }
 
     async def async_resolve(
         self, hostname: str, now_monotonic: float
     ) -> list[str] | Exception:
         """Resolve a hostname to a list of IP address."""
-        if expire_time_addresses := self._cache.get(hostname):
-            expire_time, addresses = expire_time_addresses
+        if now_monotonic >= self._next_stats_log:
+            self._next_stats_log = now_monotonic + STATS_LOG_INTERVAL
+            _LOGGER.debug("DNS cache stats: %s", self.stats)
+        if cached := self._cache.get(hostname):
+            expire_time, refresh_time, addresses = cached
             if expire_time > now_monotonic:
+                self.hits += 1
+                self._cache.move_to_end(hostname)
+                if refresh_time <= now_monotonic and hostname not in self._inflight:
+                    self.refreshes += 1
+                    refresh = self._async_start_lookup(hostname)
+                    # Nobody awaits the refresh, report what it raised
+                    refresh.add_done_callback(_log_refresh_error)
                 return addresses
 
-        expires = now_monotonic + self._ttl
-        addresses = await _async_resolve_wrapper(hostname)
-        self._cache[hostname] = (expires, addresses)
+        if lookup := self._inflight.get(hostname):
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            lookup = self._async_start_lookup(hostname)
+        # A cancelled caller must not cancel the lookup others are waiting for
+        return await asyncio.shield(lookup)
+
+    def _async_start_lookup(self, hostname: str) -> asyncio.Task:
+        lookup = asyncio.create_task(self._async_lookup(hostname))
+        self._inflight[hostname] = lookup
+        return lookup
+
+    async def _async_lookup(self, hostname: str) -> list[str] | Exception:
+        try:
+            addresses = await _async_resolve_wrapper(hostname)
+        finally:
+            del self._inflight[hostname]
+        now_monotonic = time.monotonic()
+        if isinstance(addresses, Exception):
+            cached = self._cache.get(hostname)
+            if (
+                cached is not None
+                and not isinstance(cached[2], Exception)
+                and cached[0] > now_monotonic
+            ):
+                # A failed refresh keeps the addresses until they expire
+                return addresses
+            ttl = self._negative_ttl
+        else:
+            ttl = self._ttl
+        self._cache[hostname] = (
+            now_monotonic + ttl,
+            now_monotonic + ttl * (1 - REFRESH_WINDOW),
+            addresses,
+        )
+        self._cache.move_to_end(hostname)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+            self.evictions += 1
         return addresses
+
+    async def async_stop(self) -> None:
+        """Cancel the lookups in progress."""
+        lookups = list(self._inflight.values())
+        for lookup in lookups:
+            lookup.cancel()
+        if lookups:
+            await asyncio.gather(*lookups, return_exceptions=True)
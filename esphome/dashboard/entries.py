@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 from collections import defaultdict
+from collections.abc import Iterable
 import logging
 import os
 from typing import TYPE_CHECKING, Any
@@ -17,7 +18,7 @@ from .const import (
     EVENT_ENTRY_UPDATED,
 )
 from .enum import StrEnum
-from .util.subprocess import async_run_system_command
+from .watcher import ConfigDirWatcher
 
 if TYPE_CHECKING:
     from .core import ESPHomeDashboard
@@ -72,6 +73,7 @@ class DashboardEntries:
         "_loaded_entries",
         "_update_lock",
         "_name_to_entry",
+        "_watcher",
     )
 
     def __init__(self, dashboard: ESPHomeDashboard) -> None:
@@ -88,6 +90,7 @@ class DashboardEntries:
         self._loaded_entries = False
         self._update_lock = asyncio.Lock()
         self._name_to_entry: dict[str, set[DashboardEntry]] = defaultdict(set)
+        self._watcher: ConfigDirWatcher | None = None
 
     def get(self, path: str) -> DashboardEntry | None:
         """Get an entry by path."""
@@ -128,13 +131,47 @@ class DashboardEntries:
             EVENT_ENTRY_STATE_CHANGED, {"entry": entry, "state": state}
         )
 
+    def async_start_watching(self) -> bool:
+        """Keep the entries up to date by watching the config directory.
+
+        Returns False if the file system can't be watched, in which case the
+        entries are updated by polling in async_request_update_entries.
+        """
+        watcher = ConfigDirWatcher(
+            self._loop,
+            self._config_dir,
+            os.path.dirname(ext_storage_path("")),
+            self._async_paths_changed,
+        )
+        if not watcher.start():
+            return False
+        self._watcher = watcher
+        return True
+
+    def async_stop_watching(self) -> None:
+        """Stop watching the config directory."""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _async_paths_changed(self, paths: set[str]) -> None:
+        """Handle changes reported by the watcher."""
+        self._dashboard.async_create_background_task(self._async_update_paths(paths))
+
     async def async_request_update_entries(self) -> None:
         """Request an update of the dashboard entries from disk.
 
-        If an update is already in progress, this will do nothing.
+        If an update is already in progress, or the entries are kept up to
+        date by watching the config directory, this will do nothing.
         """
+        if self._watcher is not None and self._loaded_entries:
+            return
         if self._update_lock.locked():
             _LOGGER.debug("Dashboard entries are already being updated")
+            if not self._loaded_entries:
+                # Don't return before the entries have been loaded once
+                async with self._update_lock:
+                    pass
             return
         await self.async_update_entries()
 
@@ -155,22 +192,41 @@ class DashboardEntries:
             )
             entry.load_from_disk(cache_key)
 
-    async def _async_update_entries(self) -> list[DashboardEntry]:
+    async def _async_update_entries(self) -> None:
         """Sync the dashboard entries from disk."""
         _LOGGER.debug("Updating dashboard entries")
-        # At some point it would be nice to use watchdog to avoid polling
-
         path_to_cache_key = await self._loop.run_in_executor(
             None, self._get_path_to_cache_key
         )
+        await self._async_apply_cache_keys(path_to_cache_key, self._entries)
+        self._loaded_entries = True
+
+    async def _async_update_paths(self, paths: set[str]) -> None:
+        """Sync the dashboard entries of the given paths from disk."""
+        async with self._update_lock:
+            _LOGGER.debug("Updating dashboard entries for %s", paths)
+            path_to_cache_key = await self._loop.run_in_executor(
+                None, self._get_paths_to_cache_key, paths
+            )
+            await self._async_apply_cache_keys(path_to_cache_key, paths)
+
+    async def _async_apply_cache_keys(
+        self,
+        path_to_cache_key: dict[str, DashboardCacheKeyType],
+        scanned_paths: Iterable[str],
+    ) -> None:
+        """Add, update and remove entries to match the scanned paths.
+
+        Entries in scanned_paths that have no cache key are removed.
+        """
         entries = self._entries
         name_to_entry = self._name_to_entry
         added: dict[DashboardEntry, DashboardCacheKeyType] = {}
         updated: dict[DashboardEntry, DashboardCacheKeyType] = {}
         removed: set[DashboardEntry] = {
             entry
-            for filename, entry in entries.items()
-            if filename not in path_to_cache_key
+            for path in scanned_paths
+            if path not in path_to_cache_key and (entry := entries.get(path))
         }
         original_names: dict[DashboardEntry, str] = {}
 
@@ -208,6 +264,18 @@ class DashboardEntries:
 
     def _get_path_to_cache_key(self) -> dict[str, DashboardCacheKeyType]:
         """Return a dict of path to cache key."""
+        return self._stat_cache_keys(util.list_yaml_files([self._config_dir]))
+
+    def _get_paths_to_cache_key(
+        self, paths: Iterable[str]
+    ) -> dict[str, DashboardCacheKeyType]:
+        """Return a dict of path to cache key for the given paths that exist."""
+        return self._stat_cache_keys(path for path in paths if os.path.isfile(path))
+
+    def _stat_cache_keys(
+        self, files: Iterable[str]
+    ) -> dict[str, DashboardCacheKeyType]:
+        """Return a dict of path to cache key for the files."""
         path_to_cache_key: dict[str, DashboardCacheKeyType] = {}
         #
         # The cache key is (inode, device, mtime, size)
@@ -217,7 +285,7 @@ class DashboardEntries:
         # file which is much faster than reading the file
         # for the cache hit case which is the common case.
         #
-        for file in util.list_yaml_files([self._config_dir]):
+        for file in files:
             try:
                 # Prefer the json storage path if it exists
                 stat = os.stat(ext_storage_path(os.path.basename(file)))
@@ -238,11 +306,9 @@ class DashboardEntries:
         return path_to_cache_key
 
     def async_schedule_storage_json_update(self, filename: str) -> None:
-        """Schedule a task to update the storage JSON file."""
-        self._dashboard.async_create_background_task(
-            async_run_system_command(
-                [*DASHBOARD_COMMAND, "compile", "--only-generate", filename]
-            )
+        """Schedule a background build to update the storage JSON file."""
+        self._dashboard.build_queue.async_schedule(
+            [*DASHBOARD_COMMAND, "compile", "--only-generate", filename]
         )
 
 
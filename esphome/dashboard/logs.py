@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import contextlib
+from functools import partial
+import logging
+from typing import TYPE_CHECKING, Any, Callable
+
+from esphome.util import shlex_quote
+
+from .util.subprocess import async_iter_lines
+
+if TYPE_CHECKING:
+    from .workers import Process, WorkerPool
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of lines replayed to a viewer joining a running session
+REPLAY_BUFFER_LINES = 500
+
+LogViewer = Callable[[dict[str, Any]], None]
+
+
+class LogSession:
+    """A single `esphome logs` process shared by any number of viewers.
+
+    Every line is sent to all viewers as a websocket message, the last
+    lines are kept so viewers joining later see some context.
+    """
+
+    __slots__ = (
+        "command",
+        "_worker_pool",
+        "_viewers",
+        "_buffer",
+        "_proc",
+        "_task",
+        "_stopped",
+        "_on_done",
+    )
+
+    def __init__(
+        self,
+        command: list[str],
+        worker_pool: WorkerPool,
+        on_done: Callable[[LogSession], None],
+    ) -> None:
+        """Initialize the LogSession."""
+        self.command = command
+        self._worker_pool = worker_pool
+        self._viewers: list[LogViewer] = []
+        self._buffer: deque[dict[str, Any]] = deque(maxlen=REPLAY_BUFFER_LINES)
+        self._proc: Process | None = None
+        self._task: asyncio.Task | None = None
+        self._stopped = False
+        self._on_done = on_done
+
+    @property
+    def viewer_count(self) -> int:
+        """Return the number of viewers."""
+        return len(self._viewers)
+
+    @property
+    def stopped(self) -> bool:
+        """Return if the session was stopped before the process exited."""
+        return self._stopped
+
+    def async_start(self) -> asyncio.Task:
+        """Start the logs process."""
+        self._task = asyncio.create_task(self._async_run())
+        return self._task
+
+    def async_add_viewer(self, viewer: LogViewer) -> None:
+        """Add a viewer, replaying the buffered lines to it."""
+        for message in self._buffer:
+            viewer(message)
+        self._viewers.append(viewer)
+
+    def async_remove_viewer(self, viewer: LogViewer) -> None:
+        """Remove a viewer, stopping the process if it was the last one."""
+        with contextlib.suppress(ValueError):
+            self._viewers.remove(viewer)
+        if not self._viewers:
+            self.async_stop()
+
+    def async_stop(self) -> None:
+        """Stop the logs process."""
+        self._stopped = True
+        # New viewers get a new session instead of joining this one
+        self._on_done(self)
+        if self._proc is not None and self._proc.returncode is None:
+            _LOGGER.debug("Terminating logs process")
+            with contextlib.suppress(ProcessLookupError):
+                self._proc.terminate()
+
+    def _publish(self, message: dict[str, Any]) -> None:
+        self._buffer.append(message)
+        for viewer in list(self._viewers):
+            viewer(message)
+
+    def _publish_line(self, data: bytes) -> None:
+        text = data.decode("utf-8", "replace")
+        _LOGGER.debug("> stdout: %s", text)
+        self._publish({"event": "line", "data": text})
+
+    async def _async_run(self) -> None:
+        _LOGGER.info(
+            "Running command '%s'", " ".join(shlex_quote(x) for x in self.command)
+        )
+        returncode = 1
+        try:
+            self._proc = proc = await self._worker_pool.async_exec(self.command)
+            if self._stopped:
+                # The last viewer left while the process was starting
+                proc.terminate()
+            async for line in async_iter_lines(proc.stdout):
+                self._publish_line(line)
+            returncode = await proc.wait()
+        except OSError as err:
+            _LOGGER.error("Could not run logs command: %s", err)
+        finally:
+            self._on_done(self)
+        _LOGGER.info("Process exited with return code %s", returncode)
+        self._publish({"event": "exit", "code": returncode})
+
+
+class LogBroker:
+    """Shares log sessions between the viewers of the same device."""
+
+    __slots__ = ("_worker_pool", "_sessions", "_tasks")
+
+    def __init__(self, worker_pool: WorkerPool) -> None:
+        """Initialize the LogBroker."""
+        self._worker_pool = worker_pool
+        self._sessions: dict[tuple[str, ...], LogSession] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def async_subscribe(
+        self, command: list[str], viewer: LogViewer
+    ) -> Callable[[], None]:
+        """Send the output of command to viewer.
+
+        The command is only started if it isn't already running for another
+        viewer. Returns a callable that unsubscribes the viewer.
+        """
+        key = tuple(command)
+        if (session := self._sessions.get(key)) is None:
+            session = self._sessions[key] = LogSession(
+                command, self._worker_pool, self._async_session_done
+            )
+            session.async_add_viewer(viewer)
+            task = session.async_start()
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            _LOGGER.debug("Joining running logs session for %s", command)
+            session.async_add_viewer(viewer)
+        return partial(session.async_remove_viewer, viewer)
+
+    def _async_session_done(self, session: LogSession) -> None:
+        key = tuple(session.command)
+        if self._sessions.get(key) is session:
+            del self._sessions[key]
+
+    async def async_stop(self) -> None:
+        """Stop all log sessions and wait for their processes to exit."""
+        for session in list(self._sessions.values()):
+            session.async_stop()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -62,6 +62,22 @@ class DashboardSettings:
     def status_use_mqtt(self) -> bool:
         return get_bool_env("ESPHOME_DASHBOARD_USE_MQTT")
 
+    @property
+    def ping_all_addresses(self) -> bool:
+        return get_bool_env("ESPHOME_DASHBOARD_PING_ALL_ADDRESSES")
+
+    @property
+    def watch_config_dir(self) -> bool:
+        return not get_bool_env("ESPHOME_DASHBOARD_POLL_CONFIG_DIR")
+
+    @property
+    def max_parallel_builds(self) -> int:
+        return max(1, int(os.getenv("ESPHOME_DASHBOARD_MAX_PARALLEL_BUILDS") or 1))
+
+    @property
+    def use_worker_pool(self) -> bool:
+        return not get_bool_env("ESPHOME_DASHBOARD_NO_WORKER_POOL")
+
     @property
     def using_ha_addon_auth(self) -> bool:
         if not self.on_ha_addon:
@@ -1,67 +1,135 @@
 from __future__ import annotations
 
+import asyncio
 import binascii
 import json
+import logging
 import os
 import threading
+import time
 
 from esphome import mqtt
+from esphome.core import EsphomeError
 
 from ..core import DASHBOARD
-from ..entries import EntryState
+from ..entries import DashboardEntry, EntryState
 
+_LOGGER = logging.getLogger(__name__)
 
-class MqttStatusThread(threading.Thread):
-    """Status thread to get the status of the devices via MQTT."""
+DISCOVER_TOPIC = "esphome/discover"
 
-    def run(self) -> None:
-        """Run the status thread."""
-        dashboard = DASHBOARD
-        entries = dashboard.entries
-        current_entries = entries.all()
+# Seconds without a discovery message after which a device is offline
+OFFLINE_TIMEOUT = 20.0
 
-        config = mqtt.config_from_env()
-        topic = "esphome/discover/#"
+# Discovery is requested at most this often, and only when a device wasn't
+# seen within this many seconds
+DISCOVER_INTERVAL = 5.0
 
-        def on_message(client, userdata, msg):
-            nonlocal current_entries
 
-            payload = msg.payload.decode(errors="backslashreplace")
-            if len(payload) > 0:
-                data = json.loads(payload)
-                if "name" not in data:
-                    return
-                for entry in current_entries:
-                    if entry.name == data["name"]:
-                        entries.set_state(entry, EntryState.ONLINE)
-                        return
+class MqttStatus:
+    """Class that updates the status of the devices via MQTT.
 
-        def on_connect(client, userdata, flags, return_code):
-            client.publish("esphome/discover", None, retain=False)
+    The MQTT client runs its network loop in its own thread. The names of
+    the devices announcing themselves are collected there and handed to
+    the event loop in batches, where the entries are looked up by name.
+    """
 
-        mqttid = str(binascii.hexlify(os.urandom(6)).decode())
+    def __init__(self) -> None:
+        """Initialize the MqttStatus class."""
+        self._loop = asyncio.get_running_loop()
+        # When each tracked entry was last seen
+        self.last_seen: dict[DashboardEntry, float] = {}
+        self._pending_names: set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._last_discover = 0.0
 
-        client = mqtt.prepare(
-            config,
-            [topic],
-            on_message,
-            on_connect,
-            None,
-            None,
-            f"esphome-dashboard-{mqttid}",
-        )
-        client.loop_start()
+    def _on_message(self, client, userdata, msg) -> None:
+        """Collect the name of the device, runs in the MQTT thread."""
+        payload = msg.payload.decode(errors="backslashreplace")
+        if not payload:
+            return
+        try:
+            name = json.loads(payload).get("name")
+        except (ValueError, AttributeError):
+            return
+        if not isinstance(name, str):
+            return
+        with self._pending_lock:
+            if not self._pending_names:
+                self._loop.call_soon_threadsafe(self.async_process_pending)
+            self._pending_names.add(name)
 
-        while not dashboard.stop_event.wait(2):
-            current_entries = entries.all()
-            # will be set to true on on_message
-            for entry in current_entries:
+    def async_process_pending(self) -> None:
+        """Mark the devices that answered since the last batch online."""
+        with self._pending_lock:
+            names = self._pending_names
+            self._pending_names = set()
+        entries = DASHBOARD.entries
+        now_monotonic = time.monotonic()
+        for name in names:
+            for entry in entries.get_by_name(name) or ():
+                # Only devices without mDNS are taken offline by MQTT
                 if entry.no_mdns:
-                    entries.set_state(entry, EntryState.OFFLINE)
+                    self.last_seen[entry] = now_monotonic
+                entries.async_set_state(entry, EntryState.ONLINE)
+
+    def async_expire(self, now_monotonic: float) -> bool:
+        """Mark devices offline that weren't seen within OFFLINE_TIMEOUT.
+
+        Returns True if any device wasn't seen within DISCOVER_INTERVAL.
+        """
+        entries = DASHBOARD.entries
+        last_seen = {
+            entry: self.last_seen.get(entry, now_monotonic)
+            for entry in entries.async_all()
+            if entry.no_mdns
+        }
+        self.last_seen = last_seen
+        stale = False
+        for entry, seen in last_seen.items():
+            if now_monotonic - seen > OFFLINE_TIMEOUT:
+                entries.async_set_state(entry, EntryState.OFFLINE)
+            stale = stale or now_monotonic - seen > DISCOVER_INTERVAL
+        return stale
 
-            client.publish("esphome/discover", None, retain=False)
-            dashboard.mqtt_ping_request.wait()
-            dashboard.mqtt_ping_request.clear()
+    async def async_run(self) -> None:
+        """Run the MQTT status."""
+        dashboard = DASHBOARD
+        config = mqtt.config_from_env()
+        mqttid = str(binascii.hexlify(os.urandom(6)).decode())
+
+        def on_connect(client, userdata, flags, return_code):
+            client.publish(DISCOVER_TOPIC, None, retain=False)
+
+        try:
+            client = await self._loop.run_in_executor(
+                None,
+                mqtt.prepare,
+                config,
+                [f"{DISCOVER_TOPIC}/#"],
+                self._on_message,
+                on_connect,
+                None,
+                None,
+                f"esphome-dashboard-{mqttid}",
+            )
+        except EsphomeError as err:
+            _LOGGER.error("MQTT status is not available: %s", err)
+            return
+        client.loop_start()
 
-        client.disconnect()
-        client.loop_stop()
+        try:
+            while not dashboard.stop_event.is_set():
+                # Only request discovery if the dashboard is open
+                await dashboard.mqtt_ping_request.wait()
+                dashboard.mqtt_ping_request.clear()
+                now_monotonic = time.monotonic()
+                if (
+                    self.async_expire(now_monotonic)
+                    and now_monotonic - self._last_discover > DISCOVER_INTERVAL
+                ):
+                    self._last_discover = now_monotonic
+                    client.publish(DISCOVER_TOPIC, None, retain=False)
+        finally:
+            client.disconnect()
+            await self._loop.run_in_executor(None, client.loop_stop)
@@ -3,18 +3,44 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import cast
 
 from icmplib import Host, SocketPermissionError, async_ping
 
 from ..const import MAX_EXECUTOR_WORKERS
 from ..core import DASHBOARD
 from ..entries import DashboardEntry, EntryState, bool_to_entry_state
-from ..util.itertools import chunked
 
 _LOGGER = logging.getLogger(__name__)
 
-GROUP_SIZE = int(MAX_EXECUTOR_WORKERS / 2)
+# Number of hosts resolved and pinged at the same time
+MAX_PROBES_IN_FLIGHT = int(MAX_EXECUTOR_WORKERS / 2)
+
+# Seconds between pings of a host once its state is stable, the interval
+# doubles after each ping with an unchanged result up to the maximum
+PROBE_INTERVAL_MIN = 10.0
+PROBE_INTERVAL_MAX = 60.0
+
+
+class _HostProbe:
+    """When to ping a host next."""
+
+    __slots__ = ("interval", "next_probe")
+
+    def __init__(self) -> None:
+        """Initialize the _HostProbe."""
+        self.interval = 0.0
+        self.next_probe = 0.0
+
+    def async_update(self, now_monotonic: float, changed: bool) -> None:
+        """Schedule the next ping after the state changed or stayed the same."""
+        if changed:
+            # Confirm a change on the next request
+            self.interval = 0.0
+        else:
+            self.interval = min(
+                max(self.interval * 2, PROBE_INTERVAL_MIN), PROBE_INTERVAL_MAX
+            )
+        self.next_probe = now_monotonic + self.interval
 
 
 class PingStatus:
@@ -22,68 +48,79 @@ class PingStatus:
         """Initialize the PingStatus class."""
         super().__init__()
         self._loop = asyncio.get_running_loop()
+        self._probes: dict[DashboardEntry, _HostProbe] = {}
+        self._semaphore = asyncio.Semaphore(MAX_PROBES_IN_FLIGHT)
+        self._privileged = False
 
     async def async_run(self) -> None:
         """Run the ping status."""
         dashboard = DASHBOARD
-        entries = dashboard.entries
         privileged = await _can_use_icmp_lib_with_privilege()
         if privileged is None:
             _LOGGER.warning("Cannot use icmplib because privileges are insufficient")
             return
+        self._privileged = privileged
 
         while not dashboard.stop_event.is_set():
             # Only ping if the dashboard is open
             await dashboard.ping_request.wait()
             dashboard.ping_request.clear()
-            current_entries = dashboard.entries.async_all()
-            to_ping: list[DashboardEntry] = [
-                entry for entry in current_entries if entry.address is not None
-            ]
-
-            # Resolve DNS for all entries
-            entries_with_addresses: dict[DashboardEntry, list[str]] = {}
-            for ping_group in chunked(to_ping, GROUP_SIZE):
-                ping_group = cast(list[DashboardEntry], ping_group)
-                now_monotonic = time.monotonic()
-                dns_results = await asyncio.gather(
-                    *(
-                        dashboard.dns_cache.async_resolve(entry.address, now_monotonic)
-                        for entry in ping_group
-                    ),
-                    return_exceptions=True,
-                )
-
-                for entry, result in zip(ping_group, dns_results):
-                    if isinstance(result, Exception):
-                        entries.async_set_state(entry, EntryState.UNKNOWN)
-                        continue
-                    if isinstance(result, BaseException):
-                        raise result
-                    entries_with_addresses[entry] = result
-
-            # Ping all entries with valid addresses
-            for ping_group in chunked(entries_with_addresses.items(), GROUP_SIZE):
-                entry_addresses = cast(tuple[DashboardEntry, list[str]], ping_group)
-
+            await self.async_probe_due()
+
+    async def async_probe_due(self) -> None:
+        """Ping all hosts that are due, a fixed number of them at a time.
+
+        Each host takes a free slot as soon as one opens up, so a host that
+        doesn't answer only holds up its own slot.
+        """
+        current_entries = DASHBOARD.entries.async_all()
+        probes = {
+            entry: self._probes.get(entry) or _HostProbe()
+            for entry in current_entries
+            if entry.address is not None
+        }
+        self._probes = probes
+        now_monotonic = time.monotonic()
+        results = await asyncio.gather(
+            *(
+                self._async_probe(entry, probe)
+                for entry, probe in probes.items()
+                if probe.next_probe <= now_monotonic
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("Failed to ping a device", exc_info=result)
+            elif isinstance(result, BaseException):
+                raise result
+
+    async def _async_probe(self, entry: DashboardEntry, probe: _HostProbe) -> None:
+        dashboard = DASHBOARD
+        async with self._semaphore:
+            addresses = await dashboard.dns_cache.async_resolve(
+                entry.address, time.monotonic()
+            )
+            if isinstance(addresses, Exception):
+                state = EntryState.UNKNOWN
+            else:
+                if not dashboard.settings.ping_all_addresses:
+                    addresses = addresses[:1]
                 results = await asyncio.gather(
                     *(
-                        async_ping(addresses[0], privileged=privileged)
-                        for _, addresses in entry_addresses
+                        async_ping(address, privileged=self._privileged)
+                        for address in addresses
                     ),
                     return_exceptions=True,
                 )
-
-                for entry_addresses, result in zip(entry_addresses, results):
-                    if isinstance(result, Exception):
-                        ping_result = False
-                    elif isinstance(result, BaseException):
-                        raise result
-                    else:
-                        host: Host = result
-                        ping_result = host.is_alive
-                    entry, _ = entry_addresses
-                    entries.async_set_state(entry, bool_to_entry_state(ping_result))
+                state = bool_to_entry_state(
+                    any(
+                        isinstance(result, Host) and result.is_alive
+                        for result in results
+                    )
+                )
+        probe.async_update(time.monotonic(), state != entry.state)
+        dashboard.entries.async_set_state(entry, state)
 
 
 async def _can_use_icmp_lib_with_privilege() -> None | bool:
@@ -1,6 +1,9 @@
+import gzip
+import hashlib
 import logging
 import os
 from pathlib import Path
+import shutil
 import tempfile
 
 _LOGGER = logging.getLogger(__name__)
@@ -61,3 +64,51 @@ def write_file(
                     filename,
                     err,
                 )
+
+
+def gzip_file(path: str) -> bytes:
+    """Return the gzip compressed contents of a file."""
+    with open(path, "rb") as source:
+        return gzip.compress(source.read(), compresslevel=9, mtime=0)
+
+
+def gzip_file_cached(path: str, cache_dir: str) -> str:
+    """Return the path of a gzip compressed copy of a file.
+
+    The copy is kept in cache_dir, named after the path of the file, and
+    recreated when the size or the modification time of the file changed.
+
+    Raises OSError if the copy can't be written.
+    """
+    key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16]
+    gz_path = os.path.join(cache_dir, f"{key}-{os.path.basename(path)}.gz")
+    stat = os.stat(path)
+    try:
+        if os.stat(gz_path).st_mtime_ns == stat.st_mtime_ns:
+            with open(gz_path, "rb") as gz_file:
+                # The gzip trailer ends with the uncompressed size
+                gz_file.seek(-4, os.SEEK_END)
+                size = int.from_bytes(gz_file.read(4), "little")
+            if size == stat.st_size & 0xFFFFFFFF:
+                return gz_path
+    except OSError:
+        pass
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_filename = ""
+    try:
+        with tempfile.NamedTemporaryFile(
+            mode="wb", dir=cache_dir, delete=False
+        ) as fdesc:
+            tmp_filename = fdesc.name
+            with open(path, "rb") as source:
+                with gzip.GzipFile(
+                    filename="", mode="wb", compresslevel=9, fileobj=fdesc, mtime=0
+                ) as compressed:
+                    shutil.copyfileobj(source, compressed)
+        os.utime(tmp_filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_filename, gz_path)
+    finally:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+    return gz_path
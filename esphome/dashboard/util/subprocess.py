@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable
+import re
+
+_LINE = re.compile(rb"[^\n\r]*[\n\r]")
 
 
 async def async_system_command_status(command: Iterable[str]) -> bool:
@@ -29,3 +32,20 @@ async def async_run_system_command(command: Iterable[str]) -> tuple[bool, bytes,
     stdout, stderr = await process.communicate()
     await process.wait()
     return process.returncode, stdout, stderr
+
+
+async def async_iter_lines(stream: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    """Yield the lines of stream as they arrive, including the line end.
+
+    A carriage return ends a line too, so progress bars are streamed.
+    """
+    pending = b""
+    while chunk := await stream.read(4096):
+        pending += chunk
+        end = 0
+        for match in _LINE.finditer(pending):
+            yield match.group()
+            end = match.end()
+        pending = pending[end:]
+    if pending:
+        yield pending
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any, Callable
+
+from esphome import util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Editors and the storage JSON writer touch files several times in a row,
+# wait this long for more changes before reporting them.
+DEBOUNCE_DELAY = 0.2
+
+# Events that don't change the contents of a file
+_IGNORED_EVENTS = ("opened", "closed_no_write")
+
+
+class ConfigDirWatcher:
+    """Watches the config directory and the storage JSON directory.
+
+    Uses watchdog (inotify, FSEvents, ...) to report the YAML files whose
+    dashboard entries may have changed, so the directories don't have to
+    be polled.
+    """
+
+    __slots__ = (
+        "_loop",
+        "_config_dir",
+        "_storage_dir",
+        "_on_change",
+        "_observer",
+        "_pending",
+        "_flush_handle",
+    )
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        config_dir: str,
+        storage_dir: str,
+        on_change: Callable[[set[str]], None],
+    ) -> None:
+        """Initialize the ConfigDirWatcher.
+
+        on_change is called in the event loop with the paths of the changed
+        YAML files, as they would be listed by util.list_yaml_files.
+        """
+        self._loop = loop
+        self._config_dir = config_dir
+        self._storage_dir = storage_dir
+        self._on_change = on_change
+        self._observer: Any = None
+        self._pending: set[str] = set()
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def start(self) -> bool:
+        """Start watching, returns False if the directories can't be watched."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            _LOGGER.debug("watchdog is not installed, polling the config directory")
+            return False
+
+        on_path = self._on_path
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event: Any) -> None:
+                if event.is_directory or event.event_type in _IGNORED_EVENTS:
+                    return
+                on_path(os.fsdecode(event.src_path))
+                if dest_path := getattr(event, "dest_path", ""):
+                    on_path(os.fsdecode(dest_path))
+
+        observer = Observer()
+        handler = _Handler()
+        try:
+            observer.schedule(handler, self._config_dir, recursive=False)
+            try:
+                os.makedirs(self._storage_dir, exist_ok=True)
+                observer.schedule(handler, self._storage_dir, recursive=False)
+            except OSError as err:
+                _LOGGER.debug("Not watching %s: %s", self._storage_dir, err)
+            observer.start()
+        except OSError as err:
+            _LOGGER.warning(
+                "Could not watch %s, polling it instead: %s", self._config_dir, err
+            )
+            return False
+        self._observer = observer
+        return True
+
+    def stop(self) -> None:
+        """Stop watching."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def _on_path(self, path: str) -> None:
+        """Handle a changed path, called from the watchdog thread."""
+        directory, name = os.path.split(path)
+        directory = os.path.abspath(directory)
+        if directory == os.path.abspath(self._storage_dir):
+            if not name.endswith(".json"):
+                return
+            name = name[: -len(".json")]
+        elif directory != os.path.abspath(self._config_dir):
+            return
+        config_path = os.path.join(self._config_dir, name)
+        if util.filter_yaml_files([config_path]):
+            self._loop.call_soon_threadsafe(self._add_pending, config_path)
+
+    def _add_pending(self, config_path: str) -> None:
+        self._pending.add(config_path)
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(DEBOUNCE_DELAY, self._flush)
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        pending = self._pending
+        self._pending = set()
+        self._on_change(pending)
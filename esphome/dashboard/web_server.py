@@ -5,8 +5,8 @@ import base64
 from collections.abc import Iterable
 import datetime
 import functools
-import gzip
 import hashlib
+import io
 import json
 import logging
 import os
@@ -28,7 +28,6 @@ import tornado.ioloop
 import tornado.iostream
 from tornado.log import access_log
 import tornado.netutil
-import tornado.process
 import tornado.queues
 import tornado.web
 import tornado.websocket
@@ -36,6 +35,7 @@ import yaml
 from yaml.nodes import Node
 
 from esphome import const, platformio_api, yaml_util
+from esphome.core import CORE
 from esphome.helpers import get_bool_env, mkdir_p
 from esphome.storage_json import StorageJSON, ext_storage_path, trash_storage_path
 from esphome.util import get_serial_ports, shlex_quote
@@ -43,9 +43,10 @@ from esphome.yaml_util import FastestAvailableSafeLoader
 
 from .const import DASHBOARD_COMMAND
 from .core import DASHBOARD
+from .device_events import device_list
 from .entries import EntryState, entry_state_to_bool
-from .util.file import write_file
-from .util.subprocess import async_run_system_command
+from .util.file import gzip_file, gzip_file_cached, write_file
+from .util.subprocess import async_iter_lines
 from .util.text import friendly_name_slugify
 
 if TYPE_CHECKING:
@@ -152,6 +153,11 @@ def websocket_method(name):
 class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
     """Base class for ESPHome websocket commands."""
 
+    # Commands reading the websocket's stdin messages get their input piped
+    uses_stdin = False
+    # Builds wait for a free slot in the dashboard's build queue
+    is_build = False
+
     def __init__(
         self,
         application: tornado.web.Application,
@@ -163,6 +169,7 @@ class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
         self._proc = None
         self._queue = None
         self._is_closed = False
+        self._unsubscribe: Callable[[], None] | None = None
         # Windows doesn't support non-blocking pipes,
         # use Popen() with a reading thread instead
         self._use_popen = os.name == "nt"
@@ -203,10 +210,20 @@ class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
 
     @websocket_method("spawn")
     async def handle_spawn(self, json_message: dict[str, Any]) -> None:
-        if self._proc is not None:
+        if self._proc is not None or self._unsubscribe is not None:
             # spawn can only be called once
             return
         command = await self.build_command(json_message)
+        await self.spawn(command)
+
+    async def spawn(self, command: list[str]) -> None:
+        """Run command, sending its output to the websocket."""
+        if self.is_build:
+            if not self._is_closed:
+                self._unsubscribe = DASHBOARD.build_queue.async_subscribe(
+                    command, self._on_shared_message
+                )
+            return
         _LOGGER.info("Running command '%s'", " ".join(shlex_quote(x) for x in command))
 
         if self._use_popen:
@@ -221,17 +238,18 @@ class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
             stdout_thread = threading.Thread(target=self._stdout_thread)
             stdout_thread.daemon = True
             stdout_thread.start()
-        else:
-            self._proc = tornado.process.Subprocess(
-                command,
-                stdout=tornado.process.Subprocess.STREAM,
-                stderr=subprocess.STDOUT,
-                stdin=tornado.process.Subprocess.STREAM,
-                close_fds=False,
-            )
-            self._proc.set_exit_callback(self._proc_on_exit)
+            tornado.ioloop.IOLoop.current().spawn_callback(self._redirect_stdout)
+            return
 
-        tornado.ioloop.IOLoop.current().spawn_callback(self._redirect_stdout)
+        self._proc = await DASHBOARD.worker_pool.async_exec(
+            command,
+            stdin=(
+                asyncio.subprocess.PIPE
+                if self.uses_stdin
+                else asyncio.subprocess.DEVNULL
+            ),
+        )
+        tornado.ioloop.IOLoop.current().spawn_callback(self._redirect_output)
 
     @property
     def is_process_active(self) -> bool:
@@ -239,7 +257,7 @@ class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
 
     @websocket_method("stdin")
     async def handle_stdin(self, json_message: dict[str, Any]) -> None:
-        if not self.is_process_active:
+        if not self.is_process_active or self._proc.stdin is None:
             return
         text: str = json_message["data"]
         data = text.encode("utf-8", "replace")
@@ -248,24 +266,25 @@ class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
 
     @tornado.gen.coroutine
     def _redirect_stdout(self) -> None:
-        reg = b"[\n\r]"
-
         while True:
-            try:
-                if self._use_popen:
-                    data: bytes = yield self._queue.get()
-                    if data is None:
-                        self._proc_on_exit(self._proc.poll())
-                        break
-                else:
-                    data: bytes = yield self._proc.stdout.read_until_regex(reg)
-            except tornado.iostream.StreamClosedError:
+            data: bytes = yield self._queue.get()
+            if data is None:
+                self._proc_on_exit(self._proc.poll())
                 break
 
             text = data.decode("utf-8", "replace")
             _LOGGER.debug("> stdout: %s", text)
             self.write_message({"event": "line", "data": text})
 
+    async def _redirect_output(self) -> None:
+        async for data in async_iter_lines(self._proc.stdout):
+            if self._is_closed:
+                return
+            text = data.decode("utf-8", "replace")
+            _LOGGER.debug("> stdout: %s", text)
+            self.write_message({"event": "line", "data": text})
+        self._proc_on_exit(await self._proc.wait())
+
     def _stdout_thread(self) -> None:
         if not self._use_popen:
             return
@@ -279,6 +298,15 @@ class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
         self._proc.wait(1.0)
         self._queue.put_nowait(None)
 
+    def _on_shared_message(self, message: dict[str, Any]) -> None:
+        """Send a message of a process shared with other websockets."""
+        if self._is_closed:
+            return
+        try:
+            self.write_message(message)
+        except tornado.websocket.WebSocketClosedError:
+            pass
+
     def _proc_on_exit(self, returncode: int) -> None:
         if not self._is_closed:
             # Check if the proc was not forcibly closed
@@ -289,12 +317,12 @@ class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
         # Check if proc exists (if 'start' has been run)
         if self.is_process_active:
             _LOGGER.debug("Terminating process")
-            if self._use_popen:
-                self._proc.terminate()
-            else:
-                self._proc.proc.terminate()
+            self._proc.terminate()
         # Shutdown proc on WS close
         self._is_closed = True
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
 
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         raise NotImplementedError
@@ -347,10 +375,22 @@ class EsphomePortCommandWebSocket(EsphomeCommandWebSocket):
 
 
 class EsphomeLogsHandler(EsphomePortCommandWebSocket):
+    """Show the logs of a device.
+
+    All viewers of the same device share a single logs process.
+    """
+
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         """Build the command to run."""
         return await self.build_device_command(["logs"], json_message)
 
+    async def spawn(self, command: list[str]) -> None:
+        """Subscribe to the logs session running command."""
+        if not self._is_closed:
+            self._unsubscribe = DASHBOARD.log_broker.async_subscribe(
+                command, self._on_shared_message
+            )
+
 
 class EsphomeRenameHandler(EsphomeCommandWebSocket):
     old_name: str
@@ -384,12 +424,44 @@ class EsphomeUploadHandler(EsphomePortCommandWebSocket):
 
 
 class EsphomeRunHandler(EsphomePortCommandWebSocket):
+    """Build and upload in the build queue, then show the logs.
+
+    The logs are shown like `esphome run` does, but outside the build
+    queue so they don't hold on to a build slot.
+    """
+
+    _logs_command: list[str]
+
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         """Build the command to run."""
-        return await self.build_device_command(["run"], json_message)
+        command = await self.build_device_command(["run"], json_message)
+        device_args = command[len(DASHBOARD_COMMAND) + 1 :]
+        self._logs_command = [*DASHBOARD_COMMAND, "logs", *device_args]
+        return [*command, "--no-logs"]
+
+    async def spawn(self, command: list[str]) -> None:
+        """Queue the build and upload."""
+        if not self._is_closed:
+            self._unsubscribe = DASHBOARD.build_queue.async_subscribe(
+                command, self._on_build_message
+            )
+
+    def _on_build_message(self, message: dict[str, Any]) -> None:
+        if self._is_closed:
+            return
+        if message["event"] != "exit" or message["code"] != 0:
+            self._on_shared_message(message)
+            return
+        # Uploaded, switch over to the logs
+        self._unsubscribe()
+        self._unsubscribe = DASHBOARD.log_broker.async_subscribe(
+            self._logs_command, self._on_shared_message
+        )
 
 
 class EsphomeCompileHandler(EsphomeCommandWebSocket):
+    is_build = True
+
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         config_file = settings.rel_path(json_message["configuration"])
         command = [*DASHBOARD_COMMAND, "compile"]
@@ -421,16 +493,22 @@ class EsphomeCleanHandler(EsphomeCommandWebSocket):
 
 
 class EsphomeVscodeHandler(EsphomeCommandWebSocket):
+    uses_stdin = True
+
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         return [*DASHBOARD_COMMAND, "-q", "vscode", "dummy"]
 
 
 class EsphomeAceEditorHandler(EsphomeCommandWebSocket):
+    uses_stdin = True
+
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         return [*DASHBOARD_COMMAND, "-q", "vscode", "--ace", settings.config_dir]
 
 
 class EsphomeUpdateAllHandler(EsphomeCommandWebSocket):
+    is_build = True
+
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         return [*DASHBOARD_COMMAND, "update-all", settings.config_dir]
 
@@ -583,14 +661,31 @@ class DownloadListRequestHandler(BaseHandler):
         return
 
 
+def parse_byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a Range header into the start and end offset of the range.
+
+    Returns None for anything but a single byte range, and raises
+    ValueError if the range isn't within a file of size bytes.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first.isdigit() or last.isdigit()):
+        return None
+    if not first:
+        # The last bytes of the file
+        start, end = max(0, size - int(last)), size
+    else:
+        start = int(first)
+        end = min(size, int(last) + 1) if last else size
+    if start >= end:
+        raise ValueError(f"Range {header} not satisfiable")
+    return start, end
+
+
 class DownloadBinaryRequestHandler(BaseHandler):
-    def _load_file(self, path: str, compressed: bool) -> bytes:
-        """Load a file from disk and compress it if requested."""
-        with open(path, "rb") as f:
-            data = f.read()
-            if compressed:
-                return gzip.compress(data, 9)
-            return data
+    CHUNK_SIZE = 64 * 1024
 
     @authenticated
     @bind_config
@@ -622,7 +717,7 @@ class DownloadBinaryRequestHandler(BaseHandler):
 
         if not Path(path).is_file():
             args = ["esphome", "idedata", settings.rel_path(configuration)]
-            rc, stdout, _ = await async_run_system_command(args)
+            rc, stdout, _ = await DASHBOARD.worker_pool.async_run(args)
 
             if rc != 0:
                 self.send_error(404 if rc == 2 else 500)
@@ -644,19 +739,67 @@ class DownloadBinaryRequestHandler(BaseHandler):
 
         download_name = download_name + ".gz" if compressed else download_name
 
+        if not Path(path).is_file():
+            self.send_error(404)
+            return
+        stat = os.stat(path)
+        etag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+        size = stat.st_size
+        if compressed:
+            etag += "-gz"
+
         self.set_header("Content-Type", "application/octet-stream")
         self.set_header(
             "Content-Disposition", f'attachment; filename="{download_name}"'
         )
         self.set_header("Cache-Control", "no-cache")
-        if not Path(path).is_file():
-            self.send_error(404)
+        self.set_header("Accept-Ranges", "bytes")
+        self.set_header("Etag", f'"{etag}"')
+        if self.check_etag_header():
+            self.set_status(304)
             return
 
-        data = await loop.run_in_executor(None, self._load_file, path, compressed)
-        self.write(data)
-
-        self.finish()
+        data = None
+        if compressed:
+            cache_dir = os.path.join(CORE.data_dir, "download_cache")
+            try:
+                path = await loop.run_in_executor(
+                    None, gzip_file_cached, path, cache_dir
+                )
+                size = os.stat(path).st_size
+            except OSError as err:
+                # E.g. a read-only data dir, compress into memory instead
+                _LOGGER.debug("Could not cache compressed %s: %s", path, err)
+                data = await loop.run_in_executor(None, gzip_file, path)
+                size = len(data)
+
+        start, end = 0, size
+        if range_header := self.request.headers.get("Range"):
+            try:
+                byte_range = parse_byte_range(range_header, size)
+            except ValueError:
+                self.set_status(416)
+                self.set_header("Content-Range", f"bytes */{size}")
+                return
+            if byte_range is not None:
+                start, end = byte_range
+                self.set_status(206)
+                self.set_header("Content-Range", f"bytes {start}-{end - 1}/{size}")
+        self.set_header("Content-Length", end - start)
+
+        with io.BytesIO(data) if data is not None else open(path, "rb") as file:
+            file.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = file.read(min(self.CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                self.write(chunk)
+                try:
+                    await self.flush()
+                except tornado.iostream.StreamClosedError:
+                    return
 
 
 class EsphomeVersionHandler(BaseHandler):
@@ -672,29 +815,54 @@ class ListDevicesHandler(BaseHandler):
     async def get(self) -> None:
         dashboard = DASHBOARD
         await dashboard.entries.async_request_update_entries()
-        entries = dashboard.entries.async_all()
         self.set_header("content-type", "application/json")
-        configured = {entry.name for entry in entries}
+        self.write(json.dumps(device_list(dashboard)))
 
-        self.write(
-            json.dumps(
-                {
-                    "configured": [entry.to_dict() for entry in entries],
-                    "importable": [
-                        {
-                            "name": res.device_name,
-                            "friendly_name": res.friendly_name,
-                            "package_import_url": res.package_import_url,
-                            "project_name": res.project_name,
-                            "project_version": res.project_version,
-                            "network": res.network,
-                        }
-                        for res in dashboard.import_result.values()
-                        if res.device_name not in configured
-                    ],
-                }
-            )
-        )
+
+class DeviceEventsHandler(tornado.websocket.WebSocketHandler):
+    """Stream the devices and their states.
+
+    Sends the device list and the states once, then batches of changes,
+    replacing the polling of /devices and /ping.
+    """
+
+    check_origin = EsphomeCommandWebSocket.check_origin
+
+    def __init__(
+        self,
+        application: tornado.web.Application,
+        request: tornado.httputil.HTTPServerRequest,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the websocket."""
+        super().__init__(application, request, **kwargs)
+        self._is_closed = False
+        self._unsubscribe: Callable[[], None] | None = None
+
+    @authenticated
+    async def get(self, *args: str, **kwargs: str) -> None:
+        await super().get(*args, **kwargs)
+
+    async def open(  # pylint: disable=invalid-overridden-method
+        self, *args: str, **kwargs: str
+    ) -> None:
+        """Subscribe to the device events."""
+        self.set_nodelay(True)
+        await DASHBOARD.entries.async_request_update_entries()
+        if not self._is_closed:
+            self._unsubscribe = DASHBOARD.device_events.async_subscribe(self._send)
+
+    def _send(self, message: str) -> None:
+        try:
+            self.write_message(message)
+        except tornado.websocket.WebSocketClosedError:
+            pass
+
+    def on_close(self) -> None:
+        self._is_closed = True
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
 
 
 class MainRequestHandler(BaseHandler):
@@ -789,9 +957,7 @@ class PingRequestHandler(BaseHandler):
     @authenticated
     def get(self) -> None:
         dashboard = DASHBOARD
-        dashboard.ping_request.set()
-        if settings.status_use_mqtt:
-            dashboard.mqtt_ping_request.set()
+        dashboard.async_request_ping()
         self.set_header("content-type", "application/json")
 
         self.write(
@@ -1029,7 +1195,7 @@ class JsonConfigRequestHandler(BaseHandler):
 
         args = ["esphome", "config", filename, "--show-secrets"]
 
-        rc, stdout, _ = await async_run_system_command(args)
+        rc, stdout, _ = await DASHBOARD.worker_pool.async_run(args)
 
         if rc != 0:
             self.send_error(422)
@@ -1149,6 +1315,7 @@ def make_app(debug=get_bool_env(ENV_DEV)) -> tornado.web.Application:
             (f"{rel}wizard", WizardRequestHandler),
             (f"{rel}static/(.*)", StaticFileHandler, {"path": get_static_path()}),
             (f"{rel}devices", ListDevicesHandler),
+            (f"{rel}events", DeviceEventsHandler),
             (f"{rel}import", ImportRequestHandler),
             (f"{rel}secret_keys", SecretKeysRequestHandler),
             (f"{rel}json-config", JsonConfigRequestHandler),
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection
+import os
+import sys
+from typing import Callable, Union
+
+from esphome.util import shlex_quote
+
+_LOGGER = logging.getLogger(__name__)
+
+# Imported once by the fork server instead of by every command
+PRELOAD_MODULES = [
+    "esphome.__main__",
+    "esphome.config",
+    "esphome.yaml_util",
+    "esphome.vscode",
+    "esphome.dashboard.workers",
+    "esphome.components.esp32",
+    "esphome.components.esp8266",
+    "esphome.components.rp2040",
+    "esphome.components.libretiny",
+    "esphome.components.host",
+    "esphome.components.logger",
+    "esphome.components.api",
+    "esphome.components.ota",
+    "esphome.components.wifi",
+    "esphome.components.web_server",
+    "esphome.components.mqtt",
+    "esphome.components.sensor",
+    "esphome.components.binary_sensor",
+    "esphome.components.switch",
+    "esphome.components.output",
+    "esphome.components.light",
+]
+
+
+def _run_command(
+    command: list[str],
+    stdout: Connection,
+    stderr: Connection | None,
+    stdin: Connection | None = None,
+) -> None:
+    """Run an esphome command, in a worker forked by the fork server."""
+    if stdin is not None:
+        os.dup2(stdin.fileno(), 0)
+        stdin.close()
+        # pylint: disable=consider-using-with
+        sys.stdin = open(0, encoding="utf-8", closefd=False)
+    os.dup2(stdout.fileno(), 1)
+    os.dup2((stderr or stdout).fileno(), 2)
+    stdout.close()
+    if stderr is not None:
+        stderr.close()
+    # pylint: disable=consider-using-with
+    sys.stdout = open(1, "w", encoding="utf-8", buffering=1, closefd=False)
+    sys.stderr = open(
+        2,
+        "w",
+        encoding="utf-8",
+        errors="backslashreplace",
+        buffering=1,
+        closefd=False,
+    )
+    sys.argv = command
+
+    from esphome.__main__ import main
+
+    sys.exit(main())
+
+
+async def _async_open_pipe() -> tuple[asyncio.StreamReader, Connection]:
+    """Open a pipe, returning a reader and the end to pass to a worker."""
+    read_fd, write_fd = os.pipe()
+    reader = asyncio.StreamReader()
+    # pylint: disable=consider-using-with
+    await asyncio.get_running_loop().connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), open(read_fd, "rb", buffering=0)
+    )
+    return reader, Connection(write_fd, readable=False)
+
+
+async def _async_open_write_pipe() -> tuple[asyncio.StreamWriter, Connection]:
+    """Open a pipe, returning a writer and the end to pass to a worker."""
+    read_fd, write_fd = os.pipe()
+    loop = asyncio.get_running_loop()
+    # pylint: disable=consider-using-with
+    transport, protocol = await loop.connect_write_pipe(
+        lambda: asyncio.streams.FlowControlMixin(loop=loop),
+        open(write_fd, "wb", buffering=0),
+    )
+    writer = asyncio.StreamWriter(transport, protocol, None, loop)
+    return writer, Connection(read_fd, writable=False)
+
+
+class WorkerProcess:
+    """An esphome command running in a worker.
+
+    Has the parts of asyncio.subprocess.Process the dashboard uses.
+    """
+
+    __slots__ = (
+        "stdin",
+        "stdout",
+        "stderr",
+        "returncode",
+        "_process",
+        "_loop",
+        "_exited",
+        "_on_exit_callback",
+    )
+
+    def __init__(
+        self,
+        process: multiprocessing.Process,
+        stdin: asyncio.StreamWriter | None,
+        stdout: asyncio.StreamReader,
+        stderr: asyncio.StreamReader | None,
+        on_exit: Callable[[WorkerProcess], None],
+    ) -> None:
+        """Initialize the WorkerProcess."""
+        self.stdin = stdin
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode: int | None = None
+        self._process = process
+        self._loop = asyncio.get_running_loop()
+        self._exited = asyncio.Event()
+        self._on_exit_callback = on_exit
+        self._loop.add_reader(process.sentinel, self._on_exit)
+
+    @property
+    def pid(self) -> int:
+        """Return the process id."""
+        return self._process.pid
+
+    def _on_exit(self) -> None:
+        self._loop.remove_reader(self._process.sentinel)
+        if self.stdin is not None:
+            self.stdin.close()
+        self._process.join()
+        self.returncode = self._process.exitcode
+        self._process.close()
+        self._exited.set()
+        self._on_exit_callback(self)
+
+    async def wait(self) -> int:
+        """Wait for the command to exit, returning its exit code."""
+        await self._exited.wait()
+        return self.returncode
+
+    async def communicate(self) -> tuple[bytes, bytes | None]:
+        """Read all output and wait for the command to exit."""
+        if self.stderr is None:
+            stdout, stderr = await self.stdout.read(), None
+        else:
+            stdout, stderr = await asyncio.gather(
+                self.stdout.read(), self.stderr.read()
+            )
+        await self.wait()
+        return stdout, stderr
+
+    def terminate(self) -> None:
+        """Terminate the command."""
+        if self.returncode is None:
+            self._process.terminate()
+
+    def kill(self) -> None:
+        """Kill the command."""
+        if self.returncode is None:
+            self._process.kill()
+
+
+Process = Union[WorkerProcess, "asyncio.subprocess.Process"]
+
+
+class WorkerPool:
+    """Runs esphome commands in workers forked from a pre-warmed process.
+
+    A multiprocessing fork server imports esphome, voluptuous, the YAML
+    loader and the common components once. Every command runs in a fresh
+    fork of it, so it doesn't import anything before doing its work and
+    can't leave CORE state behind for the next command.
+
+    Other commands, and all commands while the pool isn't started, run as
+    subprocesses.
+    """
+
+    __slots__ = ("_context", "_workers")
+
+    def __init__(self) -> None:
+        """Initialize the WorkerPool."""
+        self._context: multiprocessing.context.ForkServerContext | None = None
+        self._workers: set[WorkerProcess] = set()
+
+    @property
+    def started(self) -> bool:
+        """Return if commands run in workers."""
+        return self._context is not None
+
+    async def async_start(self) -> bool:
+        """Start the fork server, returns False if it isn't supported."""
+        if "forkserver" not in multiprocessing.get_all_start_methods():
+            return False
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(PRELOAD_MODULES)
+        from multiprocessing import forkserver
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, forkserver.ensure_running
+            )
+        except OSError as err:
+            _LOGGER.warning("Could not start the worker pool: %s", err)
+            return False
+        self._context = context
+        return True
+
+    async def async_stop(self) -> None:
+        """Terminate the running workers and wait for them to exit."""
+        workers = list(self._workers)
+        for worker in workers:
+            worker.terminate()
+        await asyncio.gather(*(worker.wait() for worker in workers))
+
+    async def async_exec(
+        self,
+        command: list[str],
+        stderr: int = asyncio.subprocess.STDOUT,
+        stdin: int = asyncio.subprocess.DEVNULL,
+    ) -> Process:
+        """Start command with its output piped.
+
+        stderr is asyncio.subprocess.STDOUT to merge it into stdout or
+        asyncio.subprocess.PIPE to read it separately. stdin is
+        asyncio.subprocess.PIPE to write to the command's input.
+        """
+        if self._context is None or command[0] != "esphome":
+            return await asyncio.create_subprocess_exec(
+                *command,
+                stdin=stdin,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=stderr,
+                close_fds=False,
+            )
+        _LOGGER.debug(
+            "Running command '%s' in a worker",
+            " ".join(shlex_quote(x) for x in command),
+        )
+        stdout, stdout_end = await _async_open_pipe()
+        stderr_reader: asyncio.StreamReader | None = None
+        stderr_end: Connection | None = None
+        if stderr != asyncio.subprocess.STDOUT:
+            stderr_reader, stderr_end = await _async_open_pipe()
+        stdin_writer: asyncio.StreamWriter | None = None
+        stdin_end: Connection | None = None
+        if stdin == asyncio.subprocess.PIPE:
+            stdin_writer, stdin_end = await _async_open_write_pipe()
+        process = self._context.Process(
+            target=_run_command, args=(command, stdout_end, stderr_end, stdin_end)
+        )
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, process.start)
+        finally:
+            # The worker has its own copies now, close ours so reading
+            # ends when the worker exits
+            for end in (stdout_end, stderr_end, stdin_end):
+                if end is not None:
+                    end.close()
+        worker = WorkerProcess(
+            process, stdin_writer, stdout, stderr_reader, self._workers.discard
+        )
+        self._workers.add(worker)
+        return worker
+
+    async def async_run(self, command: Iterable[str]) -> tuple[int, bytes, bytes]:
+        """Run command and return a tuple of returncode, stdout, stderr."""
+        process = await self.async_exec(list(command), asyncio.subprocess.PIPE)
+        stdout, stderr = await process.communicate()
+        return await process.wait(), stdout, stderr
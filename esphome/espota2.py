@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-import gzip
+import asyncio
+import collections
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 import hashlib
 import io
 import logging
 import random
 import socket
 import sys
+import tempfile
 import time
+import zlib
 
 from esphome.core import EsphomeError
 from esphome.helpers import is_ip_address, resolve_ip_address
@@ -48,6 +53,13 @@ FEATURE_SUPPORTS_COMPRESSION = 0x01
 
 UPLOAD_BLOCK_SIZE = 8192
 UPLOAD_BUFFER_SIZE = UPLOAD_BLOCK_SIZE * 8
+# Number of blocks that may be sent before the chunk acknowledgement (OTA v2)
+# of the first one has to be received.
+UPLOAD_WINDOW_SIZE = 4
+# Compressed uploads larger than this are spooled to a temporary file
+UPLOAD_SPOOL_SIZE = 1024 * 1024
+# Seconds the async upload waits for the device to take the data it sent
+SEND_TIMEOUT = 30.0
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -80,6 +92,105 @@ class OTAError(EsphomeError):
     pass
 
 
+@dataclass
+class OTAStats:
+    """Statistics of a single OTA upload."""
+
+    file_size: int = 0
+    upload_size: int = 0
+    duration: float = 0.0
+    rtts: list[float] = field(default_factory=list)
+
+    @property
+    def compression_ratio(self) -> float:
+        if not self.file_size:
+            return 1.0
+        return self.upload_size / self.file_size
+
+    @property
+    def throughput(self) -> float:
+        """Upload throughput in bytes per second."""
+        if not self.duration:
+            return 0.0
+        return self.upload_size / self.duration
+
+    @property
+    def rtt_avg(self) -> float | None:
+        if not self.rtts:
+            return None
+        return sum(self.rtts) / len(self.rtts)
+
+    @property
+    def rtt_max(self) -> float | None:
+        if not self.rtts:
+            return None
+        return max(self.rtts)
+
+
+def _auth_result(password: str, nonce: str, cnonce: str) -> str:
+    result_md5 = hashlib.md5()
+    result_md5.update(password.encode("utf-8"))
+    result_md5.update(nonce.encode())
+    result_md5.update(cnonce.encode())
+    return result_md5.hexdigest()
+
+
+def _prepare_upload(
+    file_handle: io.IOBase, compress: bool
+) -> tuple[io.IOBase, int, int, str]:
+    """Prepare the upload stream in a single pass over the firmware file.
+
+    The protocol needs the size and MD5 of the upload before any data is sent, so
+    a compressed upload is spooled (in memory up to UPLOAD_SPOOL_SIZE, on disk
+    after that) while the checksum is calculated.
+
+    :return: The stream to upload, the firmware size, the upload size and the MD5 of the upload.
+    """
+    upload_md5 = hashlib.md5()
+    file_size = 0
+    if not compress:
+        for chunk in iter(lambda: file_handle.read(UPLOAD_BUFFER_SIZE), b""):
+            upload_md5.update(chunk)
+            file_size += len(chunk)
+        file_handle.seek(0)
+        return file_handle, file_size, file_size, upload_md5.hexdigest()
+
+    # wbits=31 produces a gzip stream, like gzip.compress(..., mtime=0)
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    # pylint: disable-next=consider-using-with
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE)
+    upload_size = 0
+
+    def write(data: bytes) -> None:
+        nonlocal upload_size
+        upload_md5.update(data)
+        upload_size += len(data)
+        spool.write(data)
+
+    for chunk in iter(lambda: file_handle.read(UPLOAD_BUFFER_SIZE), b""):
+        file_size += len(chunk)
+        write(compressor.compress(chunk))
+    write(compressor.flush())
+    spool.seek(0)
+    return spool, file_size, upload_size, upload_md5.hexdigest()
+
+
+def _read_upload(file_handle: io.IOBase, compress: bool) -> tuple[bytes, int, int, str]:
+    """Like `_prepare_upload`, but return the upload data itself.
+
+    The asynchronous upload sends the data from memory so that it doesn't read
+    from the file on the event loop.
+    """
+    upload_stream, file_size, upload_size, upload_md5 = _prepare_upload(
+        file_handle, compress
+    )
+    try:
+        return upload_stream.read(), file_size, upload_size, upload_md5
+    finally:
+        if upload_stream is not file_handle:
+            upload_stream.close()
+
+
 def recv_decode(sock, amount, decode=True):
     data = sock.recv(amount)
     if not decode:
@@ -195,10 +306,8 @@ def send_check(sock, data, msg):
 
 def perform_ota(
     sock: socket.socket, password: str, file_handle: io.IOBase, filename: str
-) -> None:
-    file_contents = file_handle.read()
-    file_size = len(file_contents)
-    _LOGGER.info("Uploading %s (%s bytes)", filename, file_size)
+) -> OTAStats:
+    _LOGGER.info("Uploading %s", filename)
 
     # Enable nodelay, we need it for phase 1
     sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
@@ -218,12 +327,30 @@ def perform_ota(
         sock, 1, "features", [RESPONSE_HEADER_OK, RESPONSE_SUPPORTS_COMPRESSION]
     )[0]
 
-    if features == RESPONSE_SUPPORTS_COMPRESSION:
-        upload_contents = gzip.compress(file_contents, compresslevel=9)
-        _LOGGER.info("Compressed to %s bytes", len(upload_contents))
-    else:
-        upload_contents = file_contents
-
+    compress = features == RESPONSE_SUPPORTS_COMPRESSION
+    upload_stream, file_size, upload_size, upload_md5 = _prepare_upload(
+        file_handle, compress
+    )
+    stats = OTAStats(file_size=file_size, upload_size=upload_size)
+    _LOGGER.info("Firmware is %s bytes", file_size)
+    if compress:
+        _LOGGER.info("Compressed to %s bytes", upload_size)
+    try:
+        _perform_upload(sock, password, version, upload_stream, stats, upload_md5)
+    finally:
+        if upload_stream is not file_handle:
+            upload_stream.close()
+    return stats
+
+
+def _perform_upload(
+    sock: socket.socket,
+    password: str,
+    version: int,
+    upload_stream: io.IOBase,
+    stats: OTAStats,
+    upload_md5: str,
+) -> None:
     (auth,) = receive_exactly(
         sock, 1, "auth", [RESPONSE_REQUEST_AUTH, RESPONSE_AUTH_OK]
     )
@@ -239,17 +366,13 @@ def perform_ota(
 
         send_check(sock, cnonce, "auth cnonce")
 
-        result_md5 = hashlib.md5()
-        result_md5.update(password.encode("utf-8"))
-        result_md5.update(nonce.encode())
-        result_md5.update(cnonce.encode())
-        result = result_md5.hexdigest()
+        result = _auth_result(password, nonce, cnonce)
         _LOGGER.debug("Auth: Result is %s", result)
 
         send_check(sock, result, "auth result")
         receive_exactly(sock, 1, "auth result", RESPONSE_AUTH_OK)
 
-    upload_size = len(upload_contents)
+    upload_size = stats.upload_size
     upload_size_encoded = [
         (upload_size >> 24) & 0xFF,
         (upload_size >> 16) & 0xFF,
@@ -259,7 +382,6 @@ def perform_ota(
     send_check(sock, upload_size_encoded, "binary size")
     receive_exactly(sock, 1, "binary size", RESPONSE_UPDATE_PREPARE_OK)
 
-    upload_md5 = hashlib.md5(upload_contents).hexdigest()
     _LOGGER.debug("MD5 of upload is %s", upload_md5)
 
     send_check(sock, upload_md5, "file checksum")
@@ -275,30 +397,48 @@ def perform_ota(
     sock.settimeout(30.0)
     start_time = time.perf_counter()
 
+    # Send times of the blocks that have not been acknowledged yet. With OTA v2 the
+    # device acknowledges every block, keep a window of blocks in flight instead of
+    # waiting a full round-trip after each one.
+    in_flight: collections.deque[tuple[int, float]] = collections.deque()
     offset = 0
     progress = ProgressBar()
-    while True:
-        chunk = upload_contents[offset : offset + UPLOAD_BLOCK_SIZE]
-        if not chunk:
-            break
-        offset += len(chunk)
 
-        try:
-            sock.sendall(chunk)
-            if version >= OTA_VERSION_2_0:
-                receive_exactly(sock, 1, "chunk OK", RESPONSE_CHUNK_OK)
-        except OSError as err:
-            sys.stderr.write("\n")
-            raise OTAError(f"Error sending data: {err}") from err
+    def receive_chunk_ok() -> None:
+        acked_offset, sent_at = in_flight.popleft()
+        receive_exactly(sock, 1, "chunk OK", RESPONSE_CHUNK_OK)
+        stats.rtts.append(time.perf_counter() - sent_at)
+        progress.update(acked_offset / upload_size)
 
-        progress.update(offset / upload_size)
+    try:
+        for chunk in iter(lambda: upload_stream.read(UPLOAD_BLOCK_SIZE), b""):
+            sock.sendall(chunk)
+            offset += len(chunk)
+            if version < OTA_VERSION_2_0:
+                progress.update(offset / upload_size)
+                continue
+            in_flight.append((offset, time.perf_counter()))
+            if len(in_flight) >= UPLOAD_WINDOW_SIZE:
+                receive_chunk_ok()
+        while in_flight:
+            receive_chunk_ok()
+    except OSError as err:
+        sys.stderr.write("\n")
+        raise OTAError(f"Error sending data: {err}") from err
     progress.done()
 
     # Enable nodelay for last checks
     sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-    duration = time.perf_counter() - start_time
-
-    _LOGGER.info("Upload took %.2f seconds, waiting for result...", duration)
+    stats.duration = time.perf_counter() - start_time
+
+    _LOGGER.info("Upload took %.2f seconds, waiting for result...", stats.duration)
+    _LOGGER.info("Average upload speed: %.1f kB/s", stats.throughput / 1024)
+    if stats.rtts:
+        _LOGGER.debug(
+            "Chunk round-trip time: avg %.1f ms, max %.1f ms",
+            stats.rtt_avg * 1000,
+            stats.rtt_max * 1000,
+        )
 
     receive_exactly(sock, 1, "receive OK", RESPONSE_RECEIVE_OK)
     receive_exactly(sock, 1, "Update end", RESPONSE_UPDATE_END_OK)
@@ -357,3 +497,208 @@ def run_ota(remote_host, remote_port, password, filename):
     except OTAError as err:
         _LOGGER.error(err)
         return 1
+
+
+@dataclass
+class OTAResult:
+    """Result of an OTA upload to a single host."""
+
+    host: str
+    filename: str
+    success: bool
+    duration: float
+    bytes_sent: int = 0
+    compression_ratio: float | None = None
+    error: str | None = None
+
+
+class _AsyncOTAClient:
+    """Client side of the OTA protocol on top of asyncio streams."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._host = host
+
+    def _set_nodelay(self, enabled: bool) -> None:
+        sock = self._writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(enabled))
+
+    async def _send(self, data: bytes, msg: str) -> None:
+        try:
+            self._writer.write(data)
+            await asyncio.wait_for(self._writer.drain(), SEND_TIMEOUT)
+        except (OSError, asyncio.TimeoutError) as err:
+            raise OTAError(f"Error sending {msg}: {err!r}") from err
+
+    async def _receive(
+        self, amount: int, msg: str, expect, timeout: float = 10.0
+    ) -> bytes:
+        try:
+            data = await asyncio.wait_for(self._reader.readexactly(1), timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as err:
+            raise OTAError(f"Error receiving acknowledge {msg}: {err!r}") from err
+        try:
+            check_error(data, expect)
+        except OTAError as err:
+            raise OTAError(f"Error {msg}: {err}") from err
+        if amount > 1:
+            try:
+                data += await asyncio.wait_for(
+                    self._reader.readexactly(amount - 1), timeout
+                )
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as err:
+                raise OTAError(f"Error receiving {msg}: {err!r}") from err
+        return data
+
+    async def perform(
+        self, password: str, file_handle: io.IOBase, filename: str
+    ) -> OTAStats:
+        loop = asyncio.get_running_loop()
+        self._set_nodelay(True)
+        await self._send(bytes(MAGIC_BYTES), "magic bytes")
+
+        _, version = await self._receive(2, "version", RESPONSE_OK)
+        _LOGGER.debug("%s: Device support OTA version: %s", self._host, version)
+        supported_versions = (OTA_VERSION_1_0, OTA_VERSION_2_0)
+        if version not in supported_versions:
+            raise OTAError(
+                f"Device uses unsupported OTA version {version}, this ESPHome supports {supported_versions}"
+            )
+
+        await self._send(bytes([FEATURE_SUPPORTS_COMPRESSION]), "features")
+        (features,) = await self._receive(
+            1, "features", [RESPONSE_HEADER_OK, RESPONSE_SUPPORTS_COMPRESSION]
+        )
+        compress = features == RESPONSE_SUPPORTS_COMPRESSION
+        # Compressing and reading the file block, keep them out of the event loop
+        upload_data, file_size, upload_size, upload_md5 = await loop.run_in_executor(
+            None, _read_upload, file_handle, compress
+        )
+        stats = OTAStats(file_size=file_size, upload_size=upload_size)
+        await self._upload(password, version, upload_data, stats, upload_md5)
+        return stats
+
+    async def _upload(
+        self,
+        password: str,
+        version: int,
+        upload_data: bytes,
+        stats: OTAStats,
+        upload_md5: str,
+    ) -> None:
+        (auth,) = await self._receive(
+            1, "auth", [RESPONSE_REQUEST_AUTH, RESPONSE_AUTH_OK]
+        )
+        if auth == RESPONSE_REQUEST_AUTH:
+            if not password:
+                raise OTAError("ESP requests password, but no password given!")
+            nonce = (await self._receive(32, "authentication nonce", [])).decode()
+            cnonce = hashlib.md5(str(random.random()).encode()).hexdigest()
+            await self._send(cnonce.encode(), "auth cnonce")
+            result = _auth_result(password, nonce, cnonce)
+            await self._send(result.encode(), "auth result")
+            await self._receive(1, "auth result", RESPONSE_AUTH_OK)
+
+        await self._send(stats.upload_size.to_bytes(4, "big"), "binary size")
+        await self._receive(1, "binary size", RESPONSE_UPDATE_PREPARE_OK)
+        await self._send(upload_md5.encode(), "file checksum")
+        await self._receive(1, "file checksum", RESPONSE_BIN_MD5_OK)
+
+        self._set_nodelay(False)
+        start_time = time.perf_counter()
+        in_flight: collections.deque[float] = collections.deque()
+
+        async def receive_chunk_ok() -> None:
+            sent_at = in_flight.popleft()
+            await self._receive(1, "chunk OK", RESPONSE_CHUNK_OK, timeout=30.0)
+            stats.rtts.append(time.perf_counter() - sent_at)
+
+        for offset in range(0, len(upload_data), UPLOAD_BLOCK_SIZE):
+            await self._send(upload_data[offset : offset + UPLOAD_BLOCK_SIZE], "data")
+            if version < OTA_VERSION_2_0:
+                continue
+            in_flight.append(time.perf_counter())
+            if len(in_flight) >= UPLOAD_WINDOW_SIZE:
+                await receive_chunk_ok()
+        while in_flight:
+            await receive_chunk_ok()
+
+        self._set_nodelay(True)
+        stats.duration = time.perf_counter() - start_time
+        _LOGGER.info(
+            "%s: Upload took %.2f seconds (%.1f kB/s), waiting for result...",
+            self._host,
+            stats.duration,
+            stats.throughput / 1024,
+        )
+        await self._receive(1, "receive OK", RESPONSE_RECEIVE_OK, timeout=30.0)
+        await self._receive(1, "Update end", RESPONSE_UPDATE_END_OK, timeout=30.0)
+        await self._send(bytes([RESPONSE_OK]), "end acknowledgement")
+
+
+async def async_run_ota(
+    remote_host: str, remote_port: int, password: str, filename: str
+) -> OTAResult:
+    """Upload a firmware file to a single device without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+
+    def result(error: str | None, stats: OTAStats | None = None) -> OTAResult:
+        return OTAResult(
+            host=remote_host,
+            filename=filename,
+            success=error is None,
+            duration=time.perf_counter() - start,
+            bytes_sent=stats.upload_size if stats else 0,
+            compression_ratio=stats.compression_ratio if stats else None,
+            error=error,
+        )
+
+    ip = remote_host
+    if not is_ip_address(remote_host):
+        try:
+            ip = await loop.run_in_executor(None, resolve_ip_address, remote_host)
+        except EsphomeError as err:
+            return result(f"Error resolving IP address of {remote_host}: {err}")
+
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(ip, remote_port), 10.0
+        )
+    except (OSError, asyncio.TimeoutError) as err:
+        return result(f"Connecting to {remote_host}:{remote_port} failed: {err!r}")
+
+    _LOGGER.info("%s: Uploading %s", remote_host, filename)
+    try:
+        with open(filename, "rb") as file_handle:
+            stats = await _AsyncOTAClient(reader, writer, remote_host).perform(
+                password, file_handle, filename
+            )
+    except (OTAError, OSError) as err:
+        return result(str(err))
+    finally:
+        writer.close()
+    _LOGGER.info("%s: OTA successful", remote_host)
+    return result(None, stats)
+
+
+async def async_run_ota_batch(
+    targets: Iterable[tuple[str, int, str, str]], max_concurrency: int = 4
+) -> list[OTAResult]:
+    """Upload firmware to many devices concurrently.
+
+    :param targets: (host, port, password, filename) for every upload.
+    :param max_concurrency: Maximum number of uploads running at the same time.
+    :return: The results in the same order as ``targets``.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(target: tuple[str, int, str, str]) -> OTAResult:
+        async with semaphore:
+            return await async_run_ota(*target)
+
+    return await asyncio.gather(*(run(target) for target in targets))
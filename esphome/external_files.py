@@ -22,6 +22,9 @@ CACHE_CONTROL_MAX_AGE = "max-age="
 CONTENT_DISPOSITION = "content-disposition"
 TEMP_DIR = "temp"
 
+# The URL of each file that was found up to date since clear_checked()
+_CHECKED: dict[Path, str] = {}
+
 
 def has_remote_file_changed(url, local_file_path):
     if os.path.exists(local_file_path):
@@ -80,9 +83,24 @@ def compute_local_file_dir(domain: str) -> Path:
     return base_directory
 
 
+def is_checked(path: Path) -> bool:
+    """Return True if the file was downloaded or found up to date already."""
+    return path in _CHECKED
+
+
+def clear_checked() -> None:
+    """Check the remote files again on the next download_content() call."""
+    _CHECKED.clear()
+
+
 def download_content(url: str, path: Path, timeout=NETWORK_TIMEOUT) -> bytes:
+    if _CHECKED.get(path) == url and path.is_file():
+        _LOGGER.debug("Remote file was checked already %s", url)
+        return path.read_bytes()
+
     if not has_remote_file_changed(url, path):
         _LOGGER.debug("Remote file has not changed %s", url)
+        _CHECKED[path] = url
         return path.read_bytes()
 
     _LOGGER.debug(
@@ -104,4 +122,5 @@ def download_content(url: str, path: Path, timeout=NETWORK_TIMEOUT) -> bytes:
     path.parent.mkdir(parents=True, exist_ok=True)
     data = req.content
     path.write_bytes(data)
+    _CHECKED[path] = url
     return data
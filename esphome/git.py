@@ -1,13 +1,23 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+import contextlib
 from dataclasses import dataclass
 from datetime import datetime
 import hashlib
 import logging
+import os
 from pathlib import Path
 import re
+import shutil
+import stat
 import subprocess
-from typing import Callable, Optional
+import sys
+import threading
 import urllib.parse
 
+from esphome import config_cache
 import esphome.config_validation as cv
 from esphome.core import CORE, TimePeriodSeconds
 
@@ -34,6 +44,23 @@ def run_git_command(cmd, cwd=None) -> str:
     return ret.stdout.decode("utf-8").strip()
 
 
+# The checkouts done by prefetch(), or the errors they failed with
+_PREFETCHED: dict[Path, tuple[Path, Callable[[], None] | None] | cv.Invalid] = {}
+
+
+# Directory in the data dir that holds the mirrors of the repositories
+MIRRORS_DOMAIN = "git_mirrors"
+
+# File in a mirror that is locked while the mirror or its worktrees are updated
+MIRROR_LOCK_FILE = "esphome.lock"
+
+# Serializes the updates of a mirror within this process
+_MIRROR_LOCKS: defaultdict[Path, threading.Lock] = defaultdict(threading.Lock)
+_MIRROR_LOCKS_LOCK = threading.Lock()
+
+_SHA_RE = re.compile(r"[0-9a-f]{40}")
+
+
 def _compute_destination_path(key: str, domain: str) -> Path:
     base_dir = Path(CORE.data_dir) / domain
     h = hashlib.new("sha256")
@@ -41,84 +68,316 @@ def _compute_destination_path(key: str, domain: str) -> Path:
     return base_dir / h.hexdigest()[:8]
 
 
-def clone_or_update(
+def _compute_mirror_path(url: str) -> Path:
+    return _compute_destination_path(url, MIRRORS_DOMAIN)
+
+
+def _fetch_timestamp_path(repo_dir: Path) -> Path:
+    # Touched whenever the remote is checked for updates
+    return repo_dir / ".git"
+
+
+def _note_checkout(repo_dir: Path, refresh: TimePeriodSeconds | None) -> None:
+    refresh_at = None
+    if refresh is not None:
+        mtime = _fetch_timestamp_path(repo_dir).stat().st_mtime
+        refresh_at = mtime + refresh.total_seconds
+    config_cache.note_git_repo(repo_dir, refresh_at)
+
+
+@contextlib.contextmanager
+def _lock_mirror(mirror_dir: Path) -> Iterator[None]:
+    """Hold the lock of a mirror, against other threads and processes.
+
+    Builds running in parallel (dashboard, update-all) share the mirrors.
+    """
+    with _MIRROR_LOCKS_LOCK:
+        lock = _MIRROR_LOCKS[mirror_dir]
+    mirror_dir.mkdir(parents=True, exist_ok=True)
+    with lock, open(mirror_dir / MIRROR_LOCK_FILE, "a+b") as lock_file:
+        if sys.platform == "win32":
+            import msvcrt  # pylint: disable=import-error
+
+            while True:
+                try:
+                    # Retries for 10 seconds before it gives up
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _is_worktree(repo_dir: Path) -> bool:
+    """Return if repo_dir is a worktree whose mirror still exists."""
+    git_file = repo_dir / ".git"
+    if not git_file.is_file():
+        return False
+    git_dir = git_file.read_text(encoding="utf-8").partition("gitdir:")[2].strip()
+    return Path(git_dir).is_dir()
+
+
+def _remove_readonly(func, path, _) -> None:
+    # The pack files of a clone are read-only, Windows refuses to delete them
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
+
+def _remove_checkout(repo_dir: Path, key: str) -> None:
+    """Remove a clone made before the mirrors were used, or a worktree whose
+    mirror was removed.
+
+    A clone with local changes or stashes is moved aside instead.
+    """
+    if (repo_dir / ".git").is_dir():
+        try:
+            changes = run_git_command(["git", "status", "--porcelain"], str(repo_dir))
+            changes += run_git_command(["git", "stash", "list"], str(repo_dir))
+        except cv.Invalid:
+            changes = ""
+        if changes:
+            backup_dir = repo_dir.with_name(f"{repo_dir.name}.old")
+            _LOGGER.warning(
+                "Moving %s with local changes to %s, it is replaced by a new checkout",
+                repo_dir,
+                backup_dir,
+            )
+            if backup_dir.exists():
+                _rmtree(backup_dir)
+            repo_dir.rename(backup_dir)
+            return
+    _LOGGER.info("Replacing checkout of %s", key)
+    _rmtree(repo_dir)
+
+
+def _rmtree(path: Path) -> None:
+    if sys.version_info >= (3, 12):
+        # pylint: disable-next=unexpected-keyword-arg
+        shutil.rmtree(path, onexc=_remove_readonly)
+    else:
+        shutil.rmtree(path, onerror=_remove_readonly)
+
+
+def _ls_remote_sha(url: str, ref: str | None) -> str | None:
+    """Return the commit ref points to on the remote, None if it's not known.
+
+    Refs are looked up in the order the remote resolves them when fetching.
+    """
+    name = ref or "HEAD"
+    try:
+        output = run_git_command(["git", "ls-remote", "--", url, name, f"{name}^{{}}"])
+    except cv.Invalid as err:
+        _LOGGER.debug("Could not list remote refs: %s", err)
+        return None
+    shas = {}
+    for line in output.splitlines():
+        sha, _, remote_ref = line.partition("\t")
+        shas[remote_ref] = sha
+    for remote_ref in (name, f"refs/{name}", f"refs/tags/{name}", f"refs/heads/{name}"):
+        if remote_ref in shas:
+            # Annotated tags are followed by the commit they point to
+            return shas.get(f"{remote_ref}^{{}}", shas[remote_ref])
+    return None
+
+
+def _has_commit(mirror_dir: Path, sha: str) -> bool:
+    try:
+        run_git_command(["git", "cat-file", "-e", f"{sha}^{{commit}}"], str(mirror_dir))
+    except cv.Invalid:
+        return False
+    return True
+
+
+def _fetch(mirror_dir: Path, url: str, ref: str | None) -> str:
+    """Fetch ref into the mirror and return the commit it points to."""
+    # A ref per fetched ref keeps its objects from being pruned
+    h = hashlib.new("sha256")
+    h.update((ref or "HEAD").encode())
+    local_ref = f"refs/esphome/{h.hexdigest()[:8]}"
+    run_git_command(
+        [
+            "git",
+            "fetch",
+            "--depth=1",
+            "--",
+            url,
+            f"+{ref or 'HEAD'}:{local_ref}",
+        ],
+        str(mirror_dir),
+    )
+    return run_git_command(
+        ["git", "rev-parse", f"{local_ref}^{{commit}}"], str(mirror_dir)
+    )
+
+
+def _clone_or_update(
     *,
     url: str,
     ref: str = None,
-    refresh: Optional[TimePeriodSeconds],
+    refresh: TimePeriodSeconds | None,
     domain: str,
     username: str = None,
     password: str = None,
-    submodules: Optional[list[str]] = None,
-) -> tuple[Path, Optional[Callable[[], None]]]:
+    submodules: list[str] | None = None,
+) -> tuple[Path, Callable[[], None] | None]:
+    """Check out ref of a repository in its own worktree.
+
+    All refs of a repository share one bare mirror, so their objects are
+    only fetched and stored once. Before fetching, the commit the ref points
+    to is looked up with ls-remote; the fetch is skipped if the checkout has it
+    already.
+    """
     key = f"{url}@{ref}"
+    repo_dir = _compute_destination_path(key, domain)
+    mirror_dir = _compute_mirror_path(url)
+    origin_url = url
 
     if username is not None and password is not None:
+        # Only used on the command line, so the credentials aren't stored
         url = url.replace(
             "://", f"://{urllib.parse.quote(username)}:{urllib.parse.quote(password)}@"
         )
 
-    repo_dir = _compute_destination_path(key, domain)
-    if not repo_dir.is_dir():
-        _LOGGER.info("Cloning %s", key)
-        _LOGGER.debug("Location: %s", repo_dir)
-        cmd = ["git", "clone", "--depth=1"]
-        cmd += ["--", url, str(repo_dir)]
-        run_git_command(cmd)
-
-        if ref is not None:
-            # We need to fetch the PR branch first, otherwise git will complain
-            # about missing objects
-            _LOGGER.info("Fetching %s", ref)
-            run_git_command(["git", "fetch", "--", "origin", ref], str(repo_dir))
-            run_git_command(["git", "reset", "--hard", "FETCH_HEAD"], str(repo_dir))
-
-        if submodules is not None:
-            _LOGGER.info(
-                "Initialising submodules (%s) for %s", ", ".join(submodules), key
-            )
+    is_worktree = _is_worktree(repo_dir)
+    if is_worktree and refresh is not None:
+        file_timestamp = _fetch_timestamp_path(repo_dir)
+        age = datetime.now() - datetime.fromtimestamp(file_timestamp.stat().st_mtime)
+        if age.total_seconds() <= refresh.total_seconds:
+            return repo_dir, None
+
+    with _lock_mirror(mirror_dir):
+        if not (mirror_dir / "HEAD").is_file():
+            _LOGGER.debug("Creating mirror of %s in %s", key, mirror_dir)
+            run_git_command(["git", "init", "--bare", "--quiet", str(mirror_dir)])
+            # Relative submodule URLs are resolved against the origin
             run_git_command(
-                ["git", "submodule", "update", "--init"] + submodules, str(repo_dir)
+                ["git", "config", "remote.origin.url", origin_url], str(mirror_dir)
             )
 
-    else:
-        # Check refresh needed
-        file_timestamp = Path(repo_dir / ".git" / "FETCH_HEAD")
-        # On first clone, FETCH_HEAD does not exists
-        if not file_timestamp.exists():
-            file_timestamp = Path(repo_dir / ".git" / "HEAD")
-        age = datetime.now() - datetime.fromtimestamp(file_timestamp.stat().st_mtime)
-        if refresh is None or age.total_seconds() > refresh.total_seconds:
+        old_sha = None
+        if is_worktree:
             old_sha = run_git_command(["git", "rev-parse", "HEAD"], str(repo_dir))
+        if ref is not None and _SHA_RE.fullmatch(ref) and _has_commit(mirror_dir, ref):
+            sha = ref
+        else:
+            sha = _ls_remote_sha(url, ref)
+            if sha is None or not _has_commit(mirror_dir, sha):
+                _LOGGER.info("Fetching %s", key)
+                sha = _fetch(mirror_dir, url, ref)
+
+        if not is_worktree:
+            if repo_dir.exists():
+                _remove_checkout(repo_dir, key)
+            _LOGGER.info("Checking out %s", key)
+            _LOGGER.debug("Location: %s", repo_dir)
+            run_git_command(["git", "worktree", "prune"], str(mirror_dir))
+            run_git_command(
+                ["git", "worktree", "add", "--detach", str(repo_dir), sha],
+                str(mirror_dir),
+            )
+        elif sha != old_sha:
             _LOGGER.info("Updating %s", key)
             _LOGGER.debug("Location: %s", repo_dir)
             # Stash local changes (if any)
             run_git_command(
                 ["git", "stash", "push", "--include-untracked"], str(repo_dir)
             )
-            # Fetch remote ref
-            cmd = ["git", "fetch", "--", "origin"]
-            if ref is not None:
-                cmd.append(ref)
-            run_git_command(cmd, str(repo_dir))
-            # Hard reset to FETCH_HEAD (short-lived git ref corresponding to most recent fetch)
-            run_git_command(["git", "reset", "--hard", "FETCH_HEAD"], str(repo_dir))
-
-            if submodules is not None:
-                _LOGGER.info(
-                    "Updating submodules (%s) for %s", ", ".join(submodules), key
-                )
-                run_git_command(
-                    ["git", "submodule", "update", "--init"] + submodules, str(repo_dir)
-                )
-
-            def revert():
-                _LOGGER.info("Reverting changes to %s -> %s", key, old_sha)
-                run_git_command(["git", "reset", "--hard", old_sha], str(repo_dir))
-
-            return repo_dir, revert
-
-    return repo_dir, None
+            run_git_command(["git", "reset", "--hard", sha], str(repo_dir))
+        else:
+            _LOGGER.debug("%s is up to date", key)
+
+        if submodules is not None and sha != old_sha:
+            # Also under the lock, the submodules are registered in the shared config
+            _LOGGER.info("Updating submodules (%s) for %s", ", ".join(submodules), key)
+            run_git_command(
+                ["git", "submodule", "update", "--init"] + submodules, str(repo_dir)
+            )
+        _fetch_timestamp_path(repo_dir).touch()
+
+    if old_sha is None or sha == old_sha:
+        return repo_dir, None
+
+    def revert():
+        _LOGGER.info("Reverting changes to %s -> %s", key, old_sha)
+        run_git_command(["git", "reset", "--hard", old_sha], str(repo_dir))
+
+    return repo_dir, revert
+
+
+def clone_or_update(
+    *,
+    url: str,
+    ref: str = None,
+    refresh: TimePeriodSeconds | None,
+    domain: str,
+    username: str = None,
+    password: str = None,
+    submodules: list[str] | None = None,
+) -> tuple[Path, Callable[[], None] | None]:
+    repo_dir = _compute_destination_path(f"{url}@{ref}", domain)
+    result = _PREFETCHED.get(repo_dir)
+    if result is None:
+        result = _clone_or_update(
+            url=url,
+            ref=ref,
+            refresh=refresh,
+            domain=domain,
+            username=username,
+            password=password,
+            submodules=submodules,
+        )
+    elif isinstance(result, cv.Invalid):
+        raise cv.Invalid(result.msg) from result
+    _note_checkout(repo_dir, refresh)
+    return result
+
+
+def prefetch(
+    *,
+    url: str,
+    ref: str = None,
+    refresh: TimePeriodSeconds | None,
+    domain: str,
+    username: str = None,
+    password: str = None,
+) -> Path | None:
+    """Clone or update a repository ahead of the clone_or_update call for it.
+
+    The outcome is kept until clear_prefetched() is called, clone_or_update
+    returns it (or raises the error) instead of updating the repository again.
+    Safe to call from multiple threads for different repositories.
+    """
+    repo_dir = _compute_destination_path(f"{url}@{ref}", domain)
+    try:
+        _PREFETCHED[repo_dir] = _clone_or_update(
+            url=url,
+            ref=ref,
+            refresh=refresh,
+            domain=domain,
+            username=username,
+            password=password,
+        )
+    except cv.Invalid as err:
+        _PREFETCHED[repo_dir] = err
+        return None
+    return repo_dir
+
+
+def clear_prefetched() -> None:
+    """Forget the repositories fetched by prefetch()."""
+    _PREFETCHED.clear()
 
 
 GIT_DOMAINS = {
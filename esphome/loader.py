@@ -96,6 +96,17 @@ class ComponentManifest:
         """
         return getattr(self.module, "FINAL_VALIDATE_SCHEMA", None)
 
+    @property
+    def prefetch_files(self) -> Optional[Callable[[ConfigType], list[Callable]]]:
+        """Components that download files during validation can declare a
+        `prefetch_files` function. It gets the config before validation and returns
+        the functions that download its files, which are all run concurrently before
+        the schemas are validated.
+
+        Errors are ignored, the schema validation downloads the files that failed.
+        """
+        return getattr(self.module, "prefetch_files", None)
+
     @property
     def resources(self) -> list[FileResource]:
         """Return a list of all file resources defined in the package of this component.
@@ -123,7 +134,8 @@ class ComponentMetaFinder(importlib.abc.MetaPathFinder):
     def __init__(
         self, components_path: Path, allowed_components: Optional[list[str]] = None
     ) -> None:
-        self._allowed_components = allowed_components
+        self.components_path = components_path
+        self.allowed_components = allowed_components
         self._finders = []
         for hook in sys.path_hooks:
             try:
@@ -142,8 +154,8 @@ class ComponentMetaFinder(importlib.abc.MetaPathFinder):
             return None
         component = parts[2]
         if (
-            self._allowed_components is not None
-            and component not in self._allowed_components
+            self.allowed_components is not None
+            and component not in self.allowed_components
         ):
             return None
 
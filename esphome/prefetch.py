@@ -0,0 +1,170 @@
+"""Fetch the remote sources of a configuration concurrently.
+
+Validation clones git packages and external components and downloads remote
+files one at a time, as it gets to them, so a configuration with a handful of
+remote sources spends most of its validation waiting for the network. The
+functions here find those sources in the configuration up front and fetch them
+on a bounded pool of threads. The validation steps then use the checkouts and
+files that were fetched (see ``git.prefetch`` and
+``external_files.download_content``) instead of fetching them again.
+
+Prefetching is best effort: sources that can't be found or fetched here are
+left to the validation steps, which report the errors.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import importlib.util
+import logging
+from pathlib import Path
+from typing import Any
+
+from esphome import external_files, git, loader, yaml_util
+import esphome.config_validation as cv
+from esphome.const import (
+    CONF_EXTERNAL_COMPONENTS,
+    CONF_FILE,
+    CONF_FILES,
+    CONF_PACKAGES,
+    CONF_PASSWORD,
+    CONF_REF,
+    CONF_REFRESH,
+    CONF_SOURCE,
+    CONF_TYPE,
+    CONF_URL,
+    CONF_USERNAME,
+    TYPE_GIT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of sources that are fetched at the same time
+MAX_WORKERS = 8
+
+
+def _has_substitutions(conf: dict) -> bool:
+    return any(isinstance(value, str) and "$" in value for value in conf.values())
+
+
+def _git_source(conf: dict, domain: str, refresh) -> dict[str, Any] | None:
+    if _has_substitutions(conf):
+        # Fetching the unsubstituted URL or ref would be wasted
+        return None
+    return {
+        "url": conf[CONF_URL],
+        "ref": conf.get(CONF_REF),
+        "refresh": refresh,
+        "domain": domain,
+        "username": conf.get(CONF_USERNAME),
+        "password": conf.get(CONF_PASSWORD),
+    }
+
+
+def _iter_git_sources(config: dict) -> Iterator[tuple[dict[str, Any], list[str]]]:
+    """Yield the git packages and external components of a config.
+
+    Each source is yielded with the files that are loaded from it.
+    """
+    from esphome.components import external_components, packages
+
+    package_configs = config.get(CONF_PACKAGES)
+    if isinstance(package_configs, dict):
+        for package_config in package_configs.values():
+            if isinstance(package_config, dict) and CONF_URL not in package_config:
+                yield from _iter_git_sources(package_config)
+                continue
+            try:
+                if isinstance(package_config, str):
+                    conf = packages.validate_source_shorthand(package_config)
+                else:
+                    conf = packages.BASE_SCHEMA(package_config)
+            except (cv.Invalid, ValueError):
+                continue
+            files = [conf[CONF_FILE]] if CONF_FILE in conf else conf[CONF_FILES]
+            if source := _git_source(conf, packages.DOMAIN, conf[CONF_REFRESH]):
+                yield source, files
+
+    components = config.get(CONF_EXTERNAL_COMPONENTS)
+    if components is None:
+        return
+    for component in components if isinstance(components, list) else [components]:
+        try:
+            (conf,) = external_components.CONFIG_SCHEMA(component)
+        except (cv.Invalid, ValueError):
+            continue
+        if conf[CONF_SOURCE][CONF_TYPE] == TYPE_GIT and (
+            source := _git_source(
+                conf[CONF_SOURCE], external_components.DOMAIN, conf[CONF_REFRESH]
+            )
+        ):
+            yield source, []
+
+
+def _run(func: Callable[..., Any], *args: Any) -> Any:
+    try:
+        return func(*args)
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Prefetching failed, continuing without: %s", err)
+        return None
+
+
+def _fetch_git_source(source: dict[str, Any], files: list[str]) -> list[dict]:
+    """Fetch a git source and return the configs of the files loaded from it."""
+    repo_dir: Path | None = git.prefetch(**source)
+    if repo_dir is None:
+        return []
+    # Keep the secrets known for the config that is being validated
+    configs = (_run(yaml_util.load_yaml, repo_dir / file, False) for file in files)
+    return [conf for conf in configs if isinstance(conf, dict)]
+
+
+def prefetch_sources(config: dict) -> None:
+    """Fetch the git packages and external components of a config.
+
+    The files loaded from fetched packages are searched for the sources they
+    include in turn. This also resets what was fetched for the previous config.
+    """
+    git.clear_prefetched()
+    external_files.clear_checked()
+
+    fetched: set[tuple[str, str, str | None]] = set()
+    pending: set[Future] = set()
+    with ThreadPoolExecutor(MAX_WORKERS, thread_name_prefix="prefetch") as executor:
+
+        def submit(conf: dict) -> None:
+            for source, files in _run(list, _iter_git_sources(conf)) or ():
+                key = (source["domain"], source["url"], source["ref"])
+                if key not in fetched:
+                    fetched.add(key)
+                    pending.add(executor.submit(_run, _fetch_git_source, source, files))
+
+        submit(config)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for conf in future.result() or ():
+                    submit(conf)
+
+
+def _iter_downloads(config: dict) -> Iterator[Callable[[], Any]]:
+    for domain, conf in config.items():
+        if (
+            not domain.isidentifier()
+            or importlib.util.find_spec(f"esphome.components.{domain}") is None
+        ):
+            continue
+        component = loader.get_component(domain)
+        if component is not None and component.prefetch_files is not None:
+            yield from _run(component.prefetch_files, conf) or ()
+
+
+def prefetch_files(config: dict) -> None:
+    """Download the remote files of the components in a config.
+
+    Needs the packages, substitutions and external components to be applied.
+    """
+    with ThreadPoolExecutor(MAX_WORKERS, thread_name_prefix="prefetch") as executor:
+        for download in _iter_downloads(config):
+            executor.submit(_run, download)
@@ -5,7 +5,7 @@ import json
 import os
 from typing import Any
 
-from esphome.config import Config, _format_vol_invalid, validate_config
+from esphome.config import Config, SchemaCache, _format_vol_invalid, validate_config
 import esphome.config_validation as cv
 from esphome.core import CORE, DocumentRange
 from esphome.yaml_util import parse_yaml
@@ -79,6 +79,9 @@ def _print_file_read_event(path: str) -> None:
 
 
 def read_config(args):
+    # The process validates the config on every change in the editor, keep
+    # the validated domains that didn't change between validations
+    schema_cache = SchemaCache()
     while True:
         CORE.reset()
         data = json.loads(input())
@@ -100,7 +103,7 @@ def read_config(args):
         vs = VSCodeResult()
         try:
             config = parse_yaml(file_name, StringIO(raw_yaml))
-            res = validate_config(config, command_line_substitutions)
+            res = validate_config(config, command_line_substitutions, schema_cache)
         except Exception as err:  # pylint: disable=broad-except
             vs.add_yaml_error(str(err))
         else:
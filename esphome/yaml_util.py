@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import copy
 import fnmatch
 import functools
+import hashlib
 import inspect
 from io import TextIOWrapper
 import logging
 import math
 import os
+from pathlib import Path
+import pickle
+import threading
+import time
 from typing import Any
 import uuid
 
@@ -19,7 +25,7 @@ try:
 except ImportError:
     FastestAvailableSafeLoader = PurePythonLoader
 
-from esphome import core
+from esphome import config_cache, const, core
 from esphome.config_helpers import Extend, Remove
 from esphome.core import (
     CORE,
@@ -30,7 +36,7 @@ from esphome.core import (
     MACAddress,
     TimePeriod,
 )
-from esphome.helpers import add_class_to_obj
+from esphome.helpers import add_class_to_obj, get_bool_env, write_file
 from esphome.util import OrderedDict, filter_yaml_files
 
 _LOGGER = logging.getLogger(__name__)
@@ -43,6 +49,131 @@ _SECRET_CACHE = {}
 _SECRET_VALUES = {}
 
 
+# Files at least this large are kept in the on-disk node cache when enabled
+NODE_CACHE_MIN_SIZE = 64 * 1024
+NODE_CACHE_VERSION = 1
+# Files modified this recently are not cached, a change within the resolution
+# of the file system timestamps could otherwise go unnoticed
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class _ParsedFile:
+    """A parsed YAML file and the files it was parsed from."""
+
+    __slots__ = ("data", "files", "secrets", "config_dir", "cacheable")
+
+    def __init__(self) -> None:
+        self.data: Any = None
+        # Modification time, size and inode of the file and every file it includes
+        self.files: dict[str, tuple[int, int, int] | None] = {}
+        # Secret values used by the file and its includes, by value
+        self.secrets: dict[str, str] = {}
+        self.config_dir = os.path.dirname(CORE.config_path or "")
+        self.cacheable = True
+
+    def is_valid(self) -> bool:
+        """Return if the file and its includes are unchanged."""
+        return self.config_dir == os.path.dirname(CORE.config_path or "") and all(
+            _stat_key(path) == key for path, key in self.files.items()
+        )
+
+
+# Parsed files by path, reused while they and their includes are unchanged
+_PARSE_CACHE: dict[str, _ParsedFile] = {}
+
+
+class _ParsingStack(threading.local):
+    """The files being parsed, innermost last.
+
+    Package files are loaded from several threads while prefetching, each one
+    keeps its own stack so includes are attributed to the right file.
+    """
+
+    def __init__(self) -> None:
+        self.files: list[_ParsedFile] = []
+
+
+_PARSING = _ParsingStack()
+
+
+def _stat_key(path: str) -> tuple[int, int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _node_cache_path(fname: str) -> Path | None:
+    if not get_bool_env("ESPHOME_YAML_NODE_CACHE") or CORE.config_path is None:
+        return None
+    key = hashlib.sha256(os.path.abspath(fname).encode()).hexdigest()[:16]
+    return Path(CORE.data_dir) / "yaml_cache" / f"{key}.pickle"
+
+
+def _load_node_cache(fname: str) -> _ParsedFile | None:
+    """Load a file parsed by an earlier process, if it is unchanged."""
+    if (path := _node_cache_path(fname)) is None:
+        return None
+    try:
+        with open(path, "rb") as f_handle:
+            header = pickle.load(f_handle)
+            if header["version"] != (NODE_CACHE_VERSION, const.__version__):
+                return None
+            parsed = _ParsedFile()
+            parsed.files = header["files"]
+            parsed.secrets = header["secrets"]
+            parsed.config_dir = header["config_dir"]
+            if not parsed.is_valid():
+                return None
+            parsed.data = pickle.load(f_handle)
+    except FileNotFoundError:
+        return None
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Could not read YAML node cache %s: %s", path, err)
+        return None
+    return parsed
+
+
+def _save_node_cache(fname: str, parsed: _ParsedFile) -> None:
+    """Store a large parsed file for later processes."""
+    if (path := _node_cache_path(fname)) is None:
+        return
+    header = {
+        "version": (NODE_CACHE_VERSION, const.__version__),
+        "files": parsed.files,
+        "secrets": parsed.secrets,
+        "config_dir": parsed.config_dir,
+    }
+    try:
+        write_file(path, pickle.dumps(header) + config_cache.dumps(parsed.data))
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Could not write YAML node cache %s: %s", path, err)
+
+
+def _note_uncacheable() -> None:
+    """Mark the files being parsed as depending on more than their includes."""
+    for parsed in _PARSING.files:
+        parsed.cacheable = False
+
+
+def _copy_tree(value: Any) -> Any:
+    """Copy the containers and the mutable values of a parsed YAML tree."""
+    if isinstance(value, dict):
+        copied = copy.copy(value)
+        copied.clear()
+        for key, item in value.items():
+            copied[key] = _copy_tree(item)
+        return copied
+    if isinstance(value, list):
+        copied = copy.copy(value)
+        copied[:] = [_copy_tree(item) for item in value]
+        return copied
+    if isinstance(value, (Lambda, Extend, Remove)):
+        return copy.copy(value)
+    return value
+
+
 class ESPHomeDataBase:
     @property
     def esp_range(self):
@@ -233,6 +364,8 @@ class ESPHomeLoaderMixin:
     @_add_data_ref
     def construct_env_var(self, node):
         args = node.value.split()
+        config_cache.note_env_var(args[0])
+        _note_uncacheable()
         # Check for a default value
         if len(args) > 1:
             return os.getenv(args[0], " ".join(args[1:]))
@@ -252,14 +385,14 @@ class ESPHomeLoaderMixin:
     @_add_data_ref
     def construct_secret(self, node):
         try:
-            secrets = _load_yaml_internal(self._rel_path(SECRET_YAML))
+            secrets = _load_yaml_cached(self._rel_path(SECRET_YAML)).data
         except EsphomeError as e:
             if self.name == CORE.config_path:
                 raise e
             try:
                 main_config_dir = os.path.dirname(CORE.config_path)
                 main_secret_yml = os.path.join(main_config_dir, SECRET_YAML)
-                secrets = _load_yaml_internal(main_secret_yml)
+                secrets = _load_yaml_cached(main_secret_yml).data
             except EsphomeError as er:
                 raise EsphomeError(f"{e}\n{er}") from er
 
@@ -267,8 +400,10 @@ class ESPHomeLoaderMixin:
             raise yaml.MarkedYAMLError(
                 f"Secret '{node.value}' not defined", node.start_mark
             )
-        val = secrets[node.value]
+        val = _copy_tree(secrets[node.value])
         _SECRET_VALUES[str(val)] = node.value
+        for parsed in _PARSING.files:
+            parsed.secrets[str(val)] = node.value
         return val
 
     @_add_data_ref
@@ -434,6 +569,50 @@ def parse_yaml(file_name: str, file_handle: TextIOWrapper) -> Any:
 
 def _load_yaml_internal(fname: str) -> Any:
     """Load a YAML file."""
+    return _copy_tree(_load_yaml_cached(fname).data)
+
+
+def _load_yaml_cached(fname: str) -> _ParsedFile:
+    """Load a YAML file, reusing the result while it is unchanged.
+
+    The returned data is shared, callers must copy what they hand out.
+    """
+    config_cache.note_file(fname)
+    parsed = _PARSE_CACHE.get(fname)
+    if parsed is not None and parsed.is_valid():
+        for path in parsed.files:
+            config_cache.note_file(path)
+        _SECRET_VALUES.update(parsed.secrets)
+    elif (parsed := _load_node_cache(fname)) is not None:
+        _PARSE_CACHE[fname] = parsed
+        for path in parsed.files:
+            config_cache.note_file(path)
+        _SECRET_VALUES.update(parsed.secrets)
+    else:
+        parsed = _ParsedFile()
+        stat_key = parsed.files[fname] = _stat_key(fname)
+        if stat_key is None or time.time_ns() - stat_key[0] < RACY_WINDOW_NS:
+            parsed.cacheable = False
+        _PARSING.files.append(parsed)
+        try:
+            parsed.data = _parse_file(fname)
+        finally:
+            _PARSING.files.pop()
+        if parsed.cacheable:
+            _PARSE_CACHE[fname] = parsed
+            if stat_key is not None and stat_key[1] >= NODE_CACHE_MIN_SIZE:
+                _save_node_cache(fname, parsed)
+        else:
+            _PARSE_CACHE.pop(fname, None)
+    if _PARSING.files:
+        parent = _PARSING.files[-1]
+        parent.files.update(parsed.files)
+        parent.secrets.update(parsed.secrets)
+        parent.cacheable &= parsed.cacheable
+    return parsed
+
+
+def _parse_file(fname: str) -> Any:
     try:
         with open(fname, encoding="utf-8") as f_handle:
             return parse_yaml(fname, f_handle)
@@ -474,6 +653,8 @@ def _is_file_valid(name):
 
 def _find_files(directory, pattern):
     """Recursively load files in a directory."""
+    config_cache.note_directory(directory, pattern)
+    _note_uncacheable()
     for root, dirs, files in os.walk(directory, topdown=True):
         dirs[:] = [d for d in dirs if _is_file_valid(d)]
         for basename in files:
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Compare the indexed ID pass with the old linear scans on a synthetic config."""
+
+import argparse
+import random
+import sys
+import time
+
+from esphome.config import Config, IDPassValidationStep, iter_ids
+from esphome.core import CORE, ID
+from esphome.cpp_generator import MockObjClass
+from esphome.cpp_types import Component, EntityBase, esphome_ns
+
+bench_ns = esphome_ns.namespace("bench")
+Hub = bench_ns.class_("Hub", Component)
+Sensor = bench_ns.class_("Sensor", EntityBase)
+HubSensor = bench_ns.class_("HubSensor", Sensor, Component)
+Output = bench_ns.class_("Output")
+
+
+def legacy_id_pass(result):
+    searching_ids = []
+    for id, path in iter_ids(result):
+        if id.is_declaration:
+            if id.id is not None:
+                match = next((v for v in result.declare_ids if v[0].id == id.id), None)
+                if match is not None:
+                    result.add_str_error(f"ID {id.id} redefined!", path)
+                    continue
+            result.declare_ids.append((id, path))
+        else:
+            searching_ids.append((id, path))
+
+    for id, _ in result.declare_ids:
+        id.resolve([v[0].id for v in result.declare_ids])
+        if isinstance(id.type, MockObjClass) and id.type.inherits_from(Component):
+            CORE.component_ids.add(id.id)
+
+    for id, path in searching_ids:
+        if id.id is not None:
+            match = next((v[0] for v in result.declare_ids if v[0].id == id.id), None)
+            if match is None or not match.is_manual:
+                result.add_str_error(f"Couldn't find ID '{id.id}'", path)
+            continue
+        if id.type is not None:
+            matches = [
+                v[0]
+                for v in result.declare_ids
+                if isinstance(v[0].type, MockObjClass)
+                and v[0].type.inherits_from(id.type)
+            ]
+            if len(matches) == 1:
+                id.id = matches[0].id
+
+    # Final validation looks up the declaration of the referenced IDs
+    for id, _ in searching_ids:
+        result.get_path_for_id(id)
+
+
+def legacy_get_path_for_id(result, id):
+    for declared_id, path in result.declare_ids:
+        if declared_id.id == str(id):
+            return path
+    raise KeyError(id)
+
+
+def indexed_id_pass(result):
+    IDPassValidationStep().run(result)
+    for id, path in iter_ids(result):
+        if not id.is_declaration:
+            result.get_path_for_id(id)
+
+
+def make_config(entities):
+    rnd = random.Random(0)
+    config = {"hub": [{"id": ID(None, True, Hub)}]}
+    sensors = []
+    for i in range(entities):
+        manual = i % 4 == 0
+        sensor = {
+            "id": ID(f"sensor_{i}" if manual else None, True, HubSensor),
+            "hub_id": ID(None, False, Hub),
+        }
+        if manual and i:
+            sensor["source_id"] = ID(f"sensor_{rnd.randrange(0, i, 4)}", False, Sensor)
+        sensor["output"] = {"id": ID(None, True, Output)}
+        sensors.append(sensor)
+    config["sensor"] = sensors
+    return config
+
+
+def run(func, entities):
+    CORE.reset()
+    result = Config()
+    result.update(make_config(entities))
+    if func is legacy_id_pass:
+        result.get_path_for_id = lambda id: legacy_get_path_for_id(result, id)
+    start = time.perf_counter()
+    func(result)
+    elapsed = time.perf_counter() - start
+    ids = [str(id) for id, _ in iter_ids(result)]
+    return (ids, len(result.errors), sorted(CORE.component_ids)), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=5000)
+    args = parser.parse_args()
+
+    expected, old_time = run(legacy_id_pass, args.entities)
+    actual, new_time = run(indexed_id_pass, args.entities)
+    identical = expected == actual
+    print(f"{args.entities} entities, {len(actual[0])} IDs")
+    print(f"{'Old':>10} {'New':>10} {'Speedup':>8}")
+    print(
+        f"{old_time * 1000:>8.1f}ms {new_time * 1000:>8.1f}ms "
+        f"{old_time / new_time:>7.0f}x{'' if identical else '  OUTPUT DIFFERS'}"
+    )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
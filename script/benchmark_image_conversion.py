@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Compare the image component's pixel packing with the old per-pixel loops."""
+
+import argparse
+import random
+import sys
+import time
+
+from PIL import Image
+
+from esphome.components import image
+
+
+def legacy_grayscale(img, transparent):
+    data = [0 for _ in range(img.width * img.height)]
+    pos = 0
+    for g, a in img.getdata():
+        if transparent:
+            if g == 1:
+                g = 0
+            if a < 0x80:
+                g = 1
+        data[pos] = g
+        pos += 1
+    return bytes(data)
+
+
+def legacy_rgba(img):
+    data = [0 for _ in range(img.width * img.height * 4)]
+    pos = 0
+    for r, g, b, a in img.getdata():
+        data[pos : pos + 4] = r, g, b, a
+        pos += 4
+    return bytes(data)
+
+
+def legacy_rgb24(img, transparent):
+    data = [0 for _ in range(img.width * img.height * 3)]
+    pos = 0
+    for r, g, b, a in img.getdata():
+        if transparent:
+            if r == 0 and g == 0 and b == 1:
+                b = 0
+            if a < 0x80:
+                r, g, b = 0, 0, 1
+        data[pos : pos + 3] = r, g, b
+        pos += 3
+    return bytes(data)
+
+
+def legacy_rgb565(img, transparent):
+    data = [0 for _ in range(img.width * img.height * 2)]
+    pos = 0
+    for r, g, b, a in img.getdata():
+        rgb = ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
+        if transparent:
+            if rgb == 0x0020:
+                rgb = 0
+            if a < 0x80:
+                rgb = 0x0020
+        data[pos : pos + 2] = rgb >> 8, rgb & 0xFF
+        pos += 2
+    return bytes(data)
+
+
+def legacy_binary(img, alpha):
+    width, height = img.size
+    width8 = ((width + 7) // 8) * 8
+    data = [0 for _ in range(height * width8 // 8)]
+    for y in range(height):
+        for x in range(width):
+            if alpha is not None:
+                if not alpha.getpixel((x, y)):
+                    continue
+            elif img.getpixel((x, y)):
+                continue
+            pos = x + y * width8
+            data[pos // 8] |= 0x80 >> (pos % 8)
+    return bytes(data)
+
+
+def make_image(width, height):
+    rnd = random.Random(0)
+    img = Image.new("RGBA", (width, height))
+    img.putdata(
+        [
+            tuple(rnd.randrange(256) for _ in range(3)) + (rnd.choice((0, 255)),)
+            for _ in range(width * height)
+        ]
+    )
+    return img
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=768)
+    args = parser.parse_args()
+
+    src = make_image(args.width, args.height)
+    gray = src.convert("LA")
+    mono = src.convert("1")
+    alpha = src.split()[-1]
+    cases = [
+        ("GRAYSCALE", legacy_grayscale, image.pack_grayscale, (gray, True)),
+        ("RGBA", legacy_rgba, image.pack_rgba, (src,)),
+        ("RGB24", legacy_rgb24, image.pack_rgb24, (src, True)),
+        ("RGB565", legacy_rgb565, image.pack_rgb565, (src, True)),
+        ("BINARY", legacy_binary, image.pack_binary, (mono, None)),
+        ("TRANSPARENT_BINARY", legacy_binary, image.pack_binary, (mono, alpha)),
+    ]
+
+    print(f"Image size {args.width}x{args.height}")
+    print(f"{'Type':<20} {'Old':>10} {'New':>10} {'Speedup':>8}")
+    failed = False
+    for name, old, new, func_args in cases:
+        expected, old_time = timed(old, *func_args)
+        actual, new_time = timed(new, *func_args)
+        identical = expected == actual
+        failed |= not identical
+        print(
+            f"{name:<20} {old_time * 1000:>8.1f}ms {new_time * 1000:>8.1f}ms "
+            f"{old_time / new_time:>7.0f}x{'' if identical else '  OUTPUT DIFFERS'}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
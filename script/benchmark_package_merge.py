@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Compare the one pass package merge with merging the packages one by one."""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from esphome.components import packages
+from esphome.config_helpers import Extend, Remove
+from esphome.const import CONF_ID, CONF_PACKAGES
+
+
+def legacy_merge_config(full_old, full_new):
+    def merge(old, new):
+        if isinstance(new, dict):
+            if not isinstance(old, dict):
+                return new
+            res = old.copy()
+            for k, v in new.items():
+                if isinstance(v, Remove) and k in old:
+                    del res[k]
+                else:
+                    res[k] = merge(old[k], v) if k in old else v
+            return res
+        if isinstance(new, list):
+            if not isinstance(old, list):
+                return new
+            res = old.copy()
+            ids = {
+                v_id: i
+                for i, v in enumerate(res)
+                if isinstance(v, dict)
+                and (v_id := v.get(CONF_ID))
+                and isinstance(v_id, str)
+            }
+            extend_ids = {
+                v_id.value: i
+                for i, v in enumerate(res)
+                if isinstance(v, dict)
+                and (v_id := v.get(CONF_ID))
+                and isinstance(v_id, Extend)
+            }
+
+            ids_to_delete = []
+            for v in new:
+                if isinstance(v, dict) and (new_id := v.get(CONF_ID)):
+                    if isinstance(new_id, Extend):
+                        new_id = new_id.value
+                        if new_id in ids:
+                            v[CONF_ID] = new_id
+                            res[ids[new_id]] = merge(res[ids[new_id]], v)
+                            continue
+                    elif isinstance(new_id, Remove):
+                        new_id = new_id.value
+                        if new_id in ids:
+                            ids_to_delete.append(ids[new_id])
+                            continue
+                    elif new_id in extend_ids:
+                        extend_res = res[extend_ids[new_id]]
+                        extend_res[CONF_ID] = new_id
+                        new_v = merge(v, extend_res)
+                        res[extend_ids[new_id]] = new_v
+                        continue
+                    else:
+                        ids[new_id] = len(res)
+                res.append(v)
+            res = [v for i, v in enumerate(res) if i not in ids_to_delete]
+            return res
+        if new is None:
+            return old
+
+        return new
+
+    return merge(full_old, full_new)
+
+
+def legacy_do_packages_pass(config):
+    if CONF_PACKAGES not in config:
+        return config
+    for package_config in reversed(
+        packages.CONFIG_SCHEMA(config[CONF_PACKAGES]).values()
+    ):
+        config = legacy_merge_config(legacy_do_packages_pass(package_config), config)
+    del config[CONF_PACKAGES]
+    return config
+
+
+def make_package(name, depth, width, entities):
+    """Make a package with width nested packages down to depth levels."""
+    sensors = [
+        {CONF_ID: f"{name}_sensor_{i}", "platform": "template", "name": f"{name} {i}"}
+        for i in range(entities)
+    ]
+    package = {
+        "substitutions": {f"{name}_value": name},
+        "logger": {"level": "DEBUG", "logs": {name: "INFO"}},
+        "sensor": sensors,
+        "binary_sensor": [
+            {CONF_ID: f"{name}_binary_{i}", "platform": "gpio", "pin": i}
+            for i in range(entities // 2)
+        ],
+    }
+    if depth:
+        children = {
+            f"{name}_{i}": make_package(f"{name}_{i}", depth - 1, width, entities)
+            for i in range(width)
+        }
+        package[CONF_PACKAGES] = children
+        # Extend and remove items of the packages included by this one
+        package["sensor"].append(
+            {CONF_ID: Extend(f"{name}_0_sensor_0"), "filters": [{"offset": 1}]}
+        )
+        package["sensor"].append({CONF_ID: Remove(f"{name}_{width - 1}_sensor_1")})
+    return package
+
+
+def timed(func, config):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(config)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--width", type=int, default=3)
+    parser.add_argument("--entities", type=int, default=20)
+    args = parser.parse_args()
+
+    def make_config():
+        return make_package("device", args.depth, args.width, args.entities)
+
+    expected, old_time, old_peak = timed(legacy_do_packages_pass, make_config())
+    actual, new_time, new_peak = timed(packages.do_packages_pass, make_config())
+    identical = expected == actual
+    print(
+        f"{sum(args.width**i for i in range(args.depth + 1))} packages, "
+        f"{len(actual['sensor'])} sensors"
+    )
+    print(f"{'':<8} {'Old':>10} {'New':>10} {'Ratio':>8}")
+    print(
+        f"{'Time':<8} {old_time * 1000:>8.1f}ms {new_time * 1000:>8.1f}ms "
+        f"{old_time / new_time:>7.1f}x"
+    )
+    print(
+        f"{'Memory':<8} {old_peak / 1024:>8.0f}kB {new_peak / 1024:>8.0f}kB "
+        f"{old_peak / new_peak:>7.1f}x{'' if identical else '  OUTPUT DIFFERS'}"
+    )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
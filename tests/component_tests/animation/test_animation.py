@@ -0,0 +1,133 @@
+"""Tests for the animation component's frame conversion."""
+
+import io
+import random
+
+from PIL import Image
+import pytest
+
+from esphome.components import animation
+from esphome.const import CONF_ID, CONF_RESIZE, CONF_TYPE
+from esphome.components.image import CONF_USE_TRANSPARENCY
+
+
+def _make_gif(frames=20, size=(23, 11), seed=1):
+    rnd = random.Random(seed)
+    images = []
+    for _ in range(frames):
+        img = Image.new("P", size)
+        img.putpalette([rnd.randrange(256) for _ in range(768)])
+        img.putdata([rnd.randrange(256) for _ in range(size[0] * size[1])])
+        images.append(img)
+    buf = io.BytesIO()
+    images[0].save(buf, "GIF", save_all=True, append_images=images[1:], transparency=0)
+    return buf.getvalue()
+
+
+# Reference implementations, the sequential per-pixel loops the conversion replaces
+
+
+def _ref_rgb565(image, size, transparent):
+    data = []
+    for index in range(image.n_frames):
+        image.seek(index)
+        frame = image.convert("RGBA").resize(size)
+        for r, g, b, a in frame.getdata():
+            rgb = ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
+            if transparent:
+                if rgb == 0x0020:
+                    rgb = 0
+                if a < 0x80:
+                    rgb = 0x0020
+            data += [rgb >> 8, rgb & 0xFF]
+    return bytes(data)
+
+
+def _ref_binary(image, size, transparent):
+    width, height = size
+    width8 = ((width + 7) // 8) * 8
+    data = [0] * (height * width8 // 8 * image.n_frames)
+    for index in range(image.n_frames):
+        image.seek(index)
+        alpha = image.split()[-1].resize(size)
+        has_alpha = transparent and image.split()[-1].getextrema()[0] < 0xFF
+        frame = image.convert("1", dither=Image.Dither.NONE).resize(size)
+        for x in range(width):
+            for y in range(height):
+                if has_alpha:
+                    if not alpha.getpixel((x, y)):
+                        continue
+                elif frame.getpixel((x, y)):
+                    continue
+                pos = x + y * width8 + height * width8 * index
+                data[pos // 8] |= 0x80 >> (pos % 8)
+    return bytes(data)
+
+
+@pytest.mark.parametrize("workers", (1, 3))
+@pytest.mark.parametrize(
+    "image_type, transparent, reference",
+    (
+        ("RGB565", False, _ref_rgb565),
+        ("RGB565", True, _ref_rgb565),
+        ("BINARY", False, _ref_binary),
+        ("TRANSPARENT_BINARY", True, _ref_binary),
+    ),
+)
+def test_convert_animation(monkeypatch, workers, image_type, transparent, reference):
+    monkeypatch.setattr(animation, "FRAME_WORKERS", workers)
+    contents = _make_gif()
+    config = {
+        CONF_ID: "anim",
+        CONF_TYPE: image_type,
+        CONF_RESIZE: (12, 12),
+        CONF_USE_TRANSPARENCY: transparent,
+    }
+
+    data, width, height, frames = animation.convert_animation(
+        config, "anim.gif", contents
+    )
+
+    assert (width, height, frames) == (12, 5, 20)
+    assert data == reference(Image.open(io.BytesIO(contents)), (12, 5), transparent)
+
+
+def test_deduplicate_frames():
+    frames = [b"aa", b"bb", b"aa", b"aa", b"cc", b"bb"]
+
+    data, frame_map = animation.deduplicate_frames(b"".join(frames), len(frames))
+
+    assert data == b"aabbcc"
+    assert frame_map == [0, 1, 0, 0, 2, 1]
+
+
+def test_deduplicate_frames__all_distinct():
+    data, frame_map = animation.deduplicate_frames(b"aabbcc", 3)
+
+    assert data == b"aabbcc"
+    assert frame_map is None
+
+
+@pytest.mark.parametrize("duplicates", (False, True))
+def test_frame_map_in_progmem(generate_main, tmp_path, duplicates):
+    images = [Image.new("RGB", (8, 8), color) for color in ("red", "blue", "red")]
+    if not duplicates:
+        images[2] = Image.new("RGB", (8, 8), "green")
+    images[0].save(tmp_path / "anim.gif", save_all=True, append_images=images[1:])
+    (tmp_path / "test.yaml").write_text(
+        "esphome:\n  name: test\n"
+        "esp8266:\n  board: d1_mini\n"
+        "i2c:\n"
+        "display:\n  - platform: ssd1306_i2c\n    model: SSD1306 128x64\n"
+        "animation:\n"
+        "  - id: anim\n    file: anim.gif\n    type: RGB24\n"
+        "    deduplicate_frames: true\n"
+    )
+
+    main_cpp = generate_main(str(tmp_path / "test.yaml"))
+
+    if duplicates:
+        assert "static const uint16_t anim_frame_map[] PROGMEM = {0, 1, 0};" in main_cpp
+        assert "anim->set_frame_map(anim_frame_map);" in main_cpp
+    else:
+        assert "frame_map" not in main_cpp
@@ -0,0 +1,106 @@
+"""Tests for the font component's glyph rendering."""
+
+from pathlib import Path
+
+import pytest
+
+from esphome import asset_cache
+from esphome.components import font
+from esphome.const import CONF_PATH, CONF_SIZE, CONF_TYPE
+from esphome.core import CORE
+
+FONTS = Path(__file__).parent.parent.parent / "components" / "font"
+MONOCRAFT = {CONF_PATH: str(FONTS / "Monocraft.ttf"), CONF_TYPE: font.TYPE_LOCAL}
+CODEPOINTS = list("AbgÄÖü!@#~ ")
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path):
+    CORE.config_path = str(tmp_path / "device.yaml")
+    yield tmp_path / ".esphome"
+    CORE.config_path = None
+
+
+def _ref_glyph(mask, bpp):
+    """The per-pixel loop `pack_glyph` replaces."""
+    scale = 1 if bpp == 1 else 256 // (1 << bpp)
+    width, height = mask.size
+    data = [0] * ((height * width * bpp + 7) // 8)
+    pos = 0
+    for y in range(height):
+        for x in range(width):
+            pixel = mask.getpixel((x, y)) // scale
+            for bit_num in range(bpp):
+                if pixel & (1 << (bpp - bit_num - 1)):
+                    data[pos // 8] |= 0x80 >> (pos % 8)
+                pos += 1
+    return bytes(data)
+
+
+@pytest.mark.parametrize("bpp", (1, 2, 4, 8))
+@pytest.mark.parametrize("size", (7, 20, 33))
+def test_pack_glyph(bpp, size):
+    efont = font.EFont(MONOCRAFT, size, set(CODEPOINTS))
+    for codepoint in CODEPOINTS:
+        mask = efont.font.getmask(codepoint, mode="1" if bpp == 1 else "L")
+        assert font.pack_glyph(mask, bpp) == _ref_glyph(mask, bpp), codepoint
+
+
+def test_render_glyphs__parallel(monkeypatch):
+    glyphs = [(c, 0) for c in CODEPOINTS]
+    expected = font._render_chunk([MONOCRAFT], 20, 4, glyphs)
+    monkeypatch.setattr(font, "PARALLEL_RENDER_GLYPHS", 2)
+    monkeypatch.setattr(font, "RENDER_WORKERS", 3)
+
+    result = font._render_missing([MONOCRAFT], 20, 4, glyphs)
+
+    assert sorted(result) == sorted(expected)
+
+
+def test_render_glyphs__only_renders_new_glyphs(monkeypatch):
+    digests = [font._font_file_digest(MONOCRAFT)]
+    first = font.render_glyphs([(MONOCRAFT, set("ab"))], digests, 20, 2, list("ab"))
+
+    rendered = []
+    render_chunk = font._render_chunk
+
+    def spy(font_files, size, bpp, glyphs):
+        rendered.extend(glyphs)
+        return render_chunk(font_files, size, bpp, glyphs)
+
+    monkeypatch.setattr(font, "_render_chunk", spy)
+    data, glyph_args, ascent, descent = font.render_glyphs(
+        [(MONOCRAFT, set("abc"))], digests, 20, 2, list("abc")
+    )
+
+    assert rendered == [("c", 0)]
+    assert data.startswith(first[0])
+    assert glyph_args["c"].data_len == len(first[0])
+    assert (ascent, descent) == first[2:]
+    # A subset of the cached glyphs needs no rendering at all
+    rendered.clear()
+    font.render_glyphs([(MONOCRAFT, set("ab"))], digests, 20, 2, list("ab"))
+    assert not rendered
+    assert asset_cache.load(
+        font.GLYPH_CACHE_DOMAIN,
+        asset_cache.asset_key(
+            font.GLYPH_CACHE_DOMAIN, digests, {CONF_SIZE: 20, font.CONF_BPP: 2}
+        ),
+    ).keys() == set("abc")
+
+
+def test_render_glyphs__prunes_cache(monkeypatch):
+    monkeypatch.setattr(font, "MAX_CACHED_GLYPHS", 3)
+    digests = [font._font_file_digest(MONOCRAFT)]
+    key = asset_cache.asset_key(
+        font.GLYPH_CACHE_DOMAIN, digests, {CONF_SIZE: 20, font.CONF_BPP: 1}
+    )
+
+    font.render_glyphs([(MONOCRAFT, set("ab"))], digests, 20, 1, list("ab"))
+    font.render_glyphs([(MONOCRAFT, set("cd"))], digests, 20, 1, list("cd"))
+    # The oldest glyph is dropped
+    assert list(asset_cache.load(font.GLYPH_CACHE_DOMAIN, key)) == list("bcd")
+
+    font.render_glyphs([(MONOCRAFT, set("abcde"))], digests, 20, 1, list("abcde"))
+    # The glyphs in use are kept, even if there are more than the maximum
+    assert list(asset_cache.load(font.GLYPH_CACHE_DOMAIN, key)) == list("abcde")
@@ -0,0 +1,132 @@
+"""Tests for the image component's pixel packing."""
+
+import random
+
+from PIL import Image
+import pytest
+
+from esphome.components import image
+
+
+def _random_image(width, height, seed=1):
+    rnd = random.Random(seed)
+    # Include the colors that are reserved to mark transparency
+    special = [(0, 0, 1, 255), (0, 4, 0, 255), (7, 7, 7, 255), (1, 1, 1, 0x7F)]
+    pixels = [
+        (
+            rnd.choice(special)
+            if rnd.random() < 0.2
+            else tuple(rnd.randrange(256) for _ in range(3))
+            + (rnd.choice((0, 0x7F, 0x80, 255)),)
+        )
+        for _ in range(width * height)
+    ]
+    img = Image.new("RGBA", (width, height))
+    img.putdata(pixels)
+    return img
+
+
+# Reference implementations, the per-pixel loops the packing functions replace
+
+
+def _ref_grayscale(img, transparent):
+    data = []
+    for g, a in img.getdata():
+        if transparent:
+            if g == 1:
+                g = 0
+            if a < 0x80:
+                g = 1
+        data.append(g)
+    return bytes(data)
+
+
+def _ref_rgb24(img, transparent):
+    data = []
+    for r, g, b, a in img.getdata():
+        if transparent:
+            if r == 0 and g == 0 and b == 1:
+                b = 0
+            if a < 0x80:
+                r, g, b = 0, 0, 1
+        data += [r, g, b]
+    return bytes(data)
+
+
+def _ref_rgb565(img, transparent):
+    data = []
+    for r, g, b, a in img.getdata():
+        rgb = ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
+        if transparent:
+            if rgb == 0x0020:
+                rgb = 0
+            if a < 0x80:
+                rgb = 0x0020
+        data += [rgb >> 8, rgb & 0xFF]
+    return bytes(data)
+
+
+def _ref_binary(img, alpha):
+    width, height = img.size
+    width8 = ((width + 7) // 8) * 8
+    data = [0] * (height * width8 // 8)
+    for y in range(height):
+        for x in range(width):
+            if alpha is not None:
+                if not alpha.getpixel((x, y)):
+                    continue
+            elif img.getpixel((x, y)):
+                continue
+            pos = x + y * width8
+            data[pos // 8] |= 0x80 >> (pos % 8)
+    return bytes(data)
+
+
+SIZES = ((1, 1), (8, 3), (13, 7), (64, 17))
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("transparent", (False, True))
+def test_pack_grayscale(size, transparent):
+    img = _random_image(*size).convert("LA")
+    assert image.pack_grayscale(img, transparent) == _ref_grayscale(img, transparent)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_pack_rgba(size):
+    img = _random_image(*size)
+    assert image.pack_rgba(img) == bytes(c for px in img.getdata() for c in px)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("transparent", (False, True))
+def test_pack_rgb24(size, transparent):
+    img = _random_image(*size)
+    assert image.pack_rgb24(img, transparent) == _ref_rgb24(img, transparent)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("transparent", (False, True))
+def test_pack_rgb565(size, transparent):
+    img = _random_image(*size)
+    assert image.pack_rgb565(img, transparent) == _ref_rgb565(img, transparent)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("dither", (Image.Dither.NONE, Image.Dither.FLOYDSTEINBERG))
+def test_pack_binary(size, dither):
+    img = _random_image(*size).convert("1", dither=dither)
+    assert image.pack_binary(img) == _ref_binary(img, None)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("mode", ("RGBA", "LA", "P"))
+def test_pack_binary__alpha(size, mode):
+    src = _random_image(*size)
+    if mode == "P":
+        src = src.convert("RGB").convert("P")
+    else:
+        src = src.convert(mode)
+    alpha = src.split()[-1]
+    img = src.convert("1")
+    assert image.pack_binary(img, alpha) == _ref_binary(img, alpha)
@@ -20,7 +20,7 @@ from esphome.const import (
     CONF_WIFI,
 )
 from esphome.components.packages import do_packages_pass
-from esphome.config_helpers import Extend, Remove
+from esphome.config_helpers import Extend, Remove, merge_config, merge_configs
 import esphome.config_validation as cv
 
 # Test strings
@@ -511,3 +511,72 @@ def test_package_remove_by_missing_id():
 
     actual = do_packages_pass(config)
     assert actual == expected
+
+
+def test_many_packages_extend_and_remove(basic_wifi):
+    """
+    Ensures that many packages are merged as if merged one by one, and that
+    parts of the config set by one package only are not copied.
+    """
+
+    def sensor_package(i):
+        sensors = [
+            {CONF_ID: f"sensor_{i}", CONF_NAME: f"Sensor {i}"},
+            {CONF_ID: Extend(TEST_SENSOR_ID_1), CONF_FILTERS: [{CONF_OFFSET: i}]},
+        ]
+        if i >= 2:
+            sensors.append({CONF_ID: Remove(f"sensor_{i - 2}")})
+        return {CONF_SENSOR: sensors}
+
+    def make_config():
+        packages = {
+            "base": {
+                CONF_WIFI: basic_wifi,
+                CONF_SENSOR: [{CONF_ID: TEST_SENSOR_ID_1, CONF_NAME: "Base"}],
+            }
+        }
+        for i in range(10):
+            packages[f"package_{i}"] = {CONF_PACKAGES: {"nested": sensor_package(i)}}
+        return {
+            CONF_PACKAGES: packages,
+            CONF_SENSOR: [
+                {CONF_ID: Extend(TEST_SENSOR_ID_1), CONF_NAME: TEST_SENSOR_NAME_1}
+            ],
+        }
+
+    # Merging changes the configs, merge a separate copy one by one
+    config = make_config()
+    layers = [
+        config[CONF_PACKAGES]["base"],
+        *(sensor_package(i) for i in range(10)),
+        {CONF_SENSOR: config[CONF_SENSOR]},
+    ]
+    config = make_config()
+    expected = layers[-1]
+    for layer in reversed(layers[:-1]):
+        expected = merge_config(layer, expected)
+
+    actual = do_packages_pass(config)
+    assert actual == expected
+    assert actual[CONF_WIFI] is basic_wifi
+    assert [sensor[CONF_ID] for sensor in actual[CONF_SENSOR]] == [
+        TEST_SENSOR_ID_1,
+        "sensor_8",
+        "sensor_9",
+    ]
+    assert actual[CONF_SENSOR][0][CONF_NAME] == TEST_SENSOR_NAME_1
+    assert actual[CONF_SENSOR][0][CONF_FILTERS] == [{CONF_OFFSET: i} for i in range(10)]
+
+
+def test_merge_configs_remove_applies_to_next_older_config():
+    """
+    Ensures that a removed key is only removed from the next older config
+    setting it, like when merging the configs one by one.
+    """
+    configs = [
+        {CONF_WIFI: {CONF_SSID: "first"}},
+        {CONF_WIFI: {CONF_SSID: "second"}},
+        {CONF_WIFI: Remove()},
+    ]
+
+    assert merge_configs(configs) == {CONF_WIFI: {CONF_SSID: "first"}}
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from esphome.dashboard.entries import EntryState
+from esphome.dashboard.status import mqtt
+from esphome.dashboard.status.mqtt import MqttStatus
+
+
+class FakeEntry:
+    def __init__(self, name: str, no_mdns: bool = True) -> None:
+        self.name = name
+        self.no_mdns = no_mdns
+        self.state = EntryState.UNKNOWN
+
+
+@pytest.fixture
+def entries(monkeypatch) -> list[FakeEntry]:
+    entries = [FakeEntry("first"), FakeEntry("second"), FakeEntry("mdns", False)]
+    dashboard = Mock()
+    dashboard.entries.async_all.return_value = entries
+    dashboard.entries.get_by_name.side_effect = (
+        lambda name: {entry for entry in entries if entry.name == name} or None
+    )
+    dashboard.entries.async_set_state.side_effect = lambda entry, state: setattr(
+        entry, "state", state
+    )
+    monkeypatch.setattr(mqtt, "DASHBOARD", dashboard)
+    return entries
+
+
+def _message(payload: str) -> Mock:
+    return Mock(payload=payload.encode())
+
+
+@pytest.mark.asyncio
+async def test_messages_are_batched(entries: list[FakeEntry]) -> None:
+    status = MqttStatus()
+    process_pending = Mock(wraps=status.async_process_pending)
+    status.async_process_pending = process_pending
+
+    # Messages received before the event loop gets to them form one batch
+    for name in ("first", "mdns", "unknown", "first"):
+        status._on_message(None, None, _message(json.dumps({"name": name})))
+    status._on_message(None, None, _message(""))
+    status._on_message(None, None, _message("not json"))
+    await asyncio.sleep(0)
+
+    assert process_pending.call_count == 1
+    assert [entry.state for entry in entries] == [
+        EntryState.ONLINE,
+        EntryState.UNKNOWN,
+        EntryState.ONLINE,
+    ]
+    # Only devices without mDNS are tracked for the offline timeout
+    assert set(status.last_seen) == {entries[0]}
+
+
+@pytest.mark.asyncio
+async def test_offline_after_timeout(entries: list[FakeEntry]) -> None:
+    status = MqttStatus()
+    status._on_message(None, None, _message(json.dumps({"name": "first"})))
+    status.async_process_pending()
+    now = status.last_seen[entries[0]]
+
+    # Devices that were just seen don't need a discovery request
+    assert status.async_expire(now) is False
+    assert status.async_expire(now + mqtt.DISCOVER_INTERVAL + 1) is True
+    assert entries[0].state == EntryState.ONLINE
+
+    # Devices that were never seen go offline once tracked for the timeout
+    status.async_expire(now + mqtt.OFFLINE_TIMEOUT + 1)
+    assert [entry.state for entry in entries] == [
+        EntryState.OFFLINE,
+        EntryState.OFFLINE,
+        EntryState.UNKNOWN,
+    ]
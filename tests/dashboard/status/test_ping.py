@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import Mock
+
+from icmplib import Host
+import pytest
+
+from esphome.dashboard import dns
+from esphome.dashboard.dns import DNSCache
+from esphome.dashboard.entries import EntryState
+from esphome.dashboard.status import ping
+from esphome.dashboard.status.ping import PingStatus
+
+
+class FakeEntry:
+    def __init__(self, address: str) -> None:
+        self.address = address
+        self.state = EntryState.UNKNOWN
+
+
+@pytest.fixture
+def dashboard(monkeypatch) -> Mock:
+    dashboard = Mock(dns_cache=DNSCache())
+    dashboard.settings.ping_all_addresses = False
+    dashboard.entries.async_set_state.side_effect = lambda entry, state: setattr(
+        entry, "state", state
+    )
+
+    async def _resolve(hostname: str) -> list[str]:
+        return [f"{hostname}.1", f"{hostname}.2"]
+
+    monkeypatch.setattr(dns, "async_resolve", _resolve)
+    monkeypatch.setattr(ping, "DASHBOARD", dashboard)
+    return dashboard
+
+
+def _mock_ping(monkeypatch, alive: set[str], slow: set[str] = frozenset()) -> list:
+    pinged: list[str] = []
+
+    async def _ping(address: str, privileged: bool) -> Host:
+        if address in slow:
+            await asyncio.sleep(1)
+        pinged.append(address)
+        return Host(address, 1, [1.0] if address in alive else [])
+
+    monkeypatch.setattr(ping, "async_ping", _ping)
+    return pinged
+
+
+@pytest.mark.asyncio
+async def test_slow_host_only_holds_its_slot(dashboard: Mock, monkeypatch) -> None:
+    monkeypatch.setattr(ping, "MAX_PROBES_IN_FLIGHT", 2)
+    entries = [FakeEntry(name) for name in ("dead", "a", "b", "c")]
+    dashboard.entries.async_all.return_value = entries
+    pinged = _mock_ping(monkeypatch, {"a.1", "b.1", "c.1"}, slow={"dead.1"})
+
+    await PingStatus().async_probe_due()
+
+    assert pinged == ["a.1", "b.1", "c.1", "dead.1"]
+    assert [entry.state for entry in entries] == [
+        EntryState.OFFLINE,
+        EntryState.ONLINE,
+        EntryState.ONLINE,
+        EntryState.ONLINE,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stable_hosts_back_off(dashboard: Mock, monkeypatch) -> None:
+    entry = FakeEntry("a")
+    dashboard.entries.async_all.return_value = [entry]
+    pinged = _mock_ping(monkeypatch, {"a.1"})
+    status = PingStatus()
+
+    # The first result is a change, which is confirmed on the next request
+    await status.async_probe_due()
+    await status.async_probe_due()
+    assert len(pinged) == 2
+
+    # and then the host isn't pinged again until the interval passed
+    await status.async_probe_due()
+    assert len(pinged) == 2
+    assert status._probes[entry].interval == ping.PROBE_INTERVAL_MIN
+
+
+@pytest.mark.asyncio
+async def test_ping_all_addresses(dashboard: Mock, monkeypatch) -> None:
+    dashboard.settings.ping_all_addresses = True
+    entry = FakeEntry("a")
+    dashboard.entries.async_all.return_value = [entry]
+    pinged = _mock_ping(monkeypatch, {"a.2"})
+
+    await PingStatus().async_probe_due()
+
+    assert sorted(pinged) == ["a.1", "a.2"]
+    assert entry.state == EntryState.ONLINE
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+
+import pytest
+
+from esphome.dashboard import builds
+from esphome.dashboard.builds import BuildQueue
+from esphome.dashboard.workers import WorkerPool
+
+# Prints its name, waits until its release file exists, then exits
+BUILD_SCRIPT = """
+import os, sys, time
+print(sys.argv[1], flush=True)
+while not os.path.exists(sys.argv[2]):
+    time.sleep(0.01)
+"""
+
+
+class Viewer:
+    def __init__(self) -> None:
+        self.messages: list[dict] = []
+        self._changed = asyncio.Event()
+
+    def __call__(self, message: dict) -> None:
+        self.messages.append(message)
+        self._changed.set()
+
+    @property
+    def events(self) -> list[str]:
+        return [m["event"] for m in self.messages if m["event"] != "line"]
+
+    @property
+    def lines(self) -> list[str]:
+        return [m["data"] for m in self.messages if m["event"] == "line"]
+
+    @property
+    def queue_status(self) -> tuple[int, int]:
+        status = [m for m in self.messages if m["event"] == "queued"][-1]
+        return status["position"], status["eta"]
+
+    async def wait_for(self, event: str) -> None:
+        while event not in (m["event"] for m in self.messages):
+            self._changed.clear()
+            await asyncio.wait_for(self._changed.wait(), 10)
+
+    async def wait_for_line(self, line: str) -> None:
+        while line not in self.lines:
+            self._changed.clear()
+            await asyncio.wait_for(self._changed.wait(), 10)
+
+
+@pytest.fixture
+def queue() -> BuildQueue:
+    return BuildQueue(WorkerPool())
+
+
+def _command(tmp_path, name: str) -> list[str]:
+    return [sys.executable, "-c", BUILD_SCRIPT, name, str(tmp_path / name)]
+
+
+def _release(tmp_path, name: str) -> None:
+    (tmp_path / name).touch()
+
+
+@pytest.mark.asyncio
+async def test_builds_wait_for_a_free_slot(queue: BuildQueue, tmp_path) -> None:
+    first, second = Viewer(), Viewer()
+
+    queue.async_subscribe(_command(tmp_path, "first"), first)
+    queue.async_subscribe(_command(tmp_path, "second"), second)
+    await first.wait_for_line("first\n")
+
+    assert second.events == ["queued"]
+    assert second.queue_status[0] == 1
+
+    _release(tmp_path, "first")
+    await first.wait_for("exit")
+    await second.wait_for_line("second\n")
+    _release(tmp_path, "second")
+    await second.wait_for("exit")
+    assert first.events == ["exit"]
+    assert second.events == ["queued", "exit"]
+    await queue.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_max_parallel(queue: BuildQueue, tmp_path) -> None:
+    queue.max_parallel = 2
+    viewers = [Viewer() for _ in range(3)]
+
+    for index, viewer in enumerate(viewers):
+        queue.async_subscribe(_command(tmp_path, str(index)), viewer)
+    await viewers[0].wait_for_line("0\n")
+    await viewers[1].wait_for_line("1\n")
+
+    assert viewers[2].lines[-1].startswith("Waiting for other builds to finish")
+    _release(tmp_path, "1")
+    await viewers[2].wait_for_line("2\n")
+    await queue.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_identical_builds_are_coalesced(queue: BuildQueue, tmp_path) -> None:
+    first, second = Viewer(), Viewer()
+
+    queue.async_subscribe(_command(tmp_path, "build"), first)
+    await first.wait_for_line("build\n")
+    queue.async_subscribe(_command(tmp_path, "build"), second)
+    _release(tmp_path, "build")
+    await first.wait_for("exit")
+    await second.wait_for("exit")
+
+    assert first.messages == second.messages
+    assert first.lines.count("build\n") == 1
+    await queue.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_interactive_builds_go_first(queue: BuildQueue, tmp_path) -> None:
+    running, interactive = Viewer(), Viewer()
+
+    queue.async_subscribe(_command(tmp_path, "running"), running)
+    await running.wait_for_line("running\n")
+    queue.async_schedule(_command(tmp_path, "background"))
+    queue.async_subscribe(_command(tmp_path, "interactive"), interactive)
+
+    assert interactive.queue_status[0] == 1
+    _release(tmp_path, "running")
+    await interactive.wait_for_line("interactive\n")
+    await queue.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_joining_raises_priority(queue: BuildQueue, tmp_path) -> None:
+    running, interactive, background = Viewer(), Viewer(), Viewer()
+
+    queue.async_subscribe(_command(tmp_path, "running"), running)
+    await running.wait_for_line("running\n")
+    queue.async_schedule(_command(tmp_path, "background"))
+    queue.async_subscribe(_command(tmp_path, "interactive"), interactive)
+    assert interactive.queue_status[0] == 1
+    queue.async_subscribe(_command(tmp_path, "background"), background)
+
+    assert background.queue_status[0] == 1
+    assert interactive.queue_status[0] == 2
+    await queue.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_eta(queue: BuildQueue, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(builds, "DEFAULT_BUILD_DURATION", 100.0)
+    viewers = [Viewer() for _ in range(3)]
+
+    for index, viewer in enumerate(viewers):
+        queue.async_subscribe(_command(tmp_path, str(index)), viewer)
+
+    assert viewers[1].queue_status == (1, 100)
+    assert viewers[2].queue_status == (2, 200)
+
+    # The estimate comes from the duration of the finished builds
+    _release(tmp_path, "0")
+    await viewers[0].wait_for("exit")
+    assert viewers[2].queue_status[0] == 1
+    assert viewers[2].queue_status[1] < 5
+    await queue.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_leaving_cancels_queued_build(queue: BuildQueue, tmp_path) -> None:
+    running, queued = Viewer(), Viewer()
+
+    queue.async_subscribe(_command(tmp_path, "running"), running)
+    unsubscribe = queue.async_subscribe(_command(tmp_path, "queued"), queued)
+    await running.wait_for_line("running\n")
+    unsubscribe()
+    _release(tmp_path, "running")
+    await running.wait_for("exit")
+    await asyncio.sleep(0.1)
+
+    assert queued.events == ["queued"]
+    assert len(queued.lines) == 1
+    await queue.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_background_builds_run_without_viewers(
+    queue: BuildQueue, tmp_path
+) -> None:
+    viewer, later = Viewer(), Viewer()
+    command = _command(tmp_path, "background")
+
+    queue.async_schedule(command)
+    queue.async_subscribe(command, viewer)()
+    queue.async_subscribe(command, later)
+    await later.wait_for_line("background\n")
+    _release(tmp_path, "background")
+    await later.wait_for("exit")
+
+    assert later.lines == ["background\n"]
+    assert later.messages[-1] == {"event": "exit", "code": 0}
+    assert viewer.messages == []
+    await queue.async_stop()
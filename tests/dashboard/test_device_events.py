@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+from esphome.core import CORE
+from esphome.dashboard import device_events
+from esphome.dashboard.core import ESPHomeDashboard
+from esphome.dashboard.entries import EntryState
+
+
+@pytest_asyncio.fixture()
+async def dashboard(tmp_path: Path, monkeypatch) -> ESPHomeDashboard:
+    monkeypatch.setattr(device_events, "COALESCE_DELAY", 0.01)
+    (tmp_path / "existing.yaml").write_text("esphome:\n  name: existing\n")
+    CORE.config_path = os.path.join(tmp_path, ".")
+    dashboard = ESPHomeDashboard()
+    dashboard.settings.config_dir = str(tmp_path)
+    await dashboard.async_setup()
+    await dashboard.entries.async_update_entries()
+    yield dashboard
+    CORE.config_path = None
+
+
+class Subscriber:
+    def __init__(self) -> None:
+        self.messages: asyncio.Queue[dict] = asyncio.Queue()
+
+    def __call__(self, message: str) -> None:
+        self.messages.put_nowait(json.loads(message))
+
+    async def next(self) -> dict:
+        return await asyncio.wait_for(self.messages.get(), 5)
+
+
+def _entry(dashboard: ESPHomeDashboard, filename: str):
+    return dashboard.entries.get(os.path.join(dashboard.settings.config_dir, filename))
+
+
+@pytest.mark.asyncio
+async def test_initial_state(dashboard: ESPHomeDashboard) -> None:
+    subscriber = Subscriber()
+
+    unsubscribe = dashboard.device_events.async_subscribe(subscriber)
+
+    message = await subscriber.next()
+    assert message["event"] == "initial_state"
+    assert [d["configuration"] for d in message["data"]["devices"]["configured"]] == [
+        "existing.yaml"
+    ]
+    assert message["data"]["devices"]["importable"] == []
+    assert message["data"]["states"] == {"existing.yaml": None}
+    # Subscribing keeps the device states fresh
+    assert dashboard.ping_request.is_set()
+    unsubscribe()
+
+
+@pytest.mark.asyncio
+async def test_changes_are_coalesced(dashboard: ESPHomeDashboard) -> None:
+    config_dir = Path(dashboard.settings.config_dir)
+    entries = dashboard.entries
+    first, second = Subscriber(), Subscriber()
+    dashboard.device_events.async_subscribe(first)
+    dashboard.device_events.async_subscribe(second)
+    await first.next()
+    await second.next()
+
+    (config_dir / "new.yaml").write_text("esphome:\n  name: new\n")
+    await entries.async_update_entries()
+    entries.async_set_state(_entry(dashboard, "existing.yaml"), EntryState.OFFLINE)
+    entries.async_set_state(_entry(dashboard, "existing.yaml"), EntryState.ONLINE)
+    entries.async_set_state(_entry(dashboard, "new.yaml"), EntryState.OFFLINE)
+
+    message = await first.next()
+    assert message == await second.next()
+    assert message["event"] == "devices_changed"
+    assert [d["configuration"] for d in message["data"]["added"]] == ["new.yaml"]
+    assert message["data"]["updated"] == []
+    assert message["data"]["removed"] == []
+    assert message["data"]["states"] == {"existing.yaml": True, "new.yaml": False}
+    assert first.messages.empty()
+
+    (config_dir / "new.yaml").unlink()
+    await entries.async_update_entries()
+
+    message = await first.next()
+    assert message["data"]["removed"] == ["new.yaml"]
+    assert message["data"]["states"] == {}
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe(dashboard: ESPHomeDashboard) -> None:
+    subscriber = Subscriber()
+    unsubscribe = dashboard.device_events.async_subscribe(subscriber)
+    await subscriber.next()
+
+    unsubscribe()
+    dashboard.entries.async_set_state(
+        _entry(dashboard, "existing.yaml"), EntryState.ONLINE
+    )
+    await asyncio.sleep(0.05)
+
+    assert subscriber.messages.empty()
+    assert not any(dashboard.bus._listeners.values())
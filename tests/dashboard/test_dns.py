@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from unittest.mock import AsyncMock
+
+from icmplib import NameLookupError
+import pytest
+
+from esphome.dashboard import dns
+from esphome.dashboard.dns import DNSCache
+
+
+@pytest.fixture
+def mock_resolve(monkeypatch) -> AsyncMock:
+    mock = AsyncMock(return_value=["192.168.1.10"])
+    monkeypatch.setattr(dns, "async_resolve", mock)
+    return mock
+
+
+@pytest.mark.asyncio
+async def test_cached(mock_resolve: AsyncMock) -> None:
+    cache = DNSCache()
+    now = time.monotonic()
+
+    assert await cache.async_resolve("device.local", now) == ["192.168.1.10"]
+    assert await cache.async_resolve("device.local", now + 1) == ["192.168.1.10"]
+
+    assert mock_resolve.call_count == 1
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_are_coalesced(mock_resolve: AsyncMock) -> None:
+    cache = DNSCache()
+    release = asyncio.Event()
+
+    async def _resolve(hostname: str) -> list[str]:
+        await release.wait()
+        return ["192.168.1.10"]
+
+    mock_resolve.side_effect = _resolve
+    now = time.monotonic()
+    lookups = [
+        asyncio.create_task(cache.async_resolve("device.local", now)) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    # Cancelling one caller doesn't cancel the shared lookup
+    lookups.pop().cancel()
+    release.set()
+
+    assert await asyncio.gather(*lookups) == [["192.168.1.10"]] * 2
+    assert mock_resolve.call_count == 1
+    assert cache.stats["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_use_negative_ttl(mock_resolve: AsyncMock) -> None:
+    cache = DNSCache(ttl=120, negative_ttl=10)
+    mock_resolve.side_effect = NameLookupError("device.local")
+    now = time.monotonic()
+
+    assert isinstance(await cache.async_resolve("device.local", now), NameLookupError)
+    assert isinstance(await cache.async_resolve("device.local", now + 1), Exception)
+    assert mock_resolve.call_count == 1
+
+    mock_resolve.side_effect = None
+    assert await cache.async_resolve("device.local", now + 20) == ["192.168.1.10"]
+    assert mock_resolve.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_refreshed_before_expiry(mock_resolve: AsyncMock) -> None:
+    cache = DNSCache(ttl=100)
+    now = time.monotonic()
+    await cache.async_resolve("device.local", now)
+    mock_resolve.return_value = ["192.168.1.20"]
+
+    # Within the refresh window the cached addresses are returned right away
+    assert await cache.async_resolve("device.local", now + 90) == ["192.168.1.10"]
+    await asyncio.sleep(0)
+    assert mock_resolve.call_count == 2
+    assert cache.stats["refreshes"] == 1
+    assert await cache.async_resolve("device.local", now + 50) == ["192.168.1.20"]
+    assert mock_resolve.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_addresses(mock_resolve: AsyncMock) -> None:
+    cache = DNSCache(ttl=100)
+    now = time.monotonic()
+    await cache.async_resolve("device.local", now)
+    mock_resolve.side_effect = NameLookupError("device.local")
+
+    await cache.async_resolve("device.local", now + 90)
+    await asyncio.sleep(0)
+
+    assert await cache.async_resolve("device.local", now + 95) == ["192.168.1.10"]
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_are_evicted(mock_resolve: AsyncMock) -> None:
+    cache = DNSCache(max_size=2)
+    now = time.monotonic()
+
+    await cache.async_resolve("first.local", now)
+    await cache.async_resolve("second.local", now)
+    await cache.async_resolve("first.local", now)
+    await cache.async_resolve("third.local", now)
+    await cache.async_resolve("first.local", now)
+
+    assert cache.stats["evictions"] == 1
+    assert cache.stats["size"] == 2
+    assert [call.args[0] for call in mock_resolve.call_args_list] == [
+        "first.local",
+        "second.local",
+        "third.local",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unexpected_refresh_error_is_logged(
+    mock_resolve: AsyncMock, caplog: pytest.LogCaptureFixture
+) -> None:
+    cache = DNSCache(ttl=100)
+    now = time.monotonic()
+    await cache.async_resolve("device.local", now)
+    mock_resolve.side_effect = RuntimeError("boom")
+
+    assert await cache.async_resolve("device.local", now + 90) == ["192.168.1.10"]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert "Refreshing a DNS cache entry failed" in caplog.text
+    assert "boom" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_stats_are_logged(
+    mock_resolve: AsyncMock, caplog: pytest.LogCaptureFixture
+) -> None:
+    caplog.set_level(logging.DEBUG, logger=dns.__name__)
+    cache = DNSCache()
+    now = time.monotonic()
+
+    await cache.async_resolve("device.local", now)
+    assert "DNS cache stats" not in caplog.text
+
+    await cache.async_resolve("device.local", now + dns.STATS_LOG_INTERVAL)
+    assert "DNS cache stats: {'size': 1, 'hits': 0, 'misses': 1" in caplog.text
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+import sys
+
+import pytest
+import pytest_asyncio
+
+from esphome.core import CORE
+from esphome.dashboard import watcher
+from esphome.dashboard.const import (
+    EVENT_ENTRY_ADDED,
+    EVENT_ENTRY_REMOVED,
+    EVENT_ENTRY_UPDATED,
+)
+from esphome.dashboard.core import ESPHomeDashboard
+from esphome.dashboard.entries import DashboardEntries
+from esphome.storage_json import ext_storage_path
+
+
+@pytest_asyncio.fixture()
+async def dashboard(tmp_path: Path, monkeypatch) -> ESPHomeDashboard:
+    monkeypatch.setattr(watcher, "DEBOUNCE_DELAY", 0.01)
+    (tmp_path / "existing.yaml").write_text("esphome:\n  name: existing\n")
+    CORE.config_path = os.path.join(tmp_path, ".")
+    dashboard = ESPHomeDashboard()
+    dashboard.settings.config_dir = str(tmp_path)
+    await dashboard.async_setup()
+    yield dashboard
+    dashboard.entries.async_stop_watching()
+    CORE.config_path = None
+
+
+def _collect_events(dashboard: ESPHomeDashboard) -> asyncio.Queue:
+    queue = asyncio.Queue()
+    for event_type in (EVENT_ENTRY_ADDED, EVENT_ENTRY_UPDATED, EVENT_ENTRY_REMOVED):
+        dashboard.bus.async_add_listener(event_type, queue.put_nowait)
+    return queue
+
+
+async def _next_event(queue: asyncio.Queue) -> tuple[str, str]:
+    event = await asyncio.wait_for(queue.get(), 5)
+    return event.event_type, event.data["entry"].filename
+
+
+@pytest.mark.asyncio
+async def test_watcher_updates_entries(dashboard: ESPHomeDashboard) -> None:
+    config_dir = dashboard.settings.config_dir
+    entries = dashboard.entries
+    assert entries.async_start_watching()
+    await entries.async_update_entries()
+    assert [e.filename for e in entries.async_all()] == ["existing.yaml"]
+    events = _collect_events(dashboard)
+
+    Path(config_dir, "new.yaml").write_text("esphome:\n  name: new\n")
+    assert await _next_event(events) == (EVENT_ENTRY_ADDED, "new.yaml")
+    assert entries.get(os.path.join(config_dir, "new.yaml")) is not None
+
+    # Compiling writes the storage JSON, which updates the entry
+    storage_path = Path(ext_storage_path("new.yaml"))
+    storage_path.write_text("{}")
+    assert await _next_event(events) == (EVENT_ENTRY_UPDATED, "new.yaml")
+
+    # Files that are not device configs are ignored
+    Path(config_dir, "secrets.yaml").write_text("password: secret\n")
+    Path(config_dir, "notes.txt").write_text("")
+
+    Path(config_dir, "new.yaml").unlink()
+    assert await _next_event(events) == (EVENT_ENTRY_REMOVED, "new.yaml")
+    assert events.empty()
+    assert [e.filename for e in entries.async_all()] == ["existing.yaml"]
+
+
+@pytest.mark.asyncio
+async def test_request_update_does_not_poll_when_watching(
+    dashboard: ESPHomeDashboard, monkeypatch
+) -> None:
+    entries = dashboard.entries
+    assert entries.async_start_watching()
+    await entries.async_request_update_entries()
+    assert len(entries.async_all()) == 1
+
+    def fail(self) -> None:
+        raise AssertionError("config directory was polled")
+
+    monkeypatch.setattr(DashboardEntries, "_get_path_to_cache_key", fail)
+    await entries.async_request_update_entries()
+
+
+@pytest.mark.asyncio
+async def test_polling_fallback(dashboard: ESPHomeDashboard, monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "watchdog.observers", None)
+    entries = dashboard.entries
+    assert not entries.async_start_watching()
+    await entries.async_request_update_entries()
+    events = _collect_events(dashboard)
+
+    Path(dashboard.settings.config_dir, "new.yaml").write_text("")
+    await entries.async_request_update_entries()
+
+    assert await _next_event(events) == (EVENT_ENTRY_ADDED, "new.yaml")
+
+
+@pytest.mark.asyncio
+async def test_request_update_waits_for_initial_load(
+    dashboard: ESPHomeDashboard,
+) -> None:
+    entries = dashboard.entries
+    assert entries.async_start_watching()
+    initial_load = asyncio.create_task(entries.async_update_entries())
+    await asyncio.sleep(0)
+
+    await entries.async_request_update_entries()
+
+    assert [e.filename for e in entries.async_all()] == ["existing.yaml"]
+    await initial_load
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+from esphome.dashboard import logs
+from esphome.dashboard.workers import WorkerPool
+
+# Prints its pid and a few numbered lines, then waits to be terminated
+LOGS_SCRIPT = """
+import os, sys, time
+print(os.getpid())
+for i in range(int(sys.argv[1])):
+    print(f"line {i}")
+sys.stdout.flush()
+time.sleep(float(sys.argv[2]))
+"""
+
+
+def _command(lines: int = 3, sleep: float = 30) -> list[str]:
+    return [sys.executable, "-c", LOGS_SCRIPT, str(lines), str(sleep)]
+
+
+class Viewer:
+    def __init__(self) -> None:
+        self.messages: list[dict] = []
+        self._changed = asyncio.Event()
+
+    def __call__(self, message: dict) -> None:
+        self.messages.append(message)
+        self._changed.set()
+
+    @property
+    def lines(self) -> list[str]:
+        return [m["data"] for m in self.messages if m["event"] == "line"]
+
+    async def wait_for(self, count: int) -> None:
+        while len(self.messages) < count:
+            self._changed.clear()
+            await asyncio.wait_for(self._changed.wait(), 10)
+
+
+async def _wait_for_exit(pid: int) -> None:
+    for _ in range(200):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"Process {pid} is still running")
+
+
+@pytest.mark.asyncio
+async def test_viewers_share_one_process() -> None:
+    broker = logs.LogBroker(WorkerPool())
+    first, second = Viewer(), Viewer()
+
+    unsubscribe_first = broker.async_subscribe(_command(), first)
+    await first.wait_for(4)
+    unsubscribe_second = broker.async_subscribe(_command(), second)
+
+    # The second viewer gets the buffered lines of the same process
+    assert second.lines == first.lines
+    pid = int(first.lines[0])
+    assert first.lines[1:] == ["line 0\n", "line 1\n", "line 2\n"]
+
+    unsubscribe_first()
+    await asyncio.sleep(0.1)
+    os.kill(pid, 0)
+
+    unsubscribe_second()
+    await _wait_for_exit(pid)
+    await broker.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_new_session_after_last_viewer_left() -> None:
+    broker = logs.LogBroker(WorkerPool())
+    first, second = Viewer(), Viewer()
+
+    broker.async_subscribe(_command(), first)()
+    broker.async_subscribe(_command(), second)
+    await second.wait_for(1)
+
+    assert first.lines == []
+    assert second.lines[0] != ""
+    await broker.async_stop()
+    await _wait_for_exit(int(second.lines[0]))
+
+
+@pytest.mark.asyncio
+async def test_replay_buffer_is_bounded(monkeypatch) -> None:
+    monkeypatch.setattr(logs, "REPLAY_BUFFER_LINES", 5)
+    broker = logs.LogBroker(WorkerPool())
+    first, second = Viewer(), Viewer()
+
+    unsubscribe = broker.async_subscribe(_command(lines=20), first)
+    await first.wait_for(21)
+    broker.async_subscribe(_command(lines=20), second)
+
+    assert len(first.lines) == 21
+    assert second.lines == first.lines[-5:]
+    unsubscribe()
+    await broker.async_stop()
+    await _wait_for_exit(int(first.lines[0]))
+
+
+@pytest.mark.asyncio
+async def test_exit_is_sent_to_all_viewers() -> None:
+    broker = logs.LogBroker(WorkerPool())
+    first, second = Viewer(), Viewer()
+
+    broker.async_subscribe(_command(lines=1, sleep=0.5), first)
+    broker.async_subscribe(_command(lines=1, sleep=0.5), second)
+    await first.wait_for(3)
+    await second.wait_for(3)
+
+    assert first.messages[-1] == {"event": "exit", "code": 0}
+    assert second.messages == first.messages
+
+    # A new viewer starts a new process
+    third = Viewer()
+    broker.async_subscribe(_command(lines=1, sleep=0), third)
+    await third.wait_for(3)
+    assert third.lines[0] != first.lines[0]
+    await broker.async_stop()
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import gzip
 import json
 import os
+from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 import pytest_asyncio
-from tornado.httpclient import AsyncHTTPClient, HTTPResponse
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError, HTTPResponse
 from tornado.httpserver import HTTPServer
 from tornado.ioloop import IOLoop
 from tornado.testing import bind_unused_port
+from tornado.websocket import websocket_connect
 
 from esphome.dashboard import web_server
 from esphome.dashboard.core import DASHBOARD
@@ -78,3 +81,118 @@ async def test_devices_page(dashboard: DashboardTestHelper) -> None:
     first_device = configured_devices[0]
     assert first_device["name"] == "pico"
     assert first_device["configuration"] == "pico.yaml"
+
+
+@pytest.mark.asyncio
+async def test_events_websocket(dashboard: DashboardTestHelper) -> None:
+    connection = await websocket_connect(f"ws://127.0.0.1:{dashboard.port}/events")
+    message = json.loads(await connection.read_message())
+    connection.close()
+
+    assert message["event"] == "initial_state"
+    configured_devices = message["data"]["devices"]["configured"]
+    assert configured_devices[0]["configuration"] == "pico.yaml"
+    assert message["data"]["states"] == {"pico.yaml": None}
+
+
+@pytest.fixture
+def firmware(tmp_path: Path, monkeypatch) -> bytes:
+    data = bytes(range(256)) * 1024
+    (tmp_path / "firmware").mkdir()
+    (tmp_path / "firmware" / "firmware.bin").write_bytes(data)
+    monkeypatch.setenv("ESPHOME_DATA_DIR", str(tmp_path / "data"))
+    storage_json = Mock(firmware_bin_path=str(tmp_path / "firmware" / "firmware.bin"))
+    storage_json.name = "pico"
+    monkeypatch.setattr(web_server.StorageJSON, "load", lambda path: storage_json)
+    return data
+
+
+@pytest.mark.asyncio
+async def test_download_binary(dashboard: DashboardTestHelper, firmware) -> None:
+    response = await dashboard.fetch(
+        "/download.bin?configuration=pico.yaml&file=firmware.bin"
+    )
+    assert response.body == firmware
+    assert response.headers["Content-Disposition"] == (
+        'attachment; filename="pico-firmware.bin"'
+    )
+    assert response.headers["Accept-Ranges"] == "bytes"
+
+    with pytest.raises(HTTPClientError) as err:
+        await dashboard.fetch(
+            "/download.bin?configuration=pico.yaml&file=firmware.bin",
+            headers={"If-None-Match": response.headers["Etag"]},
+        )
+    assert err.value.code == 304
+
+
+@pytest.mark.asyncio
+async def test_download_binary_compressed(
+    dashboard: DashboardTestHelper, firmware, tmp_path: Path
+) -> None:
+    response = await dashboard.fetch(
+        "/download.bin?configuration=pico.yaml&file=firmware.bin&compressed=1"
+    )
+    assert gzip.decompress(response.body) == firmware
+    assert response.headers["Content-Disposition"] == (
+        'attachment; filename="pico-firmware.bin.gz"'
+    )
+    # The compressed copy is cached in the data dir, not next to the file
+    assert os.listdir(tmp_path / "firmware") == ["firmware.bin"]
+    assert len(os.listdir(tmp_path / "data" / "download_cache")) == 1
+
+
+@pytest.mark.asyncio
+async def test_download_binary_compressed_without_cache(
+    dashboard: DashboardTestHelper, firmware, monkeypatch
+) -> None:
+    def read_only(path, cache_dir):
+        raise PermissionError(cache_dir)
+
+    monkeypatch.setattr(web_server, "gzip_file_cached", read_only)
+    path = "/download.bin?configuration=pico.yaml&file=firmware.bin&compressed=1"
+
+    response = await dashboard.fetch(path)
+    assert gzip.decompress(response.body) == firmware
+    compressed = response.body
+
+    response = await dashboard.fetch(path, headers={"Range": "bytes=10-19"})
+    assert response.body == compressed[10:20]
+
+
+@pytest.mark.asyncio
+async def test_download_binary_range(dashboard: DashboardTestHelper, firmware) -> None:
+    path = "/download.bin?configuration=pico.yaml&file=firmware.bin"
+
+    response = await dashboard.fetch(path, headers={"Range": "bytes=100-199"})
+    assert response.code == 206
+    assert response.body == firmware[100:200]
+    assert response.headers["Content-Range"] == f"bytes 100-199/{len(firmware)}"
+
+    response = await dashboard.fetch(path, headers={"Range": "bytes=-10"})
+    assert response.body == firmware[-10:]
+
+    with pytest.raises(HTTPClientError) as err:
+        await dashboard.fetch(path, headers={"Range": f"bytes={len(firmware)}-"})
+    assert err.value.code == 416
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-9", (0, 10)),
+        ("bytes=10-", (10, 100)),
+        ("bytes=-10", (90, 100)),
+        ("bytes=90-1000", (90, 100)),
+        ("bytes=0-9,20-29", None),
+        ("lines=0-9", None),
+        ("bytes=a-b", None),
+    ],
+)
+def test_parse_byte_range(header: str, expected: tuple[int, int] | None) -> None:
+    assert web_server.parse_byte_range(header, 100) == expected
+
+
+def test_parse_byte_range_not_satisfiable() -> None:
+    with pytest.raises(ValueError):
+        web_server.parse_byte_range("bytes=100-", 100)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import sys
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+
+from esphome.const import __version__
+from esphome.dashboard.util.subprocess import async_iter_lines
+from esphome.dashboard.workers import WorkerPool, WorkerProcess
+
+CONFIG = """
+esphome:
+  name: {name}
+host:
+"""
+
+
+@pytest_asyncio.fixture()
+async def pool() -> WorkerPool:
+    pool = WorkerPool()
+    assert await pool.async_start()
+    yield pool
+    await pool.async_stop()
+
+
+def _write_config(tmp_path: Path, name: str) -> str:
+    path = tmp_path / f"{name}.yaml"
+    path.write_text(CONFIG.format(name=name))
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_run_in_worker(pool: WorkerPool) -> None:
+    process = await pool.async_exec(["esphome", "version"])
+
+    assert isinstance(process, WorkerProcess)
+    assert [line async for line in async_iter_lines(process.stdout)] == [
+        f"Version: {__version__}\n".encode()
+    ]
+    assert await process.wait() == 0
+
+
+@pytest.mark.asyncio
+async def test_workers_dont_share_state(pool: WorkerPool, tmp_path: Path) -> None:
+    first = _write_config(tmp_path, "first")
+    second = _write_config(tmp_path, "second")
+
+    results = await asyncio.gather(
+        pool.async_run(["esphome", "config", first]),
+        pool.async_run(["esphome", "config", second]),
+        pool.async_run(["esphome", "config", first]),
+    )
+
+    for (rc, stdout, stderr), name in zip(results, ("first", "second", "first")):
+        assert rc == 0
+        assert f"name: {name}\n" in stdout.decode()
+        assert b"Configuration is valid!" in stderr
+
+
+@pytest.mark.asyncio
+async def test_exit_code(pool: WorkerPool, tmp_path: Path) -> None:
+    path = tmp_path / "broken.yaml"
+    path.write_text("esphome:\n  name: broken\n")
+
+    rc, stdout, stderr = await pool.async_run(["esphome", "config", str(path)])
+
+    assert rc == 2
+    assert b"Failed config" in stdout
+
+
+@pytest.mark.asyncio
+async def test_other_commands_run_as_subprocess(pool: WorkerPool) -> None:
+    rc, stdout, stderr = await pool.async_run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; print('out'); print('err', file=sys.stderr)",
+        ]
+    )
+
+    assert (rc, stdout, stderr) == (0, b"out\n", b"err\n")
+
+
+@pytest.mark.asyncio
+async def test_not_started(monkeypatch) -> None:
+    monkeypatch.setattr(
+        asyncio, "create_subprocess_exec", mock_exec := AsyncMock(return_value="proc")
+    )
+
+    assert await WorkerPool().async_exec(["esphome", "version"]) == "proc"
+    assert mock_exec.call_args.args == ("esphome", "version")
+
+
+@pytest.mark.asyncio
+async def test_stdin(pool: WorkerPool, tmp_path: Path) -> None:
+    process = await pool.async_exec(
+        ["esphome", "-q", "vscode", "--ace", str(tmp_path)],
+        stdin=asyncio.subprocess.PIPE,
+    )
+
+    process.stdin.write(b'{"type": "validate", "file": "device.yaml"}\n')
+    assert b'"read_file"' in await asyncio.wait_for(process.stdout.readline(), 10)
+    process.stdin.write(
+        b'{"type": "file_response", "content": "esphome:\\n  name: device\\n"}\n'
+    )
+    assert b'"result"' in await asyncio.wait_for(process.stdout.readline(), 10)
+    process.terminate()
+    await process.wait()
@@ -1,3 +1,4 @@
+import gzip
 import os
 from pathlib import Path
 from unittest.mock import patch
@@ -5,7 +6,12 @@ from unittest.mock import patch
 import py
 import pytest
 
-from esphome.dashboard.util.file import write_file, write_utf8_file
+from esphome.dashboard.util.file import (
+    gzip_file,
+    gzip_file_cached,
+    write_file,
+    write_utf8_file,
+)
 
 
 def test_write_utf8_file(tmp_path: Path) -> None:
@@ -21,6 +27,31 @@ def test_write_file(tmp_path: Path) -> None:
     assert tmp_path.joinpath("foo.txt").read_text() == "foo"
 
 
+def test_gzip_file_cached(tmp_path: Path) -> None:
+    path = tmp_path / "firmware.bin"
+    path.write_bytes(b"firmware" * 100)
+
+    cache_dir = tmp_path / "cache"
+    gz_path = gzip_file_cached(str(path), str(cache_dir))
+    assert os.path.dirname(gz_path) == str(cache_dir)
+    assert gzip.decompress(Path(gz_path).read_bytes()) == b"firmware" * 100
+
+    # The compressed copy is reused while the file is unchanged
+    mtime = os.stat(gz_path).st_mtime_ns
+    with patch("esphome.dashboard.util.file.gzip.GzipFile") as mock_gzip:
+        assert gzip_file_cached(str(path), str(cache_dir)) == gz_path
+    mock_gzip.assert_not_called()
+    assert os.stat(gz_path).st_mtime_ns == mtime
+
+    # and recreated when the file changed, even with the same mtime
+    path.write_bytes(b"new firmware")
+    os.utime(path, ns=(mtime, mtime))
+    gz_path = gzip_file_cached(str(path), str(cache_dir))
+    assert gzip.decompress(Path(gz_path).read_bytes()) == b"new firmware"
+    assert os.listdir(cache_dir) == [os.path.basename(gz_path)]
+    assert gzip.decompress(gzip_file(str(path))) == b"new firmware"
+
+
 def test_write_utf8_file_fails_at_rename(
     tmpdir: py.path.local, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from esphome import asset_cache
+from esphome.core import CORE
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path):
+    CORE.config_path = str(tmp_path / "device.yaml")
+    yield tmp_path / ".esphome"
+    CORE.config_path = None
+
+
+def test_asset_key__depends_on_sources_and_params():
+    key = asset_cache.asset_key("image", ["abc"], {"type": "RGB565"})
+
+    assert key == asset_cache.asset_key("image", ["abc"], {"type": "RGB565"})
+    assert key != asset_cache.asset_key("image", ["abd"], {"type": "RGB565"})
+    assert key != asset_cache.asset_key("image", ["abc"], {"type": "RGB24"})
+    assert key != asset_cache.asset_key("animation", ["abc"], {"type": "RGB565"})
+
+
+def test_file_digest(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(b"\x89PNG" * 100000)
+
+    assert asset_cache.file_digest(path) == asset_cache.digest(b"\x89PNG" * 100000)
+
+
+def test_load_save(data_dir):
+    key = asset_cache.asset_key("image", ["abc"], {})
+    assert asset_cache.load("image", key) is None
+
+    asset_cache.save("image", key, (b"\x01\x02", 1, 2))
+
+    assert asset_cache.load("image", key) == (b"\x01\x02", 1, 2)
+    assert asset_cache.load("font", key) is None
+    assert (data_dir / "asset_cache" / "image" / f"{key}.pickle").is_file()
+
+
+def test_load__corrupt_entry(data_dir):
+    key = asset_cache.asset_key("image", ["abc"], {})
+    path = data_dir / "asset_cache" / "image" / f"{key}.pickle"
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a pickle")
+
+    assert asset_cache.load("image", key) is None
+
+
+def test_save__prunes_least_recently_used(monkeypatch, data_dir):
+    monkeypatch.setattr(asset_cache, "MAX_ENTRIES", 3)
+    directory = data_dir / "asset_cache" / "font"
+    keys = [asset_cache.asset_key("font", [str(i)], {}) for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        asset_cache.save("font", key, i)
+        os.utime(directory / f"{key}.pickle", ns=(i * 10**9, i * 10**9))
+    # Using the oldest entry makes it the most recently used one
+    assert asset_cache.load("font", keys[0]) == 0
+
+    asset_cache.save("font", keys[3], 3)
+
+    assert asset_cache.load("font", keys[1]) is None
+    assert [asset_cache.load("font", key) for key in (keys[0], keys[2], keys[3])] == [
+        0,
+        2,
+        3,
+    ]
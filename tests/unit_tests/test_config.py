@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from esphome import yaml_util
+from esphome.config import Config, IDPassValidationStep, SchemaCache, validate_config
+from esphome.core import CORE, ID
+from esphome.cpp_types import Component, esphome_ns
+
+CONFIG = """
+esphome:
+  name: device
+esp32:
+  board: esp32dev
+logger:
+sensor:
+  - platform: template
+    id: first
+    name: First
+    lambda: return id(second).state;
+  - platform: template
+    id: second
+    name: Second
+binary_sensor:
+  - platform: gpio
+    pin: GPIO4
+    name: Button
+switch:
+  - platform: gpio
+    pin: GPIO16
+    name: Relay
+"""
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> str:
+    CORE.config_path = str(tmp_path / "device.yaml")
+    yield CORE.config_path
+    CORE.reset()
+    CORE.config_path = None
+
+
+def _validate(config_path: str, text: str, schema_cache: SchemaCache | None):
+    CORE.reset()
+    CORE.config_path = config_path
+    config = yaml_util.parse_yaml(config_path, StringIO(text))
+    return validate_config(config, {}, schema_cache)
+
+
+def _errors(result) -> list[str]:
+    return [str(err) for err in result.errors]
+
+
+def test_schema_cache_reuses_unchanged_domains(config_path: str) -> None:
+    schema_cache = SchemaCache()
+    first = _validate(config_path, CONFIG, schema_cache)
+    assert schema_cache.hits == 0
+
+    second = _validate(config_path, CONFIG, schema_cache)
+
+    assert not second.errors
+    assert schema_cache.hits > 0
+    assert repr(dict(second)) == repr(dict(first))
+    # The cached results aren't shared with the previous validation
+    assert second["sensor"][0] is not first["sensor"][0]
+
+
+def test_schema_cache_revalidates_changed_domains(config_path: str) -> None:
+    schema_cache = SchemaCache()
+    _validate(config_path, CONFIG, schema_cache)
+    hits = schema_cache.hits
+
+    changed = CONFIG.replace("name: Second", "name: Other")
+    result = _validate(config_path, changed, schema_cache)
+
+    assert result["sensor"][1]["name"] == "Other"
+    assert schema_cache.misses > hits
+    assert repr(dict(result)) == repr(dict(_validate(config_path, changed, None)))
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "error"),
+    [
+        ("pin: GPIO16", "pin: GPIO4", "Pin 4 is used in multiple places"),
+        ("id(second)", "id(third)", "Couldn't find ID 'third'"),
+    ],
+)
+def test_schema_cache_errors_across_domains(
+    config_path: str, old: str, new: str, error: str
+) -> None:
+    schema_cache = SchemaCache()
+    _validate(config_path, CONFIG, schema_cache)
+
+    result = _validate(config_path, CONFIG.replace(old, new), schema_cache)
+
+    assert any(error in message for message in _errors(result))
+    assert _errors(result) == _errors(
+        _validate(config_path, CONFIG.replace(old, new), None)
+    )
+
+
+test_ns = esphome_ns.namespace("test")
+BUS = test_ns.class_("Bus", Component)
+SPECIAL_BUS = test_ns.class_("SpecialBus", BUS)
+
+
+def _id_pass(config: dict) -> Config:
+    CORE.reset()
+    result = Config()
+    result.update(config)
+    IDPassValidationStep().run(result)
+    return result
+
+
+def test_id_pass_default_ids() -> None:
+    result = _id_pass(
+        {
+            "bus": [
+                {"id": ID("test_bus_id", True, BUS)},
+                {"id": ID(None, True, BUS)},
+                {"id": ID(None, True, BUS)},
+            ],
+            "special": {"id": ID(None, True, SPECIAL_BUS)},
+        }
+    )
+
+    assert not result.errors
+    names = ["test_bus_id", "test_bus_id_2", "test_bus_id_3", "test_specialbus_id"]
+    assert [str(id) for id, _ in result.declare_ids] == names
+    assert CORE.component_ids == set(names)
+    assert result.get_path_for_id("test_bus_id_3") == ["bus", 2, "id"]
+    with pytest.raises(KeyError):
+        result.get_path_for_id("missing")
+
+
+def test_id_pass_references() -> None:
+    special = ID(None, False, SPECIAL_BUS)
+    result = _id_pass(
+        {
+            "bus": [
+                {"id": ID("first", True, BUS)},
+                {"id": ID("first", True, BUS)},
+                {"id": ID("second", True, SPECIAL_BUS)},
+            ],
+            "users": [
+                {"bus_id": ID("second", False, BUS)},
+                {"bus_id": ID("frist", False, BUS)},
+                {"bus_id": ID("first", False, SPECIAL_BUS)},
+                {"bus_id": ID(None, False, BUS)},
+                {"bus_id": special},
+            ],
+        }
+    )
+
+    assert [err.msg for err in result.errors] == [
+        "ID first redefined! Check bus->0->id",
+        "Couldn't find ID 'frist'. Please check you have defined an ID with "
+        'that name in your configuration. These IDs look similar: "first".',
+        "ID 'first' of type test::Bus doesn't inherit from "
+        "test::SpecialBus. Please double check your ID is pointing to the "
+        "correct value",
+        "Too many candidates found for 'bus_id' type 'test::Bus' Some are "
+        "'first', 'second'",
+    ]
+    assert str(special) == "second"
@@ -0,0 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from esphome import config_cache, yaml_util
+from esphome.config import read_config
+from esphome.core import CORE, Lambda
+
+
+@pytest.fixture
+def config_file(tmp_path: Path) -> Path:
+    (tmp_path / "secrets.yaml").write_text("api_password: hunter2\n")
+    (tmp_path / "sensor.yaml").write_text(
+        "platform: template\nname: Temperature\nlambda: return 21.0;\n"
+    )
+    config = tmp_path / "device.yaml"
+    config.write_text(
+        "esphome:\n"
+        "  name: device\n"
+        "host:\n"
+        "logger:\n"
+        "api:\n"
+        "  password: !secret api_password\n"
+        "sensor:\n"
+        "  - !include sensor.yaml\n"
+    )
+    CORE.config_path = str(config)
+    yield config
+    CORE.reset()
+    CORE.config_path = None
+
+
+def _reset_core(config: Path) -> None:
+    CORE.reset()
+    CORE.config_path = str(config)
+
+
+def test_read_config__cache_hit(config_file):
+    validated = read_config({}, save_cache=True)
+    assert validated is not None
+    expected = yaml_util.dump(validated)
+    build_path = CORE.build_path
+
+    _reset_core(config_file)
+    cached = config_cache.load({})
+
+    assert cached is not None
+    assert yaml_util.dump(cached) == expected
+    assert CORE.name == "device"
+    assert CORE.build_path == build_path
+    assert CORE.is_host
+    assert "template" in CORE.loaded_integrations
+    # Classes added while loading the YAML survive the round trip
+    lambda_ = cached["sensor"][0]["lambda"]
+    assert isinstance(lambda_, Lambda)
+    assert isinstance(lambda_, yaml_util.ESPHomeDataBase)
+    assert lambda_.esp_range is not None
+
+
+@pytest.mark.parametrize(
+    "filename, content",
+    (
+        ("device.yaml", "# changed\n"),
+        ("sensor.yaml", "id: temperature\n"),
+        ("secrets.yaml", "wifi_password: other\n"),
+    ),
+)
+def test_read_config__cache_invalidated(config_file, filename, content):
+    assert read_config({}, save_cache=True) is not None
+
+    with open(config_file.parent / filename, "a", encoding="utf-8") as f_handle:
+        f_handle.write(content)
+    _reset_core(config_file)
+
+    assert config_cache.load({}) is None
+
+
+def test_read_config__substitutions_are_part_of_key(config_file):
+    assert read_config({}, save_cache=True) is not None
+
+    _reset_core(config_file)
+    assert config_cache.load({"foo": "bar"}) is None
+
+
+def test_read_config__not_saved_by_default(config_file):
+    assert read_config({}) is not None
+
+    _reset_core(config_file)
+    assert config_cache.load({}) is None
+
+
+def test_source_tree__ignores_bytecode(tmp_path):
+    component = tmp_path / "components" / "demo"
+    component.mkdir(parents=True)
+    (component / "__init__.py").write_text("")
+    tree = config_cache._source_tree(str(tmp_path / "components"))
+
+    (component / "__pycache__").mkdir()
+    (component / "__pycache__" / "__init__.cpython-311.pyc").write_bytes(b"\0")
+    assert config_cache._source_tree(str(tmp_path / "components")) == tree
+
+    (component / "demo.h").write_text("#pragma once\n")
+    assert config_cache._source_tree(str(tmp_path / "components")) != tree
+
+
+def test_record__notes_from_other_threads(tmp_path):
+    path = str(tmp_path / "package.yaml")
+    with config_cache.record() as manifest:
+        with ThreadPoolExecutor(2) as executor:
+            executor.submit(config_cache.note_file, path).result()
+            executor.submit(config_cache.note_git_repo, tmp_path, None).result()
+
+    assert manifest.files == {path}
+    assert not manifest.cacheable
+    # Nothing is recorded outside of record()
+    config_cache.note_file(str(tmp_path / "other.yaml"))
+    assert manifest.files == {path}
@@ -0,0 +1,97 @@
+import pytest
+
+from esphome import coroutine, core
+from esphome.cpp_generator import MockObj
+
+
+@pytest.fixture
+def target():
+    return core.EsphomeCore()
+
+
+def test_flush_tasks__waits_for_registered_variable(target):
+    var_id = core.ID("foo", is_declaration=True)
+    order = []
+
+    async def consumer():
+        var = await target.get_variable(var_id)
+        order.append(("consumer", str(var)))
+
+    async def producer():
+        order.append(("producer", None))
+        target.register_variable(var_id, MockObj("foo"))
+
+    target.add_job(consumer)
+    target.add_job(producer)
+    target.flush_tasks()
+
+    assert order == [("producer", None), ("consumer", "foo")]
+
+
+def test_flush_tasks__parks_blocked_tasks(target):
+    ids = [core.ID(f"var_{i}", is_declaration=True) for i in range(50)]
+    steps = 0
+
+    async def consumer(i):
+        nonlocal steps
+        steps += 1
+        await target.get_variable(ids[i])
+        steps += 1
+        target.register_variable(ids[i + 1], MockObj(f"var_{i + 1}"))
+
+    async def producer():
+        target.register_variable(ids[0], MockObj("var_0"))
+
+    # Add the chain in reverse so every consumer blocks before its producer has run
+    for i in reversed(range(len(ids) - 1)):
+        target.add_job(consumer, i)
+    target.add_job(producer)
+    target.flush_tasks()
+
+    assert all(target.has_id(id_) for id_ in ids)
+    # Each consumer blocks once and is resumed once, nothing busy-waits
+    assert steps == 2 * (len(ids) - 1)
+
+
+def test_flush_tasks__full_id_is_woken(target):
+    var_id = core.ID("foo", is_declaration=True, type=MockObj("Foo"))
+    result = []
+
+    async def consumer():
+        result.append(await target.get_variable_with_full_id(core.ID("foo")))
+
+    async def producer():
+        target.register_variable(var_id, MockObj("foo"))
+
+    target.add_job(consumer)
+    target.add_job(producer)
+    target.flush_tasks()
+
+    assert result[0][0] is var_id
+
+
+def test_flush_tasks__circular_dependency(target):
+    a_id = core.ID("a", is_declaration=True)
+    b_id = core.ID("b", is_declaration=True)
+
+    async def make_a():
+        await target.get_variable(b_id)
+        target.register_variable(a_id, MockObj("a"))
+
+    async def make_b():
+        await target.get_variable(a_id)
+        target.register_variable(b_id, MockObj("b"))
+
+    target.add_job(make_a)
+    target.add_job(make_b)
+
+    with pytest.raises(core.EsphomeError, match="Circular dependency detected") as e:
+        target.flush_tasks()
+    assert "make_a" in str(e.value)
+    assert "waiting for b" in str(e.value)
+
+
+def test_publish__unknown_key_is_ignored():
+    loop = coroutine.FakeEventLoop()
+    loop.publish("nothing")
+    loop.flush_tasks()
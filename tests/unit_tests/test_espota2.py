@@ -0,0 +1,239 @@
+import asyncio
+import gzip
+import hashlib
+import io
+import socket
+import threading
+
+import pytest
+
+from esphome import espota2
+
+
+def _recv_exactly(sock, amount):
+    data = b""
+    while len(data) < amount:
+        chunk = sock.recv(amount - len(data))
+        if not chunk:
+            raise ConnectionError("closed")
+        data += chunk
+    return data
+
+
+class FakeDevice(threading.Thread):
+    """Minimal device side of the ESPHome OTA protocol."""
+
+    def __init__(self, sock, version, compression):
+        super().__init__(daemon=True)
+        self.sock = sock
+        self.version = version
+        self.compression = compression
+        self.received = b""
+        self.md5 = None
+        self.error = None
+
+    def run(self):
+        try:
+            self._run()
+        except Exception as err:  # pylint: disable=broad-except
+            self.error = err
+
+    def _run(self):
+        sock = self.sock
+        assert list(_recv_exactly(sock, 5)) == espota2.MAGIC_BYTES
+        sock.sendall(bytes([espota2.RESPONSE_OK, self.version]))
+        _recv_exactly(sock, 1)
+        sock.sendall(
+            bytes(
+                [
+                    (
+                        espota2.RESPONSE_SUPPORTS_COMPRESSION
+                        if self.compression
+                        else espota2.RESPONSE_HEADER_OK
+                    )
+                ]
+            )
+        )
+        sock.sendall(bytes([espota2.RESPONSE_AUTH_OK]))
+        size = int.from_bytes(_recv_exactly(sock, 4), "big")
+        sock.sendall(bytes([espota2.RESPONSE_UPDATE_PREPARE_OK]))
+        self.md5 = _recv_exactly(sock, 32).decode()
+        sock.sendall(bytes([espota2.RESPONSE_BIN_MD5_OK]))
+        acked = 0
+        while len(self.received) < size:
+            self.received += sock.recv(min(1024, size - len(self.received)))
+            if self.version < espota2.OTA_VERSION_2_0:
+                continue
+            total = len(self.received)
+            while acked + espota2.UPLOAD_BLOCK_SIZE <= total or (
+                total == size and acked < size
+            ):
+                sock.sendall(bytes([espota2.RESPONSE_CHUNK_OK]))
+                acked += espota2.UPLOAD_BLOCK_SIZE
+        sock.sendall(
+            bytes([espota2.RESPONSE_RECEIVE_OK, espota2.RESPONSE_UPDATE_END_OK])
+        )
+        assert _recv_exactly(sock, 1) == bytes([espota2.RESPONSE_OK])
+
+
+@pytest.fixture
+def socket_pair():
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        client = socket.create_connection(listener.getsockname())
+        server, _ = listener.accept()
+    yield client, server
+    client.close()
+    server.close()
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(espota2.time, "sleep", lambda _: None)
+
+
+@pytest.mark.parametrize("version", (espota2.OTA_VERSION_1_0, espota2.OTA_VERSION_2_0))
+@pytest.mark.parametrize("compression", (False, True))
+def test_perform_ota(socket_pair, version, compression):
+    firmware = bytes(range(256)) * 400 + b"\x00" * 12345
+    client, server = socket_pair
+    device = FakeDevice(server, version, compression)
+    device.start()
+    stats = espota2.perform_ota(client, "", io.BytesIO(firmware), "fw.bin")
+    device.join(5)
+
+    assert device.error is None
+    received = gzip.decompress(device.received) if compression else device.received
+    assert received == firmware
+    assert device.md5 == hashlib.md5(device.received).hexdigest()
+    assert stats.file_size == len(firmware)
+    assert stats.upload_size == len(device.received)
+    if compression:
+        assert stats.compression_ratio < 1
+    if version >= espota2.OTA_VERSION_2_0:
+        blocks = -(-len(device.received) // espota2.UPLOAD_BLOCK_SIZE)
+        assert len(stats.rtts) == blocks
+    else:
+        assert not stats.rtts
+
+
+def test_prepare_upload__spools_to_disk(monkeypatch):
+    monkeypatch.setattr(espota2, "UPLOAD_SPOOL_SIZE", 16)
+    firmware = bytes(range(256)) * 64
+
+    stream, file_size, upload_size, md5 = espota2._prepare_upload(
+        io.BytesIO(firmware), True
+    )
+    with stream:
+        data = stream.read()
+
+    assert file_size == len(firmware)
+    assert upload_size == len(data)
+    assert md5 == hashlib.md5(data).hexdigest()
+    assert gzip.decompress(data) == firmware
+
+
+def _start_devices(count, version=espota2.OTA_VERSION_2_0):
+    """Listen on a local port and serve `count` OTA uploads, one after the other."""
+    listener = socket.create_server(("127.0.0.1", 0))
+    devices = []
+
+    def serve():
+        with listener:
+            for _ in range(count):
+                conn, _ = listener.accept()
+                device = FakeDevice(conn, version, True)
+                devices.append(device)
+                device.start()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return listener.getsockname()[1], devices
+
+
+@pytest.mark.asyncio
+async def test_async_run_ota(tmp_path):
+    firmware = bytes(range(256)) * 300
+    firmware_path = tmp_path / "firmware.bin"
+    firmware_path.write_bytes(firmware)
+    port, devices = _start_devices(1)
+
+    result = await espota2.async_run_ota("127.0.0.1", port, "", str(firmware_path))
+
+    assert result.success, result.error
+    assert result.error is None
+    assert result.bytes_sent == len(devices[0].received)
+    assert result.compression_ratio < 1
+    devices[0].join(5)
+    assert gzip.decompress(devices[0].received) == firmware
+
+
+@pytest.mark.asyncio
+async def test_async_run_ota_batch(tmp_path):
+    firmware_path = tmp_path / "firmware.bin"
+    firmware_path.write_bytes(bytes(range(256)) * 100)
+    port, devices = _start_devices(3)
+    with socket.create_server(("127.0.0.1", 0)) as closed:
+        closed_port = closed.getsockname()[1]
+
+    results = await espota2.async_run_ota_batch(
+        [
+            ("127.0.0.1", port, "", str(firmware_path)),
+            ("127.0.0.1", closed_port, "", str(firmware_path)),
+            ("127.0.0.1", port, "", str(firmware_path)),
+            ("127.0.0.1", port, "", str(firmware_path)),
+        ],
+        max_concurrency=2,
+    )
+
+    assert [r.success for r in results] == [True, False, True, True]
+    assert "Connecting to 127.0.0.1" in results[1].error
+    assert results[1].bytes_sent == 0
+    for device in devices:
+        device.join(5)
+        assert device.error is None
+
+
+@pytest.mark.asyncio
+async def test_async_run_ota__reads_off_event_loop(tmp_path, monkeypatch):
+    firmware_path = tmp_path / "firmware.bin"
+    firmware_path.write_bytes(bytes(range(256)) * 300)
+    port, devices = _start_devices(1)
+    read_threads = set()
+    prepare_upload = espota2._prepare_upload
+
+    def spy(file_handle, compress):
+        upload_stream, *rest = prepare_upload(file_handle, compress)
+        read = upload_stream.read
+
+        def record(*args):
+            read_threads.add(threading.current_thread())
+            return read(*args)
+
+        upload_stream.read = record
+        return (upload_stream, *rest)
+
+    monkeypatch.setattr(espota2, "_prepare_upload", spy)
+
+    result = await espota2.async_run_ota("127.0.0.1", port, "", str(firmware_path))
+
+    assert result.success, result.error
+    assert read_threads
+    assert threading.current_thread() not in read_threads
+    devices[0].join(5)
+
+
+@pytest.mark.asyncio
+async def test_async_send__times_out(monkeypatch):
+    monkeypatch.setattr(espota2, "SEND_TIMEOUT", 0.1)
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        reader, writer = await asyncio.open_connection(
+            "127.0.0.1", listener.getsockname()[1]
+        )
+        # The device accepts the connection but never reads from it
+        conn, _ = listener.accept()
+        try:
+            client = espota2._AsyncOTAClient(reader, writer, "device")
+            with pytest.raises(espota2.OTAError, match="Error sending data"):
+                await client._send(bytes(64 * 1024 * 1024), "data")
+        finally:
+            writer.close()
+            conn.close()
@@ -0,0 +1,176 @@
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+from esphome import git
+from esphome.core import CORE, TimePeriodSeconds
+
+
+@pytest.fixture(autouse=True)
+def config_dir(tmp_path: Path) -> Path:
+    CORE.config_path = str(tmp_path / "device.yaml")
+    yield tmp_path
+    CORE.reset()
+    CORE.config_path = None
+
+
+def _git(cwd: Path, *cmd: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@test", *cmd],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def _commit(repo: Path, content: str) -> None:
+    (repo / "file.txt").write_text(content)
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", content)
+
+
+@pytest.fixture
+def remote(config_dir: Path) -> Path:
+    repo = config_dir / "remote"
+    repo.mkdir()
+    _git(repo, "init", "-q", "--initial-branch=main")
+    _commit(repo, "one")
+    _git(repo, "tag", "-a", "v1", "-m", "v1")
+    _commit(repo, "two")
+    return repo
+
+
+@pytest.fixture
+def git_commands(monkeypatch) -> list[str]:
+    commands = []
+    run_git_command = git.run_git_command
+
+    def record(cmd, cwd=None):
+        commands.append(cmd[1])
+        return run_git_command(cmd, cwd)
+
+    monkeypatch.setattr(git, "run_git_command", record)
+    return commands
+
+
+def test_refs_share_a_mirror(remote):
+    url = remote.as_uri()
+
+    tag_dir, _ = git.clone_or_update(url=url, ref="v1", refresh=None, domain="a")
+    head_dir, _ = git.clone_or_update(url=url, refresh=None, domain="b")
+
+    assert (tag_dir / "file.txt").read_text() == "one"
+    assert (head_dir / "file.txt").read_text() == "two"
+    mirror_dir = git._compute_mirror_path(url)
+    assert list(mirror_dir.parent.iterdir()) == [mirror_dir]
+    worktrees = _git(mirror_dir, "worktree", "list", "--porcelain")
+    assert str(tag_dir) in worktrees
+    assert str(head_dir) in worktrees
+
+
+def test_fetch_only_when_remote_changed(remote, git_commands):
+    url = remote.as_uri()
+    repo_dir, _ = git.clone_or_update(url=url, ref="main", refresh=None, domain="a")
+    assert "fetch" in git_commands
+
+    git_commands.clear()
+    repo_dir, revert = git.clone_or_update(
+        url=url, ref="main", refresh=None, domain="a"
+    )
+    assert "ls-remote" in git_commands
+    assert "fetch" not in git_commands
+    assert revert is None
+
+    _commit(remote, "three")
+    git_commands.clear()
+    repo_dir, revert = git.clone_or_update(
+        url=url, ref="main", refresh=None, domain="a"
+    )
+    assert "fetch" in git_commands
+    assert (repo_dir / "file.txt").read_text() == "three"
+
+    revert()
+    assert (repo_dir / "file.txt").read_text() == "two"
+
+
+def test_refresh_period_skips_remote(remote, git_commands):
+    url = remote.as_uri()
+    git.clone_or_update(url=url, refresh=None, domain="a")
+
+    git_commands.clear()
+    git.clone_or_update(url=url, refresh=TimePeriodSeconds(days=1), domain="a")
+    assert not git_commands
+
+
+def test_replaces_clone(remote):
+    url = remote.as_uri()
+    repo_dir = git._compute_destination_path(f"{url}@None", "a")
+    repo_dir.parent.mkdir(parents=True)
+    _git(repo_dir.parent, "clone", "-q", "--depth=1", url, str(repo_dir))
+
+    repo_dir, _ = git.clone_or_update(url=url, refresh=None, domain="a")
+
+    assert (repo_dir / ".git").is_file()
+    assert (repo_dir / "file.txt").read_text() == "two"
+
+
+def test_relative_submodule(config_dir, monkeypatch):
+    # Allow submodules with file:// URLs, git refuses them by default
+    monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+    monkeypatch.setenv("GIT_CONFIG_KEY_0", "protocol.file.allow")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_0", "always")
+    sub = config_dir / "remotes" / "sub"
+    sub.mkdir(parents=True)
+    _git(sub, "init", "-q")
+    _commit(sub, "sub")
+    main = config_dir / "remotes" / "main"
+    main.mkdir()
+    _git(main, "init", "-q")
+    _git(main, "submodule", "add", "-q", "../sub", "sub")
+    _commit(main, "main")
+
+    repo_dir, _ = git.clone_or_update(
+        url=main.as_uri(), refresh=None, domain="a", submodules=["sub"]
+    )
+
+    assert (repo_dir / "sub" / "file.txt").read_text() == "sub"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses flock")
+def test_mirror_lock_excludes_other_processes(config_dir):
+    mirror_dir = config_dir / "mirror"
+    try_lock = (
+        "import fcntl, sys\n"
+        "with open(sys.argv[1], 'a+b') as f:\n"
+        "    try:\n"
+        "        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)\n"
+        "    except BlockingIOError:\n"
+        "        sys.exit(1)\n"
+    )
+    lock_file = str(mirror_dir / git.MIRROR_LOCK_FILE)
+
+    with git._lock_mirror(mirror_dir):
+        locked = subprocess.run(
+            [sys.executable, "-c", try_lock, lock_file], check=False
+        )
+    unlocked = subprocess.run([sys.executable, "-c", try_lock, lock_file], check=False)
+
+    assert locked.returncode == 1
+    assert unlocked.returncode == 0
+
+
+def test_keeps_clone_with_local_changes(remote):
+    url = remote.as_uri()
+    repo_dir = git._compute_destination_path(f"{url}@None", "a")
+    repo_dir.parent.mkdir(parents=True)
+    _git(repo_dir.parent, "clone", "-q", "--depth=1", url, str(repo_dir))
+    (repo_dir / "file.txt").write_text("changed")
+
+    repo_dir, _ = git.clone_or_update(url=url, refresh=None, domain="a")
+
+    assert (repo_dir / "file.txt").read_text() == "two"
+    backup_dir = repo_dir.with_name(f"{repo_dir.name}.old")
+    assert (backup_dir / "file.txt").read_text() == "changed"
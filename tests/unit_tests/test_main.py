@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from esphome import __main__ as main
+
+
+@pytest.fixture
+def files(monkeypatch) -> list[str]:
+    files = ["a.yaml", "b.yaml", "c.yaml", "d.yaml"]
+    monkeypatch.setattr(main, "list_yaml_files", lambda folders: files)
+    monkeypatch.setattr(main, "color", lambda _, text: text)
+    return files
+
+
+@pytest.fixture
+def steps(monkeypatch) -> list[tuple[str, str]]:
+    """Record the steps run by update-all when they finish.
+
+    Compiling c.yaml and uploading d.yaml fail.
+    """
+    steps = []
+    lock = threading.Lock()
+
+    def run_step(job, env, *cmd):
+        step, file = cmd[2], cmd[3]
+        if (step, file) == ("compile", "a.yaml"):
+            # Would finish last if the other compiles ran at the same time
+            time.sleep(0.1)
+        with lock:
+            steps.append((step, file))
+        job.output += f"{step} {file}\n"
+        failed = (step, file) in (("compile", "c.yaml"), ("upload", "d.yaml"))
+        return int(failed), 1.0
+
+    monkeypatch.setattr(main, "_run_update_all_step", run_step)
+    return steps
+
+
+def test_update_all_parallel(files, steps, tmp_path, capsys):
+    args = main.parse_args(
+        ["esphome", "update-all", str(tmp_path), "-j", "3", "--upload-jobs", "2"]
+    )
+    assert args.jobs == 3
+    assert args.upload_jobs == 2
+
+    assert main.command_update_all(args) == 2
+
+    # The first compile runs alone, the others start after it
+    assert steps[0] == ("compile", "a.yaml")
+    assert sorted(steps) == [
+        ("compile", "a.yaml"),
+        ("compile", "b.yaml"),
+        ("compile", "c.yaml"),
+        ("compile", "d.yaml"),
+        ("upload", "a.yaml"),
+        ("upload", "b.yaml"),
+        ("upload", "d.yaml"),
+    ]
+    summary = capsys.readouterr().out.split("SUMMARY")[1].splitlines()
+    rows = {line.split()[0]: line.split()[1:] for line in summary[2:6]}
+    assert rows == {
+        "a.yaml": ["1.0s", "1.0s", "2.0s", "SUCCESS"],
+        "b.yaml": ["1.0s", "1.0s", "2.0s", "SUCCESS"],
+        "c.yaml": ["1.0s", "-", "1.0s", "FAILED", "(compile)"],
+        "d.yaml": ["1.0s", "1.0s", "2.0s", "FAILED", "(upload)"],
+    }
+
+
+def test_update_all_sequential(files, monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(
+        main, "run_external_process", lambda *cmd: int(cmd[3] == "b.yaml")
+    )
+    args = main.parse_args(["esphome", "update-all", str(tmp_path)])
+
+    assert main.command_update_all(args) == 1
+
+    summary = capsys.readouterr().out.split("SUMMARY")[1]
+    assert "  - a.yaml: SUCCESS" in summary
+    assert "  - b.yaml: FAILED (" in summary
+    assert "(compile)" not in summary
@@ -0,0 +1,112 @@
+from pathlib import Path
+import subprocess
+
+import pytest
+
+from esphome import external_files, git, prefetch
+import esphome.config_validation as cv
+from esphome.core import CORE
+
+
+@pytest.fixture(autouse=True)
+def config_dir(tmp_path: Path) -> Path:
+    CORE.config_path = str(tmp_path / "device.yaml")
+    yield tmp_path
+    git.clear_prefetched()
+    external_files.clear_checked()
+    CORE.reset()
+    CORE.config_path = None
+
+
+def _make_repo(path: Path, files: dict[str, str]) -> str:
+    path.mkdir()
+    for name, content in files.items():
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_text(content)
+    for cmd in (["init", "-q"], ["add", "."], ["commit", "-q", "-m", "Initial"]):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@test", *cmd],
+            cwd=path,
+            check=True,
+        )
+    return path.as_uri()
+
+
+def _no_git(*args, **kwargs):
+    raise AssertionError("git should not run again")
+
+
+def test_prefetch_sources_follows_packages(config_dir, monkeypatch):
+    components_url = _make_repo(
+        config_dir / "components", {"components/demo/__init__.py": ""}
+    )
+    inner_url = _make_repo(config_dir / "inner", {"inner.yaml": "logger:\n"})
+    outer_url = _make_repo(
+        config_dir / "outer",
+        {
+            "outer.yaml": (
+                f"packages:\n  inner:\n    url: {inner_url}\n    file: inner.yaml\n"
+                "external_components:\n"
+                f"  - source:\n      type: git\n      url: {components_url}\n"
+            )
+        },
+    )
+    config = {
+        "packages": {
+            "outer": {"url": outer_url, "files": ["outer.yaml"]},
+            "local": {"packages": {"again": {"url": outer_url, "file": "outer.yaml"}}},
+            "unsubstituted": {"url": "${repo_url}", "file": "x.yaml"},
+        }
+    }
+
+    prefetch.prefetch_sources(config)
+
+    monkeypatch.setattr(git, "run_git_command", _no_git)
+    for url, domain, file in (
+        (outer_url, "packages", "outer.yaml"),
+        (inner_url, "packages", "inner.yaml"),
+        (components_url, "external_components", "components/demo/__init__.py"),
+    ):
+        repo_dir, revert = git.clone_or_update(url=url, refresh=None, domain=domain)
+        assert (repo_dir / file).is_file()
+        assert revert is None
+    assert len(git._PREFETCHED) == 3
+
+
+def test_prefetch_sources_keeps_errors(config_dir, monkeypatch):
+    url = (config_dir / "missing").as_uri()
+
+    prefetch.prefetch_sources(
+        {"external_components": [{"source": {"type": "git", "url": url}}]}
+    )
+
+    monkeypatch.setattr(git, "run_git_command", _no_git)
+    with pytest.raises(cv.Invalid):
+        git.clone_or_update(url=url, refresh=None, domain="external_components")
+
+
+def test_download_content_checks_once(config_dir, monkeypatch):
+    requests_made = []
+
+    class Response:
+        content = b"data"
+
+        def raise_for_status(self):
+            pass
+
+    def get(url, **kwargs):
+        requests_made.append(url)
+        return Response()
+
+    monkeypatch.setattr(external_files.requests, "get", get)
+    path = config_dir / "file"
+
+    assert external_files.download_content("https://a", path) == b"data"
+    assert external_files.download_content("https://a", path) == b"data"
+    assert external_files.is_checked(path)
+    assert requests_made == ["https://a"]
+
+    external_files.clear_checked()
+    monkeypatch.setattr(external_files, "has_remote_file_changed", lambda *_: True)
+    external_files.download_content("https://a", path)
+    assert requests_made == ["https://a", "https://a"]
@@ -0,0 +1,53 @@
+import pytest
+
+from esphome.components import substitutions
+import esphome.config_validation as cv
+from esphome.core import Lambda
+from esphome.util import OrderedDict
+
+
+def _config(subs, **config):
+    return OrderedDict(substitutions=OrderedDict(subs), **config)
+
+
+def test_nested_substitutions_in_one_pass():
+    config = _config(
+        {"name": "${prefix}_node", "prefix": "${area}_${room}", "area": "up"},
+        sensor=[{"name": "${name} temperature", "lambda": Lambda("return ${area};")}],
+        api={"password": "pa$word"},
+    )
+    substitutions.do_substitution_pass(config, {"room": "attic"})
+
+    assert config["substitutions"]["name"] == "up_attic_node"
+    assert config["sensor"][0]["name"] == "up_attic_node temperature"
+    assert config["sensor"][0]["lambda"].value == "return up;"
+    assert config["api"]["password"] == "pa$word"
+
+
+def test_substituted_keys_are_merged():
+    config = _config(
+        {"domain": "sensor"},
+        sensor=[{"platform": "a"}],
+        **{"${domain}": [{"platform": "b"}]},
+    )
+    substitutions.do_substitution_pass(config, None)
+
+    assert config["sensor"] == [{"platform": "b"}, {"platform": "a"}]
+
+
+def test_circular_substitutions():
+    config = _config({"a": "${b}", "b": "x $c", "c": "$a"})
+    with pytest.raises(cv.Invalid) as err:
+        substitutions.do_substitution_pass(config, None)
+
+    assert err.value.path == ["substitutions", "a"]
+    assert "a -> b -> c -> a" in err.value.msg
+
+
+def test_include_vars_refer_to_outer_substitutions():
+    config = _config(
+        {"name": "${name}", "label": "${name} ${outer}"}, yaml={"name": "$label"}
+    )
+    substitutions.do_substitution_pass(config, None, ignore_missing=True)
+
+    assert config["yaml"]["name"] == "${name} ${outer}"
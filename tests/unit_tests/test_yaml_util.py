@@ -1,6 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+from unittest.mock import MagicMock
+
 from esphome import yaml_util
 from esphome.components import substitutions
-from esphome.core import EsphomeError
+from esphome.core import CORE, EsphomeError, Lambda
 
 
 def test_include_with_vars(fixture_path):
@@ -42,3 +48,137 @@ def test_loading_a_missing_file(fixture_path):
         yaml_util.load_yaml(yaml_file)
     except EsphomeError as err:
         assert "missing.yaml" in str(err)
+
+
+def test_parse_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_util, "_PARSE_CACHE", {})
+    (tmp_path / "secrets.yaml").write_text("password: hunter2\n")
+    (tmp_path / "included.yaml").write_text("password: !secret password\n")
+    main = tmp_path / "main.yaml"
+    main.write_text("wifi: !include included.yaml\n")
+
+    first = yaml_util.load_yaml(main)
+    first["wifi"]["password"] = "changed"
+    second = yaml_util.load_yaml(main)
+
+    # Callers get their own copy, with the secrets known for dumping
+    assert second["wifi"]["password"] == "hunter2"
+    assert yaml_util.is_secret("hunter2") == "password"
+
+    # Changing an included file invalidates the files including it
+    (tmp_path / "secrets.yaml").write_text("password: correct horse\n")
+    assert yaml_util.load_yaml(main)["wifi"]["password"] == "correct horse"
+
+
+def test_parse_cache_not_used_for_env_vars(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_util, "_PARSE_CACHE", {})
+    main = tmp_path / "main.yaml"
+    main.write_text("value: !env_var TEST_PARSE_CACHE\n")
+
+    monkeypatch.setenv("TEST_PARSE_CACHE", "first")
+    assert yaml_util.load_yaml(main)["value"] == "first"
+    monkeypatch.setenv("TEST_PARSE_CACHE", "second")
+    assert yaml_util.load_yaml(main)["value"] == "second"
+
+
+def _age(*paths):
+    """Move the modification time of files out of the racy window."""
+    for path in paths:
+        os.utime(path, ns=(time.time_ns() - 10**10, time.time_ns() - 10**10))
+
+
+def test_parse_cache_parses_shared_include_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_util, "_PARSE_CACHE", {})
+    shared = tmp_path / "shared.yaml"
+    shared.write_text("value: 1\n")
+    main = tmp_path / "main.yaml"
+    main.write_text(
+        "\n".join(f"key{i}: !include shared.yaml" for i in range(10)) + "\n"
+    )
+    _age(shared, main)
+    parse_file = MagicMock(wraps=yaml_util._parse_file)
+    monkeypatch.setattr(yaml_util, "_parse_file", parse_file)
+
+    config = yaml_util.load_yaml(main)
+    assert parse_file.call_count == 2
+    config["key0"]["value"] = 2
+    assert config["key1"]["value"] == 1
+
+    assert yaml_util.load_yaml(main)["key0"]["value"] == 1
+    assert parse_file.call_count == 2
+
+
+def test_parse_cache_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_util, "_PARSE_CACHE", {})
+    for name in ("a", "b"):
+        (tmp_path / f"common_{name}.yaml").write_text(f"value: {name}\n")
+        (tmp_path / f"{name}.yaml").write_text(f"common: !include common_{name}.yaml\n")
+    _age(*tmp_path.iterdir())
+    paths = {name: str(tmp_path / f"{name}.yaml") for name in ("a", "b")}
+    # Both top level files are being parsed at the same time
+    barrier = threading.Barrier(2, timeout=5)
+    parse_file = yaml_util._parse_file
+
+    def parse_together(fname):
+        if not os.path.basename(fname).startswith("common_"):
+            barrier.wait()
+        return parse_file(fname)
+
+    monkeypatch.setattr(yaml_util, "_parse_file", parse_together)
+
+    with ThreadPoolExecutor(2) as executor:
+        list(executor.map(yaml_util.load_yaml, [paths["a"], paths["b"]]))
+
+    for name in ("a", "b"):
+        assert set(yaml_util._PARSE_CACHE[paths[name]].files) == {
+            paths[name],
+            str(tmp_path / f"common_{name}.yaml"),
+        }
+    monkeypatch.setattr(yaml_util, "_parse_file", parse_file)
+    (tmp_path / "common_a.yaml").write_text("value: changed\n")
+    assert yaml_util.load_yaml(paths["a"])["common"]["value"] == "changed"
+
+
+def test_parse_cache_replaced_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_util, "_PARSE_CACHE", {})
+    main = tmp_path / "main.yaml"
+    main.write_text("value: 1\n")
+    _age(main)
+    stat = main.stat()
+    assert yaml_util.load_yaml(main)["value"] == 1
+
+    # Same size and modification time, but a different file
+    replacement = tmp_path / "replacement.yaml"
+    replacement.write_text("value: 2\n")
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(replacement, main)
+    assert yaml_util.load_yaml(main)["value"] == 2
+
+
+def test_node_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_util, "_PARSE_CACHE", {})
+    monkeypatch.setattr(yaml_util, "NODE_CACHE_MIN_SIZE", 0)
+    monkeypatch.setenv("ESPHOME_YAML_NODE_CACHE", "1")
+    main = tmp_path / "main.yaml"
+    main.write_text("sensor:\n  - platform: template\n    lambda: !lambda return 1;\n")
+    _age(main)
+    monkeypatch.setattr(CORE, "config_path", str(main))
+
+    config = yaml_util.load_yaml(main)
+    assert list((tmp_path / ".esphome" / "yaml_cache").glob("*.pickle"))
+
+    # A new process reads the parsed file from disk
+    monkeypatch.setattr(yaml_util, "_PARSE_CACHE", {})
+    parse_file = MagicMock(wraps=yaml_util._parse_file)
+    monkeypatch.setattr(yaml_util, "_parse_file", parse_file)
+    cached = yaml_util.load_yaml(main)
+    parse_file.assert_not_called()
+    assert cached["sensor"][0]["platform"] == "template"
+    assert cached["sensor"][0]["platform"].esp_range is not None
+    assert isinstance(cached["sensor"][0]["lambda"], Lambda)
+    assert cached["sensor"][0]["lambda"].value == config["sensor"][0]["lambda"].value
+
+    # Changes to the file are noticed
+    main.write_text("sensor: []\n")
+    monkeypatch.setattr(yaml_util, "_PARSE_CACHE", {})
+    assert yaml_util.load_yaml(main) == {"sensor": []}